@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark the per-call cost of Powertrain.dynamics.
+
+Compares the current right-hand side, which uses a cached closed-form
+inverse of the 2x2 inertia matrix, against the previous formulation that
+rebuilt the inertia matrix and called np.linalg.solve on every evaluation.
+"""
+
+import sys
+import timeit
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+from ecvt_sim.powertrain import PowertrainInput, create_cat_793d_powertrain
+
+
+def reference_dynamics(pt, x, u, grade):
+    """Previous Powertrain.dynamics: matrix rebuild and np.linalg.solve per call."""
+    omega_e, omega_r, soc = x[0], x[1], x[2]
+    T_e, T_MG1, T_MG2, gear = u.T_e, u.T_MG1, u.T_MG2, u.gear
+
+    pt.set_gear(gear)
+    omega_MG1 = pt.get_mg1_speed(omega_e, omega_r)
+    T_load = pt.get_load_torque(omega_r, grade, gear)
+    J = pt.get_inertia_matrix(gear)
+    T_sun = pt.get_sun_torque_from_mg1(T_MG1)
+
+    rho = pt.planetary.rho
+    tau = np.array([
+        T_e + (1 + rho) * T_sun,
+        -rho * T_sun + T_MG2 - T_load
+    ])
+    d_omega = np.linalg.solve(J, tau)
+
+    P_battery = (
+        pt.mg1.get_electrical_power(T_MG1, omega_MG1)
+        + pt.mg2.get_electrical_power(T_MG2, omega_r)
+    )
+    d_soc = pt.battery.get_soc_derivative(P_battery, soc)
+    return np.array([d_omega[0], d_omega[1], d_soc])
+
+
+def per_call_us(fn, number):
+    """Best-of-5 time per call [µs]."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    pt = create_cat_793d_powertrain(payload_fraction=1.0)
+    x = np.array([1400 * np.pi / 30, 150.0, 0.6])
+    u = PowertrainInput(T_e=8000.0, T_MG1=-2000.0, T_MG2=1500.0, gear=1)
+    grade = 0.08
+    out = np.empty(3)
+    number = 20_000
+
+    print("=" * 60)
+    print("Powertrain.dynamics per-call cost")
+    print("=" * 60)
+
+    for gear in (1, 2):
+        u.gear = gear
+        reference = reference_dynamics(pt, x, u, grade)
+        current = pt.dynamics(0.0, x, u, grade)
+        error = np.max(np.abs(current - reference) / np.maximum(np.abs(reference), 1e-12))
+
+        t_reference = per_call_us(lambda: reference_dynamics(pt, x, u, grade), number)
+        t_current = per_call_us(lambda: pt.dynamics(0.0, x, u, grade), number)
+        t_out = per_call_us(lambda: pt.dynamics(0.0, x, u, grade, out=out), number)
+
+        print(f"\nGear {gear}:")
+        print(f"  Before (matrix + solve): {t_reference:7.2f} µs")
+        print(f"  After:                   {t_current:7.2f} µs  ({t_reference / t_current:.1f}x)")
+        print(f"  After, out= buffer:      {t_out:7.2f} µs  ({t_reference / t_out:.1f}x)")
+        print(f"  Max relative difference: {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,18 @@ References:
 - Fitting the OCV-SOC relationship using genetic algorithm, E3S Web Conf 2021
 """
 
+import math
+
 import numpy as np
 from dataclasses import dataclass, field
 from typing import Optional
+from numpy.typing import ArrayLike, NDArray
+
+from .lookup import UniformTable1D
+
+
+# Number of points in the uniform SOC grid of the OCV and resistance tables
+SOC_TABLE_POINTS = 1001
 
 
 @dataclass
@@ -109,11 +118,35 @@ class Battery:
     - SOC-dependent open circuit voltage (nonlinear curve)
     - SOC-dependent internal resistance (increases at extremes)
     - Backward compatible with constant parameters
+
+    The OCV and resistance curves are resampled once onto a uniform SOC
+    grid, so each query is a direct table lookup.
     """
 
     def __init__(self, params: BatteryParams = None):
         self.params = params or BatteryParams()
         self._soc = self.params.SOC_init
+        self._build_soc_tables()
+
+    def _build_soc_tables(self):
+        """Resample the OCV and resistance curves onto a uniform SOC grid."""
+        soc = np.linspace(0.0, 1.0, SOC_TABLE_POINTS)
+        dsoc = soc[1] - soc[0]
+
+        op = self.params.ocv_params
+        if op.use_lookup:
+            ocv_norm = np.interp(soc, op.soc_points, op.ocv_normalized)
+        else:
+            ocv_norm = np.polynomial.polynomial.polyval(soc, op.coefficients)
+        self._ocv_table = UniformTable1D(0.0, dsoc, self.params.V_oc * ocv_norm)
+
+        rp = self.params.resistance_params
+        resistance = rp.R_nom * (
+            1.0
+            + rp.k_low * np.exp(-soc / rp.tau_low)
+            + rp.k_high * np.exp((soc - 1.0) / rp.tau_high)
+        )
+        self._resistance_table = UniformTable1D(0.0, dsoc, resistance)
 
     @property
     def soc(self) -> float:
@@ -144,14 +177,20 @@ class Battery:
         if not self.params.use_soc_dependent_resistance:
             return self.params.R_int
 
-        rp = self.params.resistance_params
-        soc = np.clip(soc, 0.0, 1.0)
+        return self._resistance_table.value(soc)
 
-        # Resistance increase at low and high SOC
-        r_low_factor = rp.k_low * np.exp(-soc / rp.tau_low)
-        r_high_factor = rp.k_high * np.exp((soc - 1.0) / rp.tau_high)
+    def get_internal_resistance_array(self, soc: ArrayLike) -> NDArray:
+        """Array form of get_internal_resistance.
+
+        Args:
+            soc: States of charge [0-1]
 
-        return rp.R_nom * (1.0 + r_low_factor + r_high_factor)
+        Returns:
+            Internal resistance [Ω]
+        """
+        if not self.params.use_soc_dependent_resistance:
+            return np.full(np.shape(soc), self.params.R_int)
+        return self._resistance_table(soc)
 
     def get_open_circuit_voltage(self, soc: float = None) -> float:
         """Get open circuit voltage at given SOC.
@@ -171,21 +210,20 @@ class Battery:
         if not self.params.use_soc_dependent_ocv:
             return self.params.V_oc
 
-        soc = np.clip(soc, 0.0, 1.0)
-        op = self.params.ocv_params
+        return self._ocv_table.value(soc)
 
-        if op.use_lookup:
-            # Linear interpolation from lookup table
-            ocv_norm = np.interp(soc, op.soc_points, op.ocv_normalized)
-        else:
-            # Polynomial model: sum(a_i * SOC^i)
-            ocv_norm = sum(
-                coef * (soc ** i)
-                for i, coef in enumerate(op.coefficients)
-            )
+    def get_open_circuit_voltage_array(self, soc: ArrayLike) -> NDArray:
+        """Array form of get_open_circuit_voltage.
 
-        # Scale by nominal OCV
-        return self.params.V_oc * ocv_norm
+        Args:
+            soc: States of charge [0-1]
+
+        Returns:
+            Open circuit voltage [V]
+        """
+        if not self.params.use_soc_dependent_ocv:
+            return np.full(np.shape(soc), self.params.V_oc)
+        return self._ocv_table(soc)
 
     def get_current_from_power(self, power: float, soc: float = None) -> float:
         """Calculate battery current for given power demand.
@@ -216,9 +254,29 @@ class Battery:
             return V_oc / (2 * R) if power > 0 else -V_oc / (2 * R)
 
         # Use smaller root for stability
-        current = (V_oc - np.sqrt(discriminant)) / (2 * R)
+        current = (V_oc - math.sqrt(discriminant)) / (2 * R)
         return current
 
+    def get_current_from_power_array(self, power: ArrayLike, soc: ArrayLike) -> NDArray:
+        """Array form of get_current_from_power.
+
+        Args:
+            power: Battery power [W] (positive = discharge)
+            soc: States of charge [0-1], broadcastable with power
+
+        Returns:
+            Battery current [A] (positive = discharge)
+        """
+        power = np.asarray(power, dtype=float)
+        V_oc = self.get_open_circuit_voltage_array(soc)
+        R = self.get_internal_resistance_array(soc)
+
+        discriminant = V_oc ** 2 - 4 * R * power
+        current = (V_oc - np.sqrt(np.maximum(discriminant, 0.0))) / (2 * R)
+        # Power exceeds capability - return max current
+        limit = np.where(power > 0, V_oc, -V_oc) / (2 * R)
+        return np.where(discriminant < 0, limit, current)
+
     def get_terminal_voltage(self, current: float, soc: float = None) -> float:
         """Calculate terminal voltage at given current.
 
@@ -237,6 +295,20 @@ class Battery:
         R = self.get_internal_resistance(soc)
         return V_oc - current * R
 
+    def get_terminal_voltage_array(self, current: ArrayLike, soc: ArrayLike) -> NDArray:
+        """Array form of get_terminal_voltage.
+
+        Args:
+            current: Battery current [A] (positive = discharge)
+            soc: States of charge [0-1], broadcastable with current
+
+        Returns:
+            Terminal voltage [V]
+        """
+        return self.get_open_circuit_voltage_array(soc) - np.multiply(
+            current, self.get_internal_resistance_array(soc)
+        )
+
     def get_power_limits(self, soc: float = None) -> tuple[float, float]:
         """Get power limits based on SOC.
 
@@ -266,6 +338,23 @@ class Battery:
 
         return (-P_charge, P_discharge)
 
+    def get_power_limits_array(self, soc: ArrayLike) -> tuple[NDArray, NDArray]:
+        """Array form of get_power_limits.
+
+        Args:
+            soc: States of charge [0-1]
+
+        Returns:
+            Tuple of (P_min, P_max) arrays [W]
+        """
+        soc = np.asarray(soc, dtype=float)
+        discharge_factor = np.clip((soc - self.params.SOC_min) / 0.1, 0.0, 1.0)
+        charge_factor = np.clip((self.params.SOC_max - soc) / 0.1, 0.0, 1.0)
+        return (
+            -self.params.P_max_charge * charge_factor,
+            self.params.P_max_discharge * discharge_factor,
+        )
+
     def get_soc_derivative(self, power: float, soc: float = None) -> float:
         """Calculate SOC rate of change.
 
@@ -283,6 +372,19 @@ class Battery:
         Q_coulombs = self.params.Q_capacity / self.params.V_nom
         return -current / Q_coulombs
 
+    def get_soc_derivative_array(self, power: ArrayLike, soc: ArrayLike) -> NDArray:
+        """Array form of get_soc_derivative.
+
+        Args:
+            power: Battery power [W] (positive = discharge)
+            soc: States of charge [0-1], broadcastable with power
+
+        Returns:
+            SOC derivative [1/s]
+        """
+        Q_coulombs = self.params.Q_capacity / self.params.V_nom
+        return self.get_current_from_power_array(power, soc) * (-1.0 / Q_coulombs)
+
     def clip_power(self, power: float, soc: float = None) -> float:
         """Clip power to valid range.
 
@@ -16,10 +16,12 @@ Example configurations:
     ])
 """
 
+import weakref
 import numpy as np
 from dataclasses import dataclass, field
 from typing import Optional, Union
 from abc import ABC, abstractmethod
+from numpy.typing import ArrayLike
 
 
 class DrivetrainComponent(ABC):
@@ -42,6 +44,17 @@ class DrivetrainComponent(ABC):
         """Component name."""
         return getattr(self, '_name', '')
 
+    def _add_listener(self, chain: "ReductionChain"):
+        """Register a chain whose cached products depend on this component."""
+        if '_listeners' not in self.__dict__:
+            self._listeners = weakref.WeakSet()
+        self._listeners.add(chain)
+
+    def _notify_changed(self):
+        """Invalidate the caches of chains containing this component."""
+        for chain in list(self.__dict__.get('_listeners', ())):
+            chain._invalidate()
+
     def input_to_output_speed(self, omega_in: float) -> float:
         """Convert input speed to output speed.
 
@@ -152,6 +165,7 @@ class Reduction(DrivetrainComponent):
     @ratio.setter
     def ratio(self, value: float):
         self._ratio = value
+        self._notify_changed()
 
     @property
     def efficiency(self) -> float:
@@ -160,6 +174,7 @@ class Reduction(DrivetrainComponent):
     @efficiency.setter
     def efficiency(self, value: float):
         self._efficiency = value
+        self._notify_changed()
 
     @property
     def J_input(self) -> float:
@@ -194,7 +209,9 @@ class SelectableGearbox(DrivetrainComponent):
     """Multi-speed gearbox with selectable gear ratios.
 
     Represents a transmission with multiple gear options that can be
-    selected during operation.
+    selected during operation. Per-gear ratios, efficiencies and reflected
+    output inertias are tabulated at construction; the per-gear getters
+    also accept an array of gear indices.
     """
 
     def __init__(
@@ -229,6 +246,10 @@ class SelectableGearbox(DrivetrainComponent):
         if len(self._ratios) != len(self._gear_names):
             raise ValueError("ratios and gear_names must have same length")
 
+        self._ratio_table = np.array(self._ratios, dtype=float)
+        self._efficiency_table = np.array(self._efficiencies, dtype=float)
+        self._reflected_inertia_table = J_output / self._ratio_table ** 2
+
     @property
     def num_gears(self) -> int:
         """Number of available gears."""
@@ -244,7 +265,9 @@ class SelectableGearbox(DrivetrainComponent):
         """Set current gear by index."""
         if not 0 <= value < len(self._ratios):
             raise ValueError(f"Gear index {value} out of range [0, {len(self._ratios)-1}]")
-        self._current_gear = value
+        if value != self._current_gear:
+            self._current_gear = value
+            self._notify_changed()
 
     @property
     def current_gear_name(self) -> str:
@@ -287,17 +310,40 @@ class SelectableGearbox(DrivetrainComponent):
         """Set current gear by name."""
         try:
             idx = self._gear_names.index(name)
-            self._current_gear = idx
         except ValueError:
             raise ValueError(f"Unknown gear name: {name}. Available: {self._gear_names}")
+        self.current_gear = idx
+
+    def _lookup(self, table: np.ndarray, gear: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        """Per-gear table value, a float for a single gear index."""
+        if isinstance(gear, (int, np.integer)):
+            return table.item(gear)
+        gear = np.asarray(gear, dtype=int)
+        if np.any((gear < 0) | (gear >= len(table))):
+            raise ValueError(f"Gear indices must be in [0, {len(table)-1}]")
+        return table[gear]
+
+    def get_ratio(self, gear: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        """Get ratio for a specific gear, or for an array of gears."""
+        return self._lookup(self._ratio_table, gear)
+
+    def get_efficiency(self, gear: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        """Get efficiency for a specific gear, or for an array of gears."""
+        return self._lookup(self._efficiency_table, gear)
+
+    def get_reflected_inertia_at_input(
+        self, gear: Union[int, np.ndarray, None] = None
+    ) -> Union[float, np.ndarray]:
+        """Get output inertia reflected to input side.
 
-    def get_ratio(self, gear: int) -> float:
-        """Get ratio for specific gear."""
-        return self._ratios[gear]
+        J_reflected = J_output / ratio²
 
-    def get_efficiency(self, gear: int) -> float:
-        """Get efficiency for specific gear."""
-        return self._efficiencies[gear]
+        Args:
+            gear: Gear index or array of indices. If None, uses current gear.
+        """
+        if gear is None:
+            gear = self._current_gear
+        return self._lookup(self._reflected_inertia_table, gear)
 
     def __repr__(self) -> str:
         name_str = f"'{self._name}' " if self._name else ""
@@ -320,6 +366,10 @@ class ReductionChain(DrivetrainComponent):
         ])
 
         total_ratio = chain.ratio  # 3.0 * 2.85 * 1.0 * 10.83 = 92.6
+
+    Cumulative ratios and efficiencies per stage are cached and
+    invalidated when a gear is selected or a component ratio/efficiency is
+    set, so conversions through the chain cost one multiply or divide.
     """
 
     def __init__(self, components: list[DrivetrainComponent], name: str = ""):
@@ -331,6 +381,26 @@ class ReductionChain(DrivetrainComponent):
         """
         self._components = list(components)
         self._name = name
+        self._cum_ratio: Optional[np.ndarray] = None
+        self._cum_eta: Optional[np.ndarray] = None
+        self._ratio = 1.0
+        self._efficiency = 1.0
+        for component in self._components:
+            component._add_listener(self)
+
+    def _invalidate(self):
+        """Drop cached cumulative products (and those of enclosing chains)."""
+        self._cum_ratio = None
+        self._notify_changed()
+
+    def _stage_products(self) -> tuple[np.ndarray, np.ndarray]:
+        """Cumulative ratio and efficiency after each stage, cached."""
+        if self._cum_ratio is None:
+            self._cum_eta = np.cumprod([c.efficiency for c in self._components])
+            self._cum_ratio = np.cumprod([c.ratio for c in self._components])
+            self._ratio = self._cum_ratio.item(-1) if len(self._components) else 1.0
+            self._efficiency = self._cum_eta.item(-1) if len(self._components) else 1.0
+        return self._cum_ratio, self._cum_eta
 
     @property
     def components(self) -> list[DrivetrainComponent]:
@@ -340,12 +410,16 @@ class ReductionChain(DrivetrainComponent):
     @property
     def ratio(self) -> float:
         """Total ratio of the chain (product of all component ratios)."""
-        return float(np.prod([c.ratio for c in self._components]))
+        if self._cum_ratio is None:
+            self._stage_products()
+        return self._ratio
 
     @property
     def efficiency(self) -> float:
         """Total efficiency of the chain (product of all component efficiencies)."""
-        return float(np.prod([c.efficiency for c in self._components]))
+        if self._cum_ratio is None:
+            self._stage_products()
+        return self._efficiency
 
     def get_component(self, name: str) -> Optional[DrivetrainComponent]:
         """Get component by name."""
@@ -358,34 +432,6 @@ class ReductionChain(DrivetrainComponent):
         """Get component by index."""
         return self._components[index]
 
-    def input_to_output_speed(self, omega_in: float) -> float:
-        """Convert input speed through entire chain."""
-        omega = omega_in
-        for component in self._components:
-            omega = component.input_to_output_speed(omega)
-        return omega
-
-    def output_to_input_speed(self, omega_out: float) -> float:
-        """Convert output speed back through entire chain."""
-        omega = omega_out
-        for component in reversed(self._components):
-            omega = component.output_to_input_speed(omega)
-        return omega
-
-    def input_to_output_torque(self, T_in: float) -> float:
-        """Convert input torque through entire chain."""
-        T = T_in
-        for component in self._components:
-            T = component.input_to_output_torque(T)
-        return T
-
-    def output_to_input_torque(self, T_out: float) -> float:
-        """Convert output torque back through entire chain."""
-        T = T_out
-        for component in reversed(self._components):
-            T = component.output_to_input_torque(T)
-        return T
-
     def get_speed_at_stage(self, omega_in: float, stage: int) -> float:
         """Get speed at a specific stage (after that component).
 
@@ -396,29 +442,76 @@ class ReductionChain(DrivetrainComponent):
         Returns:
             Speed after the specified stage [rad/s]
         """
-        omega = omega_in
-        for i, component in enumerate(self._components):
-            omega = component.input_to_output_speed(omega)
-            if i == stage:
-                break
-        return omega
+        return omega_in / self.get_ratio_up_to_stage(stage)
 
     def get_torque_at_stage(self, T_in: float, stage: int) -> float:
         """Get torque at a specific stage (after that component)."""
-        T = T_in
-        for i, component in enumerate(self._components):
-            T = component.input_to_output_torque(T)
-            if i == stage:
-                break
-        return T
+        return T_in * self.get_ratio_up_to_stage(stage) * self.get_efficiency_up_to_stage(stage)
 
     def get_ratio_up_to_stage(self, stage: int) -> float:
         """Get cumulative ratio up to and including a stage."""
-        return float(np.prod([self._components[i].ratio for i in range(stage + 1)]))
+        cum_ratio, _ = self._stage_products()
+        return cum_ratio.item(min(stage, len(cum_ratio) - 1))
 
     def get_efficiency_up_to_stage(self, stage: int) -> float:
         """Get cumulative efficiency up to and including a stage."""
-        return float(np.prod([self._components[i].efficiency for i in range(stage + 1)]))
+        _, cum_eta = self._stage_products()
+        return cum_eta.item(min(stage, len(cum_eta) - 1))
+
+    def _stage_products_for_gears(self, gears: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        """Cumulative ratio and efficiency per stage and sample, shape (n_stages, N).
+
+        SelectableGearbox stages take each sample's gear index from gears;
+        all other stages use their current ratio and efficiency.
+        """
+        gears = np.asarray(gears, dtype=int).ravel()
+        ratios = np.empty((len(self._components), len(gears)))
+        etas = np.empty_like(ratios)
+        for i, c in enumerate(self._components):
+            if isinstance(c, SelectableGearbox):
+                ratios[i] = c.get_ratio(gears)
+                etas[i] = c.get_efficiency(gears)
+            else:
+                ratios[i] = c.ratio
+                etas[i] = c.efficiency
+        return np.cumprod(ratios, axis=0), np.cumprod(etas, axis=0)
+
+    def get_stage_speeds(self, omega_in: ArrayLike, gears: Optional[ArrayLike] = None) -> np.ndarray:
+        """Map input speeds to the output of every stage at once.
+
+        Args:
+            omega_in: Input speeds [rad/s], shape (N,)
+            gears: Optional SelectableGearbox gear index per sample, shape (N,).
+                If None, the current gear is used throughout.
+
+        Returns:
+            Speed after each stage [rad/s], shape (n_stages, N)
+        """
+        omega_in = np.atleast_1d(np.asarray(omega_in, dtype=float))
+        if gears is None:
+            cum_ratio = self._stage_products()[0][:, None]
+        else:
+            cum_ratio = self._stage_products_for_gears(gears)[0]
+        return omega_in / cum_ratio
+
+    def get_stage_torques(self, T_in: ArrayLike, gears: Optional[ArrayLike] = None) -> np.ndarray:
+        """Map input torques to the output of every stage at once.
+
+        Args:
+            T_in: Input torques [N·m], shape (N,)
+            gears: Optional SelectableGearbox gear index per sample, shape (N,).
+                If None, the current gear is used throughout.
+
+        Returns:
+            Torque after each stage [N·m], shape (n_stages, N)
+        """
+        T_in = np.atleast_1d(np.asarray(T_in, dtype=float))
+        if gears is None:
+            cum_ratio, cum_eta = self._stage_products()
+            cum_ratio, cum_eta = cum_ratio[:, None], cum_eta[:, None]
+        else:
+            cum_ratio, cum_eta = self._stage_products_for_gears(gears)
+        return T_in * cum_ratio * cum_eta
 
     def summary(self) -> str:
         """Get a summary string of the chain."""
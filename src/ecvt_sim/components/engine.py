@@ -20,9 +20,12 @@ References:
 
 import numpy as np
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Dict, Optional
+from numpy.typing import ArrayLike, NDArray
 from scipy.interpolate import RegularGridInterpolator
 
+from .lookup import UniformTable2D
+
 
 @dataclass
 class BSFCMapParams:
@@ -91,12 +94,20 @@ class EngineParams:
     bsfc_params: BSFCMapParams = field(default_factory=BSFCMapParams)
 
 
+# BSFC tables by repr(EngineParams), shared between engines with equal params
+_bsfc_tables: Dict[str, UniformTable2D] = {}
+
+# BSFC table resolution
+BSFC_TABLE_DRPM = 10.0
+BSFC_TABLE_DLOAD = 0.01
+
+
 class Engine:
     """CAT 3516E engine model with torque curve and BSFC map.
 
     Features:
     - Torque curve interpolation for max torque envelope
-    - Variable BSFC based on speed and load
+    - Variable BSFC based on speed and load, from a precomputed table
     - Backward compatible with constant BSFC
     """
 
@@ -104,6 +115,7 @@ class Engine:
         self.params = params or EngineParams()
         self._build_torque_curve()
         self._build_bsfc_interpolator()
+        self._build_bsfc_table()
 
     def _build_torque_curve(self):
         """Build interpolation arrays from torque curve data."""
@@ -121,6 +133,66 @@ class Engine:
                 method='linear', bounds_error=False, fill_value=None
             )
 
+    def _build_bsfc_table(self):
+        """Tabulate BSFC over (rpm, load), once per distinct EngineParams.
+
+        The rpm axis runs from 0 to 1.5 x rpm_max; the load axis from 0 to 1.
+        """
+        self._bsfc_table = None
+        if not self.params.use_bsfc_map:
+            return
+
+        key = repr(self.params)
+        table = _bsfc_tables.get(key)
+        if table is None:
+            n_rpm = int(np.ceil(1.5 * self.params.rpm_max / BSFC_TABLE_DRPM))
+            n_load = int(round(1.0 / BSFC_TABLE_DLOAD))
+            rpm, load = np.meshgrid(
+                np.arange(n_rpm + 1) * BSFC_TABLE_DRPM,
+                np.arange(n_load + 1) * BSFC_TABLE_DLOAD,
+                indexing="ij",
+            )
+            bsfc = self._bsfc_model(rpm, load)
+            if self._bsfc_interpolator is not None:
+                mapped = self._bsfc_interpolator(np.stack([rpm, load], axis=-1))
+                bsfc = np.where(np.isnan(mapped), bsfc, mapped)
+            table = UniformTable2D(0.0, BSFC_TABLE_DRPM, 0.0, BSFC_TABLE_DLOAD, bsfc)
+            _bsfc_tables[key] = table
+        self._bsfc_table = table
+
+    def _bsfc_model(self, rpm: NDArray, load: NDArray) -> NDArray:
+        """Analytical BSFC model: bsfc = bsfc_opt * (1 + penalties).
+
+        Args:
+            rpm: Engine speeds [rpm]
+            load: Load fractions [0-1]
+
+        Returns:
+            BSFC [kg/J]
+        """
+        bp = self.params.bsfc_params
+
+        # Low load penalty: increases rapidly below optimal load
+        load_ratio = load / bp.load_optimal if bp.load_optimal > 0 else np.zeros_like(load)
+        low_load_penalty = np.where(
+            load < bp.load_optimal, bp.k_low_load * (1 - load_ratio) ** 2, 0.0
+        )
+
+        # High load penalty: slight increase near WOT
+        high_load_penalty = np.where(
+            load > bp.load_optimal, bp.k_high_load * (load - bp.load_optimal) ** 2, 0.0
+        )
+
+        # Speed penalty: increases away from optimal speed
+        speed_penalty = bp.k_speed * (rpm - bp.rpm_optimal) ** 2
+
+        # Total BSFC
+        total_penalty = low_load_penalty + high_load_penalty + speed_penalty
+        bsfc = bp.bsfc_optimal * (1.0 + total_penalty)
+
+        # Clamp to reasonable range (180-300 g/kWh = 50e-9 to 83e-9 kg/J)
+        return np.clip(bsfc, 50e-9, 83e-9)
+
     @property
     def J(self) -> float:
         """Engine inertia [kg·m²]."""
@@ -150,6 +222,19 @@ class Engine:
             return 0.0
         return float(np.interp(rpm, self._rpm_points, self._torque_points))
 
+    def get_max_torque_array(self, rpm: ArrayLike) -> NDArray:
+        """Array form of get_max_torque.
+
+        Args:
+            rpm: Engine speeds [rpm]
+
+        Returns:
+            Maximum torque [N·m], 0 outside the valid speed range
+        """
+        rpm = np.asarray(rpm, dtype=float)
+        T_max = np.interp(rpm, self._rpm_points, self._torque_points)
+        return np.where((rpm < self.params.rpm_min) | (rpm > self.params.rpm_max), 0.0, T_max)
+
     def get_max_torque_rads(self, omega: float) -> float:
         """Get maximum available torque at given engine speed.
 
@@ -230,6 +315,20 @@ class Engine:
             return 0.0
         return min(1.0, max(0.0, torque / T_max))
 
+    def get_load_fraction_array(self, rpm: ArrayLike, torque: ArrayLike) -> NDArray:
+        """Array form of get_load_fraction.
+
+        Args:
+            rpm: Engine speeds [rpm]
+            torque: Engine torques [N·m], broadcastable with rpm
+
+        Returns:
+            Load fractions [0-1]
+        """
+        T_max = self.get_max_torque_array(rpm)
+        safe_T_max = np.where(T_max > 0, T_max, 1.0)
+        return np.where(T_max > 0, np.clip(np.asarray(torque) / safe_T_max, 0.0, 1.0), 0.0)
+
     def get_bsfc(self, rpm: float, torque: float) -> float:
         """Get BSFC at given operating point.
 
@@ -249,41 +348,25 @@ class Engine:
         if not self.params.use_bsfc_map:
             return self.params.bsfc_params.bsfc_optimal
 
-        bp = self.params.bsfc_params
+        # Interpolated map where given, otherwise the analytical model,
+        # both precomputed into the BSFC table
         load = self.get_load_fraction(rpm, torque)
+        return self._bsfc_table.value(rpm, load)
 
-        # Method 1: Interpolated map
-        if self._bsfc_interpolator is not None:
-            bsfc = self._bsfc_interpolator([[rpm, load]])[0]
-            if bsfc is not None and not np.isnan(bsfc):
-                return float(bsfc)
-
-        # Method 2: Analytical model
-        # bsfc = bsfc_opt * (1 + penalties)
+    def get_bsfc_array(self, rpm: ArrayLike, torque: ArrayLike) -> NDArray:
+        """Array form of get_bsfc.
 
-        # Low load penalty: increases rapidly below optimal load
-        if load < bp.load_optimal:
-            # Quadratic increase as load decreases
-            load_ratio = load / bp.load_optimal if bp.load_optimal > 0 else 0
-            low_load_penalty = bp.k_low_load * (1 - load_ratio) ** 2
-        else:
-            low_load_penalty = 0.0
-
-        # High load penalty: slight increase near WOT
-        if load > bp.load_optimal:
-            high_load_penalty = bp.k_high_load * (load - bp.load_optimal) ** 2
-        else:
-            high_load_penalty = 0.0
-
-        # Speed penalty: increases away from optimal speed
-        speed_penalty = bp.k_speed * (rpm - bp.rpm_optimal) ** 2
-
-        # Total BSFC
-        total_penalty = low_load_penalty + high_load_penalty + speed_penalty
-        bsfc = bp.bsfc_optimal * (1.0 + total_penalty)
+        Args:
+            rpm: Engine speeds [rpm]
+            torque: Engine torques [N·m], broadcastable with rpm
 
-        # Clamp to reasonable range (180-300 g/kWh = 50e-9 to 83e-9 kg/J)
-        return float(np.clip(bsfc, 50e-9, 83e-9))
+        Returns:
+            BSFC [kg/J]
+        """
+        if not self.params.use_bsfc_map:
+            shape = np.broadcast(np.asarray(rpm), np.asarray(torque)).shape
+            return np.full(shape, self.params.bsfc_params.bsfc_optimal)
+        return self._bsfc_table(rpm, self.get_load_fraction_array(rpm, torque))
 
     def get_fuel_rate(self, rpm: float, torque: float, bsfc: float = None) -> float:
         """Calculate fuel consumption rate.
@@ -307,6 +390,24 @@ class Engine:
 
         return power * bsfc
 
+    def get_fuel_rate_array(
+        self, rpm: ArrayLike, torque: ArrayLike, bsfc: Optional[float] = None
+    ) -> NDArray:
+        """Array form of get_fuel_rate, e.g. over a whole trajectory.
+
+        Args:
+            rpm: Engine speeds [rpm]
+            torque: Engine torques [N·m], broadcastable with rpm
+            bsfc: Override BSFC [kg/J]. If None, uses BSFC map.
+
+        Returns:
+            Fuel rate [kg/s]
+        """
+        power = np.asarray(torque, dtype=float) * np.asarray(rpm, dtype=float) * (np.pi / 30.0)
+        if bsfc is None:
+            bsfc = self.get_bsfc_array(rpm, torque)
+        return np.where(power > 0, power * bsfc, 0.0)
+
     def get_efficiency(self, rpm: float, torque: float) -> float:
         """Get engine thermal efficiency at operating point.
 
@@ -22,6 +22,8 @@ import numpy as np
 from dataclasses import dataclass, field
 from enum import IntEnum
 
+from numpy.typing import ArrayLike, NDArray
+
 
 class Gear(IntEnum):
     """Gear selection."""
@@ -75,11 +77,54 @@ class Gearbox:
     Torque relationship: T_wheel = T_ring * K_gear * K_final * η
 
     Efficiency varies with speed and load when variable model is enabled.
+
+    Per-gear ratios and efficiencies are tabulated at construction, indexed
+    by gear - 1. Methods taking a gear also accept an array of gears, so a
+    whole trajectory with shifts maps in one call. Call rebuild_tables()
+    after editing params in place.
     """
 
     def __init__(self, params: GearboxParams = None):
         self.params = params or GearboxParams()
         self._gear = Gear.LOW
+        self.rebuild_tables()
+
+    def rebuild_tables(self):
+        """Tabulate gear ratio, total ratio and total efficiency per gear."""
+        p = self.params
+        self._gear_ratios = np.array([p.K_low, p.K_high])
+        self._total_ratios = self._gear_ratios * p.K_final
+        self._total_ratios_sq = self._total_ratios ** 2
+        self._eta_totals = np.full(len(Gear), p.eta_total)
+        self._ring_to_wheel_torque = self._total_ratios * self._eta_totals
+        self._max_gear = len(Gear)
+
+    def _gear_index(self, gear) -> int | NDArray:
+        """Table index for a gear, array of gears, or None (current gear).
+
+        Raises:
+            ValueError: If a gear is not a valid Gear
+        """
+        if gear is None:
+            return self._gear - 1
+        if isinstance(gear, int):
+            if not 1 <= gear <= self._max_gear:
+                raise ValueError(f"{gear!r} is not a valid Gear")
+            return gear - 1
+        gear = np.asarray(gear)
+        if gear.ndim == 0:
+            return self._gear_index(int(gear))
+        index = gear.astype(int) - 1
+        if np.any((index < 0) | (index >= self._max_gear)):
+            raise ValueError(f"Gears must be in [1, {self._max_gear}]")
+        return index
+
+    def _lookup(self, table: NDArray, gear) -> float | NDArray:
+        """Per-gear table value, a float for a single gear."""
+        index = self._gear_index(gear)
+        if isinstance(index, int):
+            return table.item(index)
+        return table[index]
 
     @property
     def gear(self) -> Gear:
@@ -137,7 +182,28 @@ class Gearbox:
         eta = ep.eta_base - speed_loss - load_loss
 
         # Clamp to reasonable range
-        return float(np.clip(eta, 0.85, 0.995))
+        return min(max(eta, 0.85), 0.995)
+
+    def get_efficiency_array(self, omega_input: ArrayLike = 0.0, torque: ArrayLike = 0.0) -> NDArray:
+        """Array form of get_efficiency.
+
+        Args:
+            omega_input: Input (ring gear) angular velocities [rad/s]
+            torque: Torques [N·m], broadcastable with omega_input
+
+        Returns:
+            Gearbox efficiencies [0-1]
+        """
+        omega_input = np.asarray(omega_input, dtype=float)
+        torque = np.asarray(torque, dtype=float)
+        if not self.params.use_variable_efficiency:
+            return np.full(np.broadcast(omega_input, torque).shape, self.params.eta_gearbox)
+
+        ep = self.params.efficiency_params
+        speed_loss = ep.k_speed * omega_input ** 2
+        load_fraction = np.abs(torque) / ep.T_rated if ep.T_rated > 0 else 0.0
+        eta = ep.eta_base - speed_loss - ep.k_load * load_fraction
+        return np.clip(eta, 0.85, 0.995)
 
     def get_total_efficiency(self, omega_input: float = 0.0, torque: float = 0.0) -> float:
         """Get total drivetrain efficiency (gearbox × final drive).
@@ -156,26 +222,34 @@ class Gearbox:
         """Get gear ratio for specified gear.
 
         Args:
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
-            Gear ratio
+            Gear ratio, an array for an array of gears
         """
-        if gear is None:
-            gear = self._gear
-        gear = Gear(gear)
-        return self.params.K_low if gear == Gear.LOW else self.params.K_high
+        return self._lookup(self._gear_ratios, gear)
 
     def get_total_ratio(self, gear: Gear | int = None) -> float:
         """Get total ratio (gearbox × final drive).
 
         Args:
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
+
+        Returns:
+            Total ratio, an array for an array of gears
+        """
+        return self._lookup(self._total_ratios, gear)
+
+    def get_total_nominal_efficiency(self, gear: Gear | int = None) -> float:
+        """Get nominal total efficiency (gearbox × final drive) for a gear.
+
+        Args:
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
-            Total ratio
+            Nominal efficiency, an array for an array of gears
         """
-        return self.get_gear_ratio(gear) * self.params.K_final
+        return self._lookup(self._eta_totals, gear)
 
     def ring_to_wheel_speed(self, omega_ring: float, gear: Gear | int = None) -> float:
         """Convert ring gear speed to wheel speed.
@@ -184,7 +258,7 @@ class Gearbox:
 
         Args:
             omega_ring: Ring gear angular velocity [rad/s]
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
             Wheel angular velocity [rad/s]
@@ -199,7 +273,7 @@ class Gearbox:
 
         Args:
             omega_wheel: Wheel angular velocity [rad/s]
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
             Ring gear angular velocity [rad/s]
@@ -214,13 +288,12 @@ class Gearbox:
 
         Args:
             T_ring: Ring gear torque [N·m]
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
             Wheel torque [N·m]
         """
-        K_total = self.get_total_ratio(gear)
-        return T_ring * K_total * self.params.eta_total
+        return T_ring * self._lookup(self._ring_to_wheel_torque, gear)
 
     def wheel_to_ring_torque(self, T_wheel: float, gear: Gear | int = None) -> float:
         """Convert wheel torque to ring gear torque (load seen by ring).
@@ -229,13 +302,12 @@ class Gearbox:
 
         Args:
             T_wheel: Wheel torque [N·m]
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
             Ring gear torque [N·m]
         """
-        K_total = self.get_total_ratio(gear)
-        return T_wheel / (K_total * self.params.eta_total)
+        return T_wheel / self._lookup(self._ring_to_wheel_torque, gear)
 
     def vehicle_to_ring_speed(
         self, velocity: float, wheel_radius: float, gear: Gear | int = None
@@ -247,7 +319,7 @@ class Gearbox:
         Args:
             velocity: Vehicle velocity [m/s]
             wheel_radius: Wheel radius [m]
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
             Ring gear angular velocity [rad/s]
@@ -265,7 +337,7 @@ class Gearbox:
         Args:
             omega_ring: Ring gear angular velocity [rad/s]
             wheel_radius: Wheel radius [m]
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
             Vehicle velocity [m/s]
@@ -283,13 +355,12 @@ class Gearbox:
         Args:
             vehicle_mass: Vehicle mass [kg]
             wheel_radius: Wheel radius [m]
-            gear: Gear selection. If None, uses current gear.
+            gear: Gear selection or array of gears. If None, uses current gear.
 
         Returns:
             Reflected inertia [kg·m²]
         """
-        K_total = self.get_total_ratio(gear)
-        return vehicle_mass * wheel_radius ** 2 / K_total ** 2
+        return vehicle_mass * wheel_radius ** 2 / self._lookup(self._total_ratios_sq, gear)
 
 
 # Default gearbox for CAT 793D
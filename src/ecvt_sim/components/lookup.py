@@ -0,0 +1,133 @@
+"""Uniform-grid lookup tables for component maps."""
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+class UniformTable1D:
+    """Function of one variable sampled on a uniform grid.
+
+    Evaluated by linear interpolation, computing the grid cell directly
+    from the query point. Outside the grid the end values are held.
+    """
+
+    def __init__(self, x0: float, dx: float, values: ArrayLike):
+        """Initialize the table.
+
+        Args:
+            x0: First grid point
+            dx: Grid spacing
+            values: Function values at x0, x0 + dx, ... (at least 2)
+        """
+        self.x0 = float(x0)
+        self.dx = float(dx)
+        self.values = np.asarray(values, dtype=float)
+        if self.values.ndim != 1 or len(self.values) < 2:
+            raise ValueError("A 1D lookup table needs at least 2 values")
+        self._n_x = len(self.values) - 1
+        self._slopes = np.diff(self.values)
+        self._values_list = self.values.tolist()
+        self._slopes_list = self._slopes.tolist()
+
+    @property
+    def x_points(self) -> NDArray:
+        """Grid points."""
+        return self.x0 + self.dx * np.arange(self._n_x + 1)
+
+    def __call__(self, x: ArrayLike) -> NDArray:
+        """Evaluate at an array of points.
+
+        Args:
+            x: Points to evaluate at, any shape
+
+        Returns:
+            Interpolated values, same shape as x
+        """
+        px = np.clip((np.asarray(x, dtype=float) - self.x0) / self.dx, 0.0, self._n_x)
+        i = np.minimum(px.astype(np.intp), self._n_x - 1)
+        return self.values[i] + (px - i) * self._slopes[i]
+
+    def value(self, x: float) -> float:
+        """Evaluate at one point without NumPy overhead."""
+        px = min(max((x - self.x0) / self.dx, 0.0), self._n_x)
+        i = min(int(px), self._n_x - 1)
+        return self._values_list[i] + (px - i) * self._slopes_list[i]
+
+
+class UniformTable2D:
+    """Function of two variables sampled on a uniform grid.
+
+    Evaluated by bilinear interpolation, computing the grid cell directly
+    from the query point instead of searching the axes. Outside the grid
+    the edge values are held.
+    """
+
+    def __init__(self, x0: float, dx: float, y0: float, dy: float, values: ArrayLike):
+        """Initialize the table.
+
+        Args:
+            x0: First grid point on the first axis
+            dx: Grid spacing on the first axis
+            y0: First grid point on the second axis
+            dy: Grid spacing on the second axis
+            values: Function values, shape (n_x, n_y), at least 2 x 2
+        """
+        self.x0 = float(x0)
+        self.dx = float(dx)
+        self.y0 = float(y0)
+        self.dy = float(dy)
+        self.values = np.asarray(values, dtype=float)
+        if self.values.ndim != 2 or min(self.values.shape) < 2:
+            raise ValueError("A 2D lookup table needs at least 2 x 2 values")
+        self._n_x = self.values.shape[0] - 1
+        self._n_y = self.values.shape[1] - 1
+        self._flat = self.values.ravel()
+        self._rows = self.values.tolist()
+
+    @property
+    def x_points(self) -> NDArray:
+        """Grid points on the first axis."""
+        return self.x0 + self.dx * np.arange(self._n_x + 1)
+
+    @property
+    def y_points(self) -> NDArray:
+        """Grid points on the second axis."""
+        return self.y0 + self.dy * np.arange(self._n_y + 1)
+
+    def __call__(self, x: ArrayLike, y: ArrayLike) -> NDArray:
+        """Evaluate at arrays of points.
+
+        Args:
+            x: First coordinates
+            y: Second coordinates, broadcastable with x
+
+        Returns:
+            Interpolated values
+        """
+        px = np.clip((np.asarray(x, dtype=float) - self.x0) / self.dx, 0.0, self._n_x)
+        py = np.clip((np.asarray(y, dtype=float) - self.y0) / self.dy, 0.0, self._n_y)
+        i = np.minimum(px.astype(np.intp), self._n_x - 1)
+        j = np.minimum(py.astype(np.intp), self._n_y - 1)
+        fx = px - i
+        fy = py - j
+
+        stride = self._n_y + 1
+        k = i * stride + j
+        v = self._flat
+        low = v[k] + fy * (v[k + 1] - v[k])
+        high = v[k + stride] + fy * (v[k + stride + 1] - v[k + stride])
+        return low + fx * (high - low)
+
+    def value(self, x: float, y: float) -> float:
+        """Evaluate at one point without NumPy overhead."""
+        px = min(max((x - self.x0) / self.dx, 0.0), self._n_x)
+        py = min(max((y - self.y0) / self.dy, 0.0), self._n_y)
+        i = min(int(px), self._n_x - 1)
+        j = min(int(py), self._n_y - 1)
+        fx = px - i
+        fy = py - j
+
+        row, next_row = self._rows[i], self._rows[i + 1]
+        low = row[j] + fy * (row[j + 1] - row[j])
+        high = next_row[j] + fy * (next_row[j + 1] - next_row[j])
+        return low + fx * (high - low)
@@ -22,8 +22,11 @@ References:
 import numpy as np
 from dataclasses import dataclass, field
 from typing import Optional, Callable
+from numpy.typing import ArrayLike, NDArray
 from scipy.interpolate import RegularGridInterpolator
 
+from .lookup import UniformTable2D
+
 
 @dataclass
 class MotorLossParams:
@@ -66,6 +69,10 @@ class MotorParams:
     # Format: (rpm_points, torque_points, efficiency_grid)
     efficiency_map_data: Optional[tuple] = None
 
+    # Optional: precompute efficiency on an (n_rpm, n_torque) grid over
+    # 0..rpm_max and -T_max..T_max, and look it up instead of the model
+    efficiency_grid_shape: Optional[tuple] = None
+
     def __post_init__(self):
         # Compute base speed if not provided
         if self.rpm_base is None:
@@ -101,6 +108,10 @@ class Motor:
                 method='linear', bounds_error=False, fill_value=None
             )
 
+        self._efficiency_grid = None
+        if self.params.efficiency_grid_shape is not None:
+            self.set_efficiency_map(self.build_efficiency_map(*self.params.efficiency_grid_shape))
+
     @property
     def J(self) -> float:
         """Rotor inertia [kg·m²]."""
@@ -145,6 +156,26 @@ class Motor:
                 return min(P_max / omega, self.params.T_max)
             return self.params.T_max
 
+    def get_max_torque_array(self, rpm: ArrayLike, use_boost: bool = False) -> NDArray:
+        """Array form of get_max_torque.
+
+        Args:
+            rpm: Motor speeds [rpm] (absolute value used)
+            use_boost: If True, use boost power in constant power region
+
+        Returns:
+            Maximum torque [N·m], 0 above rpm_max
+        """
+        rpm = np.abs(np.asarray(rpm, dtype=float))
+        P_max = self.params.P_boost if (use_boost and self.params.P_boost) else self.params.P_max
+        omega = np.maximum(rpm * (np.pi / 30.0), 1e-9)
+        T_max = np.where(
+            rpm <= self.params.rpm_base,
+            self.params.T_max,
+            np.minimum(P_max / omega, self.params.T_max),
+        )
+        return np.where(rpm > self.params.rpm_max, 0.0, T_max)
+
     def get_max_torque_rads(self, omega: float, use_boost: bool = False) -> float:
         """Get maximum available torque at given speed.
 
@@ -203,10 +234,29 @@ class Motor:
 
         return P_cu + P_iron + P_mech + P_fixed
 
+    def get_losses_array(self, torque: ArrayLike, omega: ArrayLike) -> NDArray:
+        """Array form of get_losses.
+
+        Args:
+            torque: Motor torques [N·m]
+            omega: Motor angular velocities [rad/s], broadcastable with torque
+
+        Returns:
+            Total losses [W]
+        """
+        lp = self.params.loss_params
+        omega_abs = np.abs(omega)
+        return (
+            lp.k_cu * np.square(torque)
+            + (lp.k_iron_e * omega_abs + lp.k_iron_h + lp.k_mech) * omega_abs
+            + lp.P_fixed
+        )
+
     def get_efficiency(self, torque: float, omega: float) -> float:
         """Get motor efficiency at given operating point.
 
-        Uses one of three methods:
+        Uses one of four methods:
+        0. Precomputed efficiency grid (if set)
         1. Custom efficiency map interpolation (if provided)
         2. Physics-based loss model (if use_efficiency_map=True)
         3. Constant efficiency (fallback)
@@ -218,13 +268,19 @@ class Motor:
         Returns:
             Efficiency [0-1]
         """
+        # Method 0: Precomputed efficiency grid
+        if self._efficiency_grid is not None:
+            if self._low_power_fallback and abs(torque * omega) < 100:
+                return self.params.eta
+            return self._efficiency_grid.value(abs(omega) * 30.0 / np.pi, torque)
+
         # Method 1: Custom efficiency map interpolation
         if self._efficiency_interpolator is not None:
             rpm = self.rads_to_rpm(abs(omega))
             torque_abs = abs(torque)
             eta = self._efficiency_interpolator([[rpm, torque_abs]])[0]
             if eta is not None and not np.isnan(eta):
-                return float(np.clip(eta, 0.5, 0.98))
+                return float(min(max(eta, 0.5), 0.98))
 
         # Method 2: Physics-based loss model
         if self.params.use_efficiency_map:
@@ -241,11 +297,112 @@ class Motor:
             eta = P_mech / (P_mech + P_loss) * eta_inv
 
             # Clamp to reasonable range
-            return float(np.clip(eta, 0.5, 0.98))
+            return float(min(max(eta, 0.5), 0.98))
 
         # Method 3: Constant efficiency fallback
         return self.params.eta
 
+    @property
+    def _low_power_fallback(self) -> bool:
+        """Whether the loss model's constant efficiency below 100 W applies."""
+        return self.params.use_efficiency_map and self._efficiency_interpolator is None
+
+    def get_efficiency_array(
+        self,
+        torque: ArrayLike,
+        omega: ArrayLike,
+        low_power_fallback: bool = True,
+        efficiency_map: Optional[UniformTable2D] = None,
+    ) -> NDArray:
+        """Array form of get_efficiency, using the same methods in order.
+
+        Args:
+            torque: Motor torques [N·m]
+            omega: Motor angular velocities [rad/s], broadcastable with torque
+            low_power_fallback: Use the constant efficiency below 100 W of
+                mechanical power, as get_efficiency does
+            efficiency_map: Table to use in place of the motor's own
+                precomputed grid, e.g. one built for a controller
+
+        Returns:
+            Efficiencies [0-1]
+        """
+        torque, omega = np.broadcast_arrays(
+            np.asarray(torque, dtype=float), np.asarray(omega, dtype=float)
+        )
+        rpm = np.abs(omega) * 30.0 / np.pi
+
+        P_mech = np.abs(torque * omega)
+        grid = efficiency_map if efficiency_map is not None else self._efficiency_grid
+        if grid is not None:
+            eta = grid(rpm, torque)
+            if self._low_power_fallback:
+                eta = np.where(P_mech < 100, self.params.eta, eta)
+            return eta
+
+        if self.params.use_efficiency_map:
+            P_loss = self.get_losses_array(torque, omega)
+            eta_inv = self.params.loss_params.eta_inverter
+            eta = np.clip(P_mech / (P_mech + P_loss) * eta_inv, 0.5, 0.98)
+            # Very low power, efficiency undefined
+            if low_power_fallback:
+                eta = np.where(P_mech < 100, self.params.eta, eta)
+        else:
+            eta = np.full(torque.shape, self.params.eta)
+
+        if self._efficiency_interpolator is not None:
+            points = np.stack([rpm.ravel(), np.abs(torque).ravel()], axis=-1)
+            mapped = self._efficiency_interpolator(points).reshape(torque.shape)
+            eta = np.where(np.isnan(mapped), eta, np.clip(mapped, 0.5, 0.98))
+
+        return eta
+
+    def build_efficiency_map(self, n_rpm: int = 121, n_torque: int = 141) -> UniformTable2D:
+        """Tabulate efficiency over the motoring and generating quadrants.
+
+        The grid spans 0..rpm_max and -T_max..T_max. The result can be set on
+        this motor with set_efficiency_map, or exported through its values
+        and axes (x_points in rpm, y_points in N·m) so that a controller and
+        post-processing share one map.
+
+        Args:
+            n_rpm: Number of speed grid points
+            n_torque: Number of torque grid points
+
+        Returns:
+            Efficiency table indexed by (|rpm|, torque)
+        """
+        if n_rpm < 2 or n_torque < 2:
+            raise ValueError("Efficiency grid needs at least 2 points per axis")
+        saved, self._efficiency_grid = self._efficiency_grid, None
+        try:
+            rpm = np.linspace(0.0, self.params.rpm_max, n_rpm)
+            torque = np.linspace(-self.params.T_max, self.params.T_max, n_torque)
+            # The low-power fallback is applied at lookup, so that the
+            # step it introduces is not smeared across neighbouring cells
+            eta = self.get_efficiency_array(
+                torque[None, :], rpm[:, None] * np.pi / 30.0, low_power_fallback=False
+            )
+        finally:
+            self._efficiency_grid = saved
+        return UniformTable2D(
+            0.0, rpm[1] - rpm[0], torque[0], torque[1] - torque[0], eta
+        )
+
+    def set_efficiency_map(self, efficiency_map: Optional[UniformTable2D]) -> None:
+        """Use a precomputed efficiency table, or None to evaluate the model.
+
+        Args:
+            efficiency_map: Table indexed by (|rpm|, torque), e.g. from
+                build_efficiency_map
+        """
+        self._efficiency_grid = efficiency_map
+
+    @property
+    def efficiency_map(self) -> Optional[UniformTable2D]:
+        """Precomputed efficiency table in use, if any."""
+        return self._efficiency_grid
+
     def get_electrical_power(self, torque: float, omega: float) -> float:
         """Calculate electrical power consumed/generated.
 
@@ -274,6 +431,27 @@ class Motor:
             # Generating: electrical power = mechanical * efficiency
             return P_mech * eta
 
+    def get_electrical_power_array(
+        self,
+        torque: ArrayLike,
+        omega: ArrayLike,
+        efficiency_map: Optional[UniformTable2D] = None,
+    ) -> NDArray:
+        """Array form of get_electrical_power, e.g. over a whole trajectory.
+
+        Args:
+            torque: Motor torques [N·m]
+            omega: Motor angular velocities [rad/s], broadcastable with torque
+            efficiency_map: Table to use in place of the motor's own
+                precomputed grid (see get_efficiency_array)
+
+        Returns:
+            Electrical power [W], positive when motoring
+        """
+        P_mech = np.multiply(torque, omega)
+        eta = self.get_efficiency_array(torque, omega, efficiency_map=efficiency_map)
+        return np.where(P_mech > 0, P_mech / eta, P_mech * eta)
+
     def clip_torque(self, rpm: float, torque_cmd: float, use_boost: bool = False) -> float:
         """Clip torque command to valid range.
 
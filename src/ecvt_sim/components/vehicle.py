@@ -22,8 +22,12 @@ Note: Values from CAT specification sheets.
 Payload varies by body configuration (standard, coal, etc.)
 """
 
+import math
+
 import numpy as np
 from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+from numpy.typing import ArrayLike, NDArray
 
 
 @dataclass
@@ -81,6 +85,11 @@ class Vehicle:
             self.params.m_empty + self._payload_fraction * self.params.m_payload
         )
 
+    @property
+    def _k_aero(self) -> float:
+        """Aerodynamic drag coefficient 0.5 * ρ * C_d * A [N·s²/m²]."""
+        return 0.5 * self.params.rho_air * self.params.C_d * self.params.A_frontal
+
     @property
     def mass(self) -> float:
         """Current vehicle mass [kg]."""
@@ -128,6 +137,25 @@ class Vehicle:
         """
         return omega_wheel * self.params.r_wheel
 
+    def grade_terms(self, grade: Union[float, ArrayLike]) -> Tuple[Union[float, NDArray], ...]:
+        """Sine and cosine of the road angle for a grade.
+
+        sin θ = g / sqrt(1 + g²), cos θ = 1 / sqrt(1 + g²) for θ = atan(g),
+        so no trig calls are needed.
+
+        Args:
+            grade: Road grade [fraction], scalar or array
+
+        Returns:
+            Tuple of (sin θ, cos θ) with θ = atan(grade)
+        """
+        if isinstance(grade, (float, int)):
+            cos_theta = 1.0 / math.sqrt(1.0 + grade * grade)
+            return grade * cos_theta, cos_theta
+        grade = np.asarray(grade, dtype=float)
+        cos_theta = 1.0 / np.sqrt(1.0 + grade * grade)
+        return grade * cos_theta, cos_theta
+
     def calc_grade_force(self, grade: float) -> float:
         """Calculate grade resistance force.
 
@@ -140,9 +168,8 @@ class Vehicle:
         Returns:
             Grade resistance force [N] (positive resists forward motion uphill)
         """
-        # Convert grade percentage to angle
-        theta = np.arctan(grade)
-        return self._mass * self.params.g * np.sin(theta)
+        sin_theta, _ = self.grade_terms(grade)
+        return self._mass * self.params.g * sin_theta
 
     def calc_rolling_resistance(self, grade: float = 0.0) -> float:
         """Calculate rolling resistance force.
@@ -155,8 +182,8 @@ class Vehicle:
         Returns:
             Rolling resistance force [N] (always resists motion)
         """
-        theta = np.arctan(grade)
-        return self._mass * self.params.g * self.params.C_r * np.cos(theta)
+        _, cos_theta = self.grade_terms(grade)
+        return self._mass * self.params.g * self.params.C_r * cos_theta
 
     def calc_aero_drag(self, velocity: float) -> float:
         """Calculate aerodynamic drag force.
@@ -169,13 +196,7 @@ class Vehicle:
         Returns:
             Aerodynamic drag force [N] (always opposes motion)
         """
-        return (
-            0.5
-            * self.params.rho_air
-            * self.params.C_d
-            * self.params.A_frontal
-            * velocity ** 2
-        )
+        return self._k_aero * velocity ** 2
 
     def calc_total_road_load(self, velocity: float, grade: float = 0.0) -> float:
         """Calculate total road load force.
@@ -189,10 +210,40 @@ class Vehicle:
         Returns:
             Total road load force [N] (positive = resisting forward motion)
         """
-        F_grade = self.calc_grade_force(grade)
-        F_roll = self.calc_rolling_resistance(grade)
-        F_aero = self.calc_aero_drag(abs(velocity)) * np.sign(velocity)
-        return F_grade + F_roll + F_aero
+        sin_theta, cos_theta = self.grade_terms(grade)
+        mg = self._mass * self.params.g
+        if isinstance(velocity, (float, int)):
+            F_aero = math.copysign(self._k_aero * velocity ** 2, velocity)
+        else:
+            F_aero = self._k_aero * np.square(velocity) * np.sign(velocity)
+        return mg * sin_theta + mg * self.params.C_r * cos_theta + F_aero
+
+    def calc_road_load_array(
+        self,
+        velocity: ArrayLike,
+        grade: ArrayLike = 0.0,
+        payload_fraction: Optional[ArrayLike] = None,
+    ) -> NDArray:
+        """Array form of calc_total_road_load.
+
+        Args:
+            velocity: Vehicle velocities [m/s]
+            grade: Road grades [fraction], broadcastable with velocity
+            payload_fraction: Payload fractions [0-1], broadcastable with
+                velocity. If None, uses the current payload.
+
+        Returns:
+            Total road load [N]
+        """
+        velocity = np.asarray(velocity, dtype=float)
+        sin_theta, cos_theta = self.grade_terms(np.asarray(grade, dtype=float))
+        if payload_fraction is None:
+            mass = self._mass
+        else:
+            mass = self.params.m_empty + np.clip(payload_fraction, 0.0, 1.0) * self.params.m_payload
+        mg = mass * self.params.g
+        F_aero = self._k_aero * np.square(velocity) * np.sign(velocity)
+        return mg * sin_theta + mg * self.params.C_r * cos_theta + F_aero
 
     def calc_wheel_torque_demand(self, velocity: float, grade: float = 0.0) -> float:
         """Calculate wheel torque needed to maintain velocity.
@@ -209,6 +260,25 @@ class Vehicle:
         F_total = self.calc_total_road_load(velocity, grade)
         return F_total * self.params.r_wheel
 
+    def calc_wheel_torque_demand_array(
+        self,
+        velocity: ArrayLike,
+        grade: ArrayLike = 0.0,
+        payload_fraction: Optional[ArrayLike] = None,
+    ) -> NDArray:
+        """Array form of calc_wheel_torque_demand, e.g. for rimpull curves.
+
+        Args:
+            velocity: Vehicle velocities [m/s]
+            grade: Road grades [fraction], broadcastable with velocity
+            payload_fraction: Payload fractions [0-1], broadcastable with
+                velocity. If None, uses the current payload.
+
+        Returns:
+            Wheel torque demand [N·m]
+        """
+        return self.calc_road_load_array(velocity, grade, payload_fraction) * self.params.r_wheel
+
     def calc_power_demand(self, velocity: float, grade: float = 0.0) -> float:
         """Calculate power needed to maintain velocity.
 
@@ -5,6 +5,9 @@ Implements rule-based control strategy:
 2. Select gear based on vehicle speed
 3. Split torque between engine and MG2
 4. Calculate MG1 reaction torque from planetary constraint
+
+ECMSController replaces step 3 with an equivalent consumption minimization
+over a grid of engine speed/torque candidates.
 """
 
 import numpy as np
@@ -38,6 +41,9 @@ class ControllerParams:
     soc_charge_threshold: float = 0.4   # Start charging below this SOC
     soc_discharge_threshold: float = 0.7  # Allow discharge above this SOC
 
+    # Discrete-time execution
+    sample_period: Optional[float] = None  # Hold outputs this long [s]; None = every RHS call
+
 
 class Controller:
     """Rule-based powertrain controller.
@@ -59,6 +65,11 @@ class Controller:
         """Current gear selection."""
         return self._current_gear
 
+    @property
+    def sample_period(self) -> Optional[float]:
+        """Controller sample period [s], or None to run at every RHS call."""
+        return self.params.sample_period
+
     def select_gear(self, velocity: float, grade: float) -> Gear:
         """Select gear based on vehicle speed and grade.
 
@@ -229,6 +240,188 @@ class Controller:
         return self.compute_torque_split(state, T_demand, grade)
 
 
+@dataclass
+class ECMSParams(ControllerParams):
+    """ECMS controller parameters.
+
+    Equivalent fuel rate: m_eq = m_fuel + s(SOC) * P_batt / LHV, with
+    s(SOC) = s0 * (1 + k_soc * (SOC_target - SOC)) and P_batt the chemical
+    battery power (open-circuit voltage times current).
+    """
+
+    equivalence_factor: float = 2.7     # s0 [-]
+    soc_gain: float = 4.0               # k_soc [-]
+    fuel_lhv: float = 43e6              # Diesel lower heating value [J/kg]
+
+    # Candidate grid: engine speeds over rpm_min_operate..rpm_max_operate,
+    # torques as fractions 0..1 of the available engine torque
+    n_speed_candidates: int = 10
+    n_torque_candidates: int = 11
+
+    # MG1 torque at the carrier per rad/s of engine speed error [N·m·s]
+    speed_gain: float = 200.0
+
+    # The search runs once per sample rather than at every RHS call
+    sample_period: Optional[float] = 0.1
+
+
+class ECMSController(Controller):
+    """Equivalent consumption minimization strategy (ECMS) controller.
+
+    At each call, evaluates every candidate engine operating point at once:
+    the MG1 reaction torque holding the engine there, the MG2 torque making
+    up the ring torque demand, both motors' electrical power from
+    precomputed efficiency maps, and the fuel rate from the engine's BSFC
+    table. The feasible candidate with the lowest equivalent fuel rate is
+    chosen; MG1 then steers the engine toward its speed.
+
+    Candidates are feasible within the MG1 speed and torque limits, MG2
+    torque limits and battery power limits. If none meets the torque demand,
+    those with the smallest MG2 shortfall are considered.
+    """
+
+    def __init__(self, powertrain: Powertrain, params: ECMSParams = None):
+        super().__init__(powertrain, params or ECMSParams())
+        self._build_candidates()
+
+    def _build_candidates(self):
+        """Precompute the candidate grid and the maps evaluated over it."""
+        p = self.params
+        engine = self.powertrain.engine
+        rpm_min = max(p.rpm_min_operate, engine.params.rpm_min)
+        rpm_max = min(p.rpm_max_operate, engine.params.rpm_max)
+
+        rpm = np.linspace(rpm_min, rpm_max, p.n_speed_candidates)[:, None]
+        load = np.linspace(0.0, 1.0, p.n_torque_candidates)[None, :]
+        self._rpm_candidates = rpm
+        self._omega_candidates = rpm * (np.pi / 30.0)
+        self._load_candidates = load
+        self._T_e_max_candidates = engine.get_max_torque_array(rpm)
+        self._fuel_candidates = engine.get_fuel_rate_array(rpm, load * self._T_e_max_candidates)
+
+        # MG1 and MG2 efficiency maps, unless the motors already carry one
+        self._mg1_map = None
+        self._mg2_map = None
+        for motor, attr in ((self.powertrain.mg1, "_mg1_map"), (self.powertrain.mg2, "_mg2_map")):
+            if motor.params.use_efficiency_map and motor.efficiency_map is None:
+                setattr(self, attr, motor.build_efficiency_map())
+
+        self._target_rpm = float(rpm[0, 0])
+
+    @property
+    def target_rpm(self) -> float:
+        """Engine speed chosen at the last call [rpm]."""
+        return self._target_rpm
+
+    def equivalence_factor(self, soc: float) -> float:
+        """SOC-dependent equivalence factor s(SOC), never negative.
+
+        Args:
+            soc: Battery state of charge [0-1]
+
+        Returns:
+            Equivalence factor [-]
+        """
+        p = self.params
+        return max(p.equivalence_factor * (1.0 + p.soc_gain * (p.soc_target - soc)), 0.0)
+
+    def compute_torque_split(
+        self,
+        state: PowertrainState | np.ndarray,
+        T_demand: float,
+        grade: float = 0.0,
+    ) -> PowertrainInput:
+        """Compute torque commands minimizing equivalent fuel consumption.
+
+        Args:
+            state: Current powertrain state
+            T_demand: Demanded wheel torque [N·m]
+            grade: Road grade [fraction]
+
+        Returns:
+            PowertrainInput with torque commands
+        """
+        if isinstance(state, PowertrainState):
+            omega_e, omega_r, soc = state.omega_e, state.omega_r, state.soc
+        else:
+            omega_e, omega_r, soc = state[0], state[1], state[2]
+
+        pt = self.powertrain
+        velocity = pt.get_vehicle_speed(omega_r)
+        gear = self.select_gear(velocity, grade)
+        T_ring_demand = pt.gearbox.wheel_to_ring_torque(T_demand, gear)
+
+        rho = pt.planetary.rho
+        k_sun = pt.get_sun_torque_from_mg1(1.0)  # Sun torque per unit MG1 torque
+
+        # Candidate engine torques, limited by MG1's reaction torque capacity
+        omega_MG1 = pt.get_mg1_speed_array(self._omega_candidates, omega_r)
+        T_MG1_max = pt.mg1.get_max_torque_array(omega_MG1 * (30.0 / np.pi))
+        T_e_available = np.minimum(self._T_e_max_candidates, (1 + rho) * k_sun * T_MG1_max)
+        T_e = self._load_candidates * T_e_available
+        if np.any(T_e_available < self._T_e_max_candidates):
+            fuel = pt.engine.get_fuel_rate_array(self._rpm_candidates, T_e)
+        else:
+            fuel = self._fuel_candidates
+
+        # Steady state: MG1 reacts the engine torque, MG2 fills the ring demand
+        T_MG1 = -T_e / ((1 + rho) * k_sun)
+        T_MG2_min, T_MG2_max = pt.mg2.get_torque_limits(abs(omega_r) * 30 / np.pi, use_boost=True)
+        T_MG2_required = T_ring_demand - rho * T_e / (1 + rho)
+        T_MG2 = np.clip(T_MG2_required, T_MG2_min, T_MG2_max)
+        shortfall = np.abs(T_MG2_required - T_MG2)
+
+        P_batt = pt.mg1.get_electrical_power_array(
+            T_MG1, omega_MG1, efficiency_map=self._mg1_map
+        ) + pt.mg2.get_electrical_power_array(T_MG2, omega_r, efficiency_map=self._mg2_map)
+        P_min, P_max = pt.battery.get_power_limits(soc)
+        P_chem = pt.battery.get_current_from_power_array(P_batt, soc) * (
+            pt.battery.get_open_circuit_voltage(soc)
+        )
+        m_eq = fuel + self.equivalence_factor(soc) * P_chem / self.params.fuel_lhv
+
+        # Hard limits first, then the least torque shortfall, then cost
+        feasible = (T_MG1_max > 0) & (P_batt >= P_min) & (P_batt <= P_max)
+        if not feasible.any():
+            feasible = np.broadcast_to(T_MG1_max > 0, m_eq.shape)
+        if feasible.any():
+            feasible = feasible & (shortfall <= shortfall[feasible].min() + 1.0)
+            i, j = np.unravel_index(np.argmin(np.where(feasible, m_eq, np.inf)), m_eq.shape)
+            omega_target = float(self._omega_candidates[i, 0])
+            T_e_cmd = float(T_e[i, j])
+        else:
+            omega_target = omega_e
+            T_e_cmd = 0.0
+        self._target_rpm = omega_target * 30.0 / np.pi
+
+        # Apply at the current engine speed: MG1 reacts the engine torque and
+        # steers the engine toward the target speed. Engine torque gives way
+        # where MG1 cannot absorb it, as in the rule-based controller.
+        tau_carrier = self.params.speed_gain * (omega_target - omega_e)
+        T_MG1_min, T_MG1_lim = pt.mg1.get_torque_limits(
+            abs(pt.get_mg1_speed(omega_e, omega_r)) * 30 / np.pi
+        )
+        if omega_e > 0:
+            T_e_cmd = min(
+                T_e_cmd,
+                pt.engine.get_max_torque(pt.engine.rads_to_rpm(omega_e)),
+                max(tau_carrier - (1 + rho) * k_sun * T_MG1_min, 0.0),
+            )
+        else:
+            T_e_cmd = 0.0
+        T_MG1_cmd = np.clip((tau_carrier - T_e_cmd) / ((1 + rho) * k_sun), T_MG1_min, T_MG1_lim)
+
+        T_ring_from_engine = -rho * pt.get_sun_torque_from_mg1(T_MG1_cmd)
+        T_MG2_cmd = np.clip(T_ring_demand - T_ring_from_engine, T_MG2_min, T_MG2_max)
+
+        return PowertrainInput(
+            T_e=float(T_e_cmd),
+            T_MG1=float(T_MG1_cmd),
+            T_MG2=float(T_MG2_cmd),
+            gear=int(gear),
+        )
+
+
 def create_default_controller(powertrain: Powertrain) -> Controller:
     """Create controller with default parameters.
 
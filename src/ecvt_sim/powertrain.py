@@ -21,7 +21,8 @@ Extended topology support:
 
 import numpy as np
 from dataclasses import dataclass, field
-from typing import Optional, Union
+from typing import Dict, Optional, Union
+from numpy.typing import ArrayLike, NDArray
 
 from .components.planetary_gear import PlanetaryGear, PlanetaryGearParams
 from .components.engine import Engine, EngineParams
@@ -187,6 +188,16 @@ class Powertrain:
         # Compute equivalent inertias
         self._compute_inertias()
 
+        # Per-gear constants for dynamics(), keyed by (gear, vehicle mass)
+        self._dynamics_cache: Dict[tuple, tuple] = {}
+
+        # Drop those constants when a ratio or efficiency in the MG1 reduction
+        # or modular drivetrain is edited (see _invalidate)
+        self._selected_gear = self.get_current_gear()
+        self.mg1_reduction._add_listener(self)
+        if self._output_drivetrain is not None:
+            self._output_drivetrain._add_listener(self)
+
     def _compute_inertias(self):
         """Compute equivalent inertias for state-space model."""
         rho = self._rho
@@ -269,8 +280,13 @@ class Powertrain:
         Returns:
             2x2 inertia matrix [kg·m²]
         """
-        K_total = self.get_output_ratio(gear)
-        J_v_refl = self.vehicle.mass * self.vehicle.r_wheel ** 2 / K_total ** 2
+        if self._use_legacy_gearbox:
+            J_v_refl = self.gearbox.get_reflected_vehicle_inertia(
+                self.vehicle.mass, self.vehicle.r_wheel, gear
+            )
+        else:
+            K_total = self.get_output_ratio(gear)
+            J_v_refl = self.vehicle.mass * self.vehicle.r_wheel ** 2 / K_total ** 2
 
         J = np.array([
             [self._J_eq1, self._J_12],
@@ -278,6 +294,55 @@ class Powertrain:
         ])
         return J
 
+    def _dynamics_terms(self, gear: int) -> tuple:
+        """Constants used by dynamics() for one gear at the current payload.
+
+        Returns:
+            Tuple of (Jinv_11, Jinv_12, Jinv_22, k_velocity, k_load): the
+            closed-form inverse of the symmetric 2x2 inertia matrix, ring
+            speed to vehicle speed, and wheel torque to ring load torque
+        """
+        key = (gear, self.vehicle.mass)
+        terms = self._dynamics_cache.get(key)
+        if terms is None:
+            if not self._use_legacy_gearbox:
+                # Modular drivetrain ratios follow the selected gear
+                self.set_gear(gear)
+            (J_11, J_12), (_, J_22) = self.get_inertia_matrix(gear)
+            det = J_11 * J_22 - J_12 * J_12
+            if self._use_legacy_gearbox:
+                k_load = self.gearbox.wheel_to_ring_torque(1.0, gear)
+            else:
+                k_load = self._output_drivetrain.output_to_input_torque(1.0)
+            terms = (
+                J_22 / det,
+                -J_12 / det,
+                J_11 / det,
+                self.get_vehicle_speed(1.0, gear),
+                k_load,
+            )
+            self._dynamics_cache[key] = terms
+        return terms
+
+    def clear_dynamics_cache(self):
+        """Forget cached per-gear dynamics constants.
+
+        Ratio and efficiency edits in the MG1 reduction or the modular
+        output drivetrain and payload changes are picked up automatically. Call this after editing the legacy gearbox or
+        component inertias in place.
+        """
+        self._dynamics_cache.clear()
+
+    def _invalidate(self):
+        """Listener hook called by drivetrain components when they change."""
+        gear = self.get_current_gear()
+        if gear != self._selected_gear:
+            # A gear selection only; the cache is already keyed by gear
+            self._selected_gear = gear
+            return
+        self._compute_inertias()
+        self.clear_dynamics_cache()
+
     def get_sun_speed(self, omega_e: float, omega_r: float) -> float:
         """Calculate sun gear speed from Willis equation.
 
@@ -312,6 +377,93 @@ class Powertrain:
         # MG1 runs slower than sun: omega_MG1 = omega_sun / K_mg1
         return self.mg1_reduction.input_to_output_speed(omega_sun)
 
+    def get_mg1_speed_array(self, omega_e: ArrayLike, omega_r: ArrayLike) -> NDArray:
+        """Array form of get_mg1_speed (Willis equation and MG1 reduction).
+
+        Args:
+            omega_e: Engine/carrier speeds [rad/s]
+            omega_r: Ring gear speeds [rad/s], broadcastable with omega_e
+
+        Returns:
+            MG1 motor speeds [rad/s]
+        """
+        omega_sun = self.planetary.calc_sun_speed(
+            np.asarray(omega_e, dtype=float), np.asarray(omega_r, dtype=float)
+        )
+        return omega_sun / self.mg1_reduction.ratio
+
+    def _gear_factors(self, omega_r: NDArray, gears: Optional[ArrayLike]) -> tuple:
+        """Per-sample ring-to-vehicle-speed and wheel-to-ring-torque factors.
+
+        Args:
+            omega_r: Ring gear speeds [rad/s], fixes the output shape
+            gears: Gear per sample, a single gear, or None for the current gear
+
+        Returns:
+            Tuple of (k_velocity, k_load), broadcastable with omega_r
+        """
+        if self._use_legacy_gearbox:
+            # Gear-indexed tables take the whole gear array at once
+            k_velocity = self.gearbox.ring_to_vehicle_speed(1.0, self.vehicle.r_wheel, gears)
+            return k_velocity, self.gearbox.wheel_to_ring_torque(1.0, gears)
+
+        current = self.get_current_gear()
+        if gears is None:
+            gears = current
+        gears = np.asarray(gears)
+        try:
+            if gears.ndim == 0:
+                _, _, _, k_velocity, k_load = self._dynamics_terms(int(gears))
+                return k_velocity, k_load
+
+            k_velocity = np.empty(gears.shape)
+            k_load = np.empty(gears.shape)
+            for gear in np.unique(gears):
+                mask = gears == gear
+                _, _, _, k_velocity[mask], k_load[mask] = self._dynamics_terms(int(gear))
+            return k_velocity, k_load
+        finally:
+            # Looking up a modular drivetrain's ratios selects each gear
+            if self.get_current_gear() != current:
+                self.set_gear(current)
+
+    def get_vehicle_speed_array(
+        self, omega_r: ArrayLike, gears: Optional[ArrayLike] = None
+    ) -> NDArray:
+        """Array form of get_vehicle_speed, e.g. over a whole trajectory.
+
+        Args:
+            omega_r: Ring gear speeds [rad/s]
+            gears: Gear per sample, a single gear, or None for the current gear
+
+        Returns:
+            Vehicle speeds [m/s]
+        """
+        omega_r = np.asarray(omega_r, dtype=float)
+        k_velocity, _ = self._gear_factors(omega_r, gears)
+        return omega_r * k_velocity
+
+    def get_load_torque_array(
+        self,
+        omega_r: ArrayLike,
+        grade: ArrayLike,
+        gears: Optional[ArrayLike] = None,
+    ) -> NDArray:
+        """Array form of get_load_torque, e.g. over a whole trajectory.
+
+        Args:
+            omega_r: Ring gear speeds [rad/s]
+            grade: Road grades [fraction], broadcastable with omega_r
+            gears: Gear per sample, a single gear, or None for the current gear
+
+        Returns:
+            Load torques at the ring gear [N·m]
+        """
+        omega_r = np.asarray(omega_r, dtype=float)
+        k_velocity, k_load = self._gear_factors(omega_r, gears)
+        T_wheel = self.vehicle.calc_wheel_torque_demand_array(omega_r * k_velocity, grade)
+        return T_wheel * k_load
+
     def get_sun_torque_from_mg1(self, T_mg1: float) -> float:
         """Calculate sun gear torque from MG1 motor torque.
 
@@ -418,14 +570,21 @@ class Powertrain:
         x: np.ndarray,
         u: PowertrainInput | np.ndarray,
         grade: float = 0.0,
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         """Compute state derivatives for ODE integration.
 
+        The inverse inertia matrix and output ratios are cached per gear and
+        payload (see _dynamics_terms), so each call solves the 2x2 system in
+        closed form without building any matrices.
+
         Args:
             t: Time [s] (unused, for ODE solver compatibility)
             x: State vector [omega_e, omega_r, SOC]
             u: Control input (PowertrainInput or array [T_e, T_MG1, T_MG2])
             grade: Road grade [fraction]
+            out: Optional array of length 3 to write the derivatives into,
+                avoiding an allocation per call
 
         Returns:
             State derivatives [dω_e/dt, dω_r/dt, dSOC/dt]
@@ -442,16 +601,16 @@ class Powertrain:
             gear = int(u[3]) if len(u) > 3 else self.gearbox.gear
 
         # Set gear
-        self.set_gear(gear)
+        if gear != self.get_current_gear():
+            self.set_gear(gear)
+        Jinv_11, Jinv_12, Jinv_22, k_velocity, k_load = self._dynamics_terms(gear)
 
         # Calculate MG1 speed
         omega_MG1 = self.get_mg1_speed(omega_e, omega_r)
 
         # Calculate load torque at ring gear
-        T_load = self.get_load_torque(omega_r, grade, gear)
-
-        # Build inertia matrix
-        J = self.get_inertia_matrix(gear)
+        T_wheel = self.vehicle.calc_wheel_torque_demand(omega_r * k_velocity, grade)
+        T_load = T_wheel * k_load
 
         # Calculate sun torque from MG1 through reduction gear
         # T_sun = T_MG1 * K_mg1 * η_mg1
@@ -460,13 +619,12 @@ class Powertrain:
         # Torque vector (using ρ: τ1 = Te + (1+ρ)·T_sun, τ2 = -ρ·T_sun + TMG2 - Tload)
         # Note: The -ρ·T_sun term means MG1 generating (T_MG1 < 0) adds torque to ring
         rho = self._rho
-        tau = np.array([
-            T_e + (1 + rho) * T_sun,
-            -rho * T_sun + T_MG2 - T_load
-        ])
+        tau_1 = T_e + (1 + rho) * T_sun
+        tau_2 = -rho * T_sun + T_MG2 - T_load
 
-        # Solve for accelerations: J · [dω_e, dω_r]ᵀ = τ
-        d_omega = np.linalg.solve(J, tau)
+        # Solve for accelerations: [dω_e, dω_r]ᵀ = J⁻¹ · τ
+        d_omega_e = Jinv_11 * tau_1 + Jinv_12 * tau_2
+        d_omega_r = Jinv_12 * tau_1 + Jinv_22 * tau_2
 
         # Battery dynamics
         P_MG1 = self.mg1.get_electrical_power(T_MG1, omega_MG1)
@@ -475,7 +633,12 @@ class Powertrain:
 
         d_soc = self.battery.get_soc_derivative(P_battery, soc)
 
-        return np.array([d_omega[0], d_omega[1], d_soc])
+        if out is None:
+            return np.array([d_omega_e, d_omega_r, d_soc])
+        out[0] = d_omega_e
+        out[1] = d_omega_r
+        out[2] = d_soc
+        return out
 
     def get_output(
         self,
@@ -74,6 +74,12 @@ def simulate(
 ) -> SimulationResult:
     """Run time-domain simulation of powertrain.
 
+    A controller with a ``sample_period`` attribute [s] (see
+    ControllerParams.sample_period) runs in discrete time: it is evaluated
+    once per sample instant, its outputs are held until the next sample, and
+    the ODE is integrated smoothly between samples. Otherwise the controller
+    is evaluated at every RHS call.
+
     Args:
         powertrain: Powertrain model instance
         x0: Initial state
@@ -101,28 +107,35 @@ def simulate(
     control_log = []
     grade_log = []
 
+    def control_input(t, x, grade):
+        """Controller output at time t."""
+        if controller is None:
+            # Open loop: zero torques
+            return PowertrainInput()
+        if isinstance(controller, Controller):
+            if v_target is not None:
+                return controller.compute_speed_control(x, v_target, grade)
+            # Compute based on steady-state demand
+            v_current = powertrain.get_vehicle_speed(x[1])
+            T_demand = powertrain.vehicle.calc_wheel_torque_demand(v_current, grade)
+            return controller.compute_torque_split(x, T_demand, grade)
+        return controller(t, x)
+
+    sample_period = getattr(controller, "sample_period", None)
+    if sample_period is not None and sample_period <= 0:
+        raise ValueError("Controller sample_period must be positive")
+    held = PowertrainInput()
+
     def dynamics_wrapper(t, x):
         """Wrapper for ODE solver."""
         grade = grade_profile(t)
 
         # Get control input
-        if controller is not None:
-            if isinstance(controller, Controller):
-                if v_target is not None:
-                    u = controller.compute_speed_control(x, v_target, grade)
-                else:
-                    # Compute based on steady-state demand
-                    v_current = powertrain.get_vehicle_speed(x[1])
-                    T_demand = powertrain.vehicle.calc_wheel_torque_demand(v_current, grade)
-                    u = controller.compute_torque_split(x, T_demand, grade)
-            else:
-                u = controller(t, x)
+        if sample_period is None:
+            u = control_input(t, x, grade)
+            control_log.append((t, u.T_e, u.T_MG1, u.T_MG2, u.gear))
         else:
-            # Open loop: zero torques
-            u = PowertrainInput()
-
-        # Log control inputs
-        control_log.append((t, u.T_e, u.T_MG1, u.T_MG2, u.gear))
+            u = held
         grade_log.append((t, grade))
 
         # Compute dynamics
@@ -132,80 +145,104 @@ def simulate(
     t_eval = np.arange(config.t_start, config.t_end + config.dt_output, config.dt_output)
 
     # Run integration
-    sol = solve_ivp(
-        dynamics_wrapper,
-        (config.t_start, config.t_end),
-        x0_arr,
-        method=config.method,
-        t_eval=t_eval,
-        rtol=config.rtol,
-        atol=config.atol,
-    )
-
-    if not sol.success:
-        raise RuntimeError(f"Integration failed: {sol.message}")
+    if sample_period is None:
+        sol = solve_ivp(
+            dynamics_wrapper,
+            (config.t_start, config.t_end),
+            x0_arr,
+            method=config.method,
+            t_eval=t_eval,
+            rtol=config.rtol,
+            atol=config.atol,
+        )
+        if not sol.success:
+            raise RuntimeError(f"Integration failed: {sol.message}")
+        t_out, y_out = sol.t, sol.y
+    else:
+        # One integration per sample interval, controller output held
+        n_intervals = max(int(np.ceil((config.t_end - config.t_start) / sample_period - 1e-9)), 1)
+        t_samples = config.t_start + sample_period * np.arange(n_intervals + 1)
+        t_samples[-1] = config.t_end
+        t_eval = t_eval[t_eval <= config.t_end]
+        y_out = np.empty((len(x0_arr), len(t_eval)))
+        x = x0_arr
+        first_step = None
+        for i, (t0, t1) in enumerate(zip(t_samples[:-1], t_samples[1:])):
+            held = control_input(t0, x, grade_profile(t0))
+            control_log.append((t0, held.T_e, held.T_MG1, held.T_MG2, held.gear))
+
+            sol = solve_ivp(
+                dynamics_wrapper,
+                (t0, t1),
+                x,
+                method=config.method,
+                dense_output=True,
+                first_step=min(first_step, t1 - t0) if first_step else None,
+                rtol=config.rtol,
+                atol=config.atol,
+            )
+            if not sol.success:
+                raise RuntimeError(f"Integration failed at t={t0:.3f}s: {sol.message}")
+            # Resume the next interval from the last step size
+            first_step = sol.t[-1] - sol.t[-2] if len(sol.t) > 1 else None
+
+            last = i == n_intervals - 1
+            in_interval = (t_eval >= t0) & ((t_eval <= t1) if last else (t_eval < t1))
+            if in_interval.any():
+                y_out[:, in_interval] = sol.sol(t_eval[in_interval])
+            x = sol.y[:, -1]
+        t_out = t_eval
 
     # Build result
     result = SimulationResult(
-        t=sol.t,
-        omega_e=sol.y[0],
-        omega_r=sol.y[1],
-        soc=sol.y[2],
+        t=t_out,
+        omega_e=y_out[0],
+        omega_r=y_out[1],
+        soc=y_out[2],
     )
 
-    # Compute derived quantities
-    result.omega_MG1 = np.array([
-        powertrain.get_mg1_speed(oe, oR)
-        for oe, oR in zip(result.omega_e, result.omega_r)
-    ])
-    result.velocity = np.array([
-        powertrain.get_vehicle_speed(oR)
-        for oR in result.omega_r
-    ])
-
-    # Convert to RPM
-    result.rpm_e = result.omega_e * 30 / np.pi
-    result.rpm_MG1 = result.omega_MG1 * 30 / np.pi
-    result.rpm_r = result.omega_r * 30 / np.pi
-
     # Interpolate control inputs to output times
     if control_log:
-        ctrl_t = np.array([c[0] for c in control_log])
-        ctrl_Te = np.array([c[1] for c in control_log])
-        ctrl_TMG1 = np.array([c[2] for c in control_log])
-        ctrl_TMG2 = np.array([c[3] for c in control_log])
-        ctrl_gear = np.array([c[4] for c in control_log])
-
-        result.T_e = np.interp(result.t, ctrl_t, ctrl_Te)
-        result.T_MG1 = np.interp(result.t, ctrl_t, ctrl_TMG1)
-        result.T_MG2 = np.interp(result.t, ctrl_t, ctrl_TMG2)
-        result.gear = np.interp(result.t, ctrl_t, ctrl_gear).astype(int)
+        log = np.array(control_log, dtype=float)
+        ctrl_t = log[:, 0]
+        if sample_period is None:
+            result.T_e = np.interp(result.t, ctrl_t, log[:, 1])
+            result.T_MG1 = np.interp(result.t, ctrl_t, log[:, 2])
+            result.T_MG2 = np.interp(result.t, ctrl_t, log[:, 3])
+            result.gear = np.interp(result.t, ctrl_t, log[:, 4]).astype(int)
+        else:
+            # Outputs held from the latest sample instant
+            held_rows = log[np.searchsorted(ctrl_t, result.t, side="right") - 1]
+            result.T_e = held_rows[:, 1]
+            result.T_MG1 = held_rows[:, 2]
+            result.T_MG2 = held_rows[:, 3]
+            result.gear = held_rows[:, 4].astype(int)
 
     # Interpolate grade
     if grade_log:
-        grade_t = np.array([g[0] for g in grade_log])
-        grade_v = np.array([g[1] for g in grade_log])
-        result.grade = np.interp(result.t, grade_t, grade_v)
+        grades = np.array(grade_log, dtype=float)
+        result.grade = np.interp(result.t, grades[:, 0], grades[:, 1])
     else:
         result.grade = np.zeros_like(result.t)
 
+    # Compute derived quantities, each sample in the gear it was run in
+    gears = result.gear if len(result.gear) == len(result.t) else None
+    result.omega_MG1 = powertrain.get_mg1_speed_array(result.omega_e, result.omega_r)
+    result.velocity = powertrain.get_vehicle_speed_array(result.omega_r, gears)
+
+    # Convert to RPM
+    result.rpm_e = result.omega_e * 30 / np.pi
+    result.rpm_MG1 = result.omega_MG1 * 30 / np.pi
+    result.rpm_r = result.omega_r * 30 / np.pi
+
     # Compute powers
     result.P_engine = result.T_e * result.omega_e
-    result.P_MG1 = np.array([
-        powertrain.mg1.get_electrical_power(T, omega)
-        for T, omega in zip(result.T_MG1, result.omega_MG1)
-    ])
-    result.P_MG2 = np.array([
-        powertrain.mg2.get_electrical_power(T, omega)
-        for T, omega in zip(result.T_MG2, result.omega_r)
-    ])
+    result.P_MG1 = powertrain.mg1.get_electrical_power_array(result.T_MG1, result.omega_MG1)
+    result.P_MG2 = powertrain.mg2.get_electrical_power_array(result.T_MG2, result.omega_r)
     result.P_battery = result.P_MG1 + result.P_MG2
 
     # Compute load torque
-    result.T_load = np.array([
-        powertrain.get_load_torque(omega_r, grade)
-        for omega_r, grade in zip(result.omega_r, result.grade)
-    ])
+    result.T_load = powertrain.get_load_torque_array(result.omega_r, result.grade, gears)
 
     return result
 
@@ -1,7 +1,10 @@
 """Drivetrain comparison tools."""
 
-from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional, Union
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -85,66 +88,249 @@ class ComparisonResult:
         return f"ComparisonResult(configs={self.names})"
 
 
+DEFAULT_METRICS = [
+    "fuel_total",
+    "energy_consumed",
+    "final_velocity",
+    "max_velocity",
+    "final_soc",
+    "avg_power",
+]
+
+
+@dataclass
+class Scenario:
+    """Picklable description of one simulation run.
+
+    Holds factories and parameters rather than built objects, so a scenario
+    can be sent to a worker process and built there. Factories must be
+    importable module-level functions or classes (e.g.
+    ``create_ecvt_789d`` and ``ECVTController``), not lambdas or closures.
+
+    Attributes:
+        drivetrain_factory: Function (**drivetrain_params) -> Drivetrain
+        controller_factory: Function (drivetrain, **controller_params) -> controller
+        initial_state: Initial state dict, or a function
+            (**initial_state_params) -> dict
+        drivetrain_params: Keyword arguments for drivetrain_factory
+        controller_params: Keyword arguments for controller_factory
+        initial_state_params: Keyword arguments for initial_state, if callable
+        duty_cycle: Function (t) -> (target_velocity, grade). If None, the
+            duty cycle passed to compare_drivetrains is used.
+    """
+
+    drivetrain_factory: Callable[..., Drivetrain]
+    controller_factory: Callable[..., Any]
+    initial_state: Union[Dict[str, float], Callable[..., Dict[str, float]]]
+    drivetrain_params: Dict[str, Any] = field(default_factory=dict)
+    controller_params: Dict[str, Any] = field(default_factory=dict)
+    initial_state_params: Dict[str, Any] = field(default_factory=dict)
+    duty_cycle: Optional[Callable[[float], tuple]] = None
+
+    def build(self) -> Tuple[Drivetrain, Any, Dict[str, float]]:
+        """Build the drivetrain, controller and initial state.
+
+        Returns:
+            Tuple of (drivetrain, controller, initial_state)
+        """
+        drivetrain = self.drivetrain_factory(**self.drivetrain_params)
+        controller = self.controller_factory(drivetrain, **self.controller_params)
+        if callable(self.initial_state):
+            x0 = self.initial_state(**self.initial_state_params)
+        else:
+            x0 = dict(self.initial_state)
+        return drivetrain, controller, x0
+
+    def with_params(
+        self,
+        drivetrain: Optional[Dict[str, Any]] = None,
+        controller: Optional[Dict[str, Any]] = None,
+        initial_state: Optional[Dict[str, Any]] = None,
+    ) -> "Scenario":
+        """Copy this scenario with some factory parameters overridden.
+
+        Args:
+            drivetrain: Overrides for drivetrain_params
+            controller: Overrides for controller_params
+            initial_state: Overrides for initial_state_params
+
+        Returns:
+            New Scenario
+        """
+        return replace(
+            self,
+            drivetrain_params={**self.drivetrain_params, **(drivetrain or {})},
+            controller_params={**self.controller_params, **(controller or {})},
+            initial_state_params={**self.initial_state_params, **(initial_state or {})},
+        )
+
+
+class _DutyCycleGrade:
+    """Grade profile taken from a duty cycle (picklable)."""
+
+    def __init__(self, duty_cycle: Callable[[float], tuple]):
+        self.duty_cycle = duty_cycle
+
+    def __call__(self, t: float) -> float:
+        _, grade = self.duty_cycle(t)
+        return grade
+
+
+class _DutyCycleControl:
+    """Control function that sets the controller target from a duty cycle."""
+
+    def __init__(self, controller: Any, duty_cycle: Callable[[float], tuple]):
+        self.controller = controller
+        self.duty_cycle = duty_cycle
+
+    @property
+    def sample_period(self) -> Optional[float]:
+        """Sample period of the wrapped controller, so it still runs sampled [s]."""
+        return getattr(self.controller, "sample_period", None)
+
+    def __call__(self, t: float, state: Dict[str, float], grade: float) -> Dict[str, float]:
+        target_v, _ = self.duty_cycle(t)
+        if hasattr(self.controller, "target_velocity"):
+            self.controller.target_velocity = target_v
+        return self.controller.compute(state, grade)
+
+
+def _run_configuration(
+    configuration: Union[tuple, Scenario],
+    duty_cycle: Callable[[float], tuple],
+    config: SimulationConfig,
+    metrics: List[str],
+) -> Tuple[SimulationResult, Dict[str, float]]:
+    """Simulate one configuration and compute its metrics."""
+    if isinstance(configuration, Scenario):
+        drivetrain, controller, x0 = configuration.build()
+        duty_cycle = configuration.duty_cycle or duty_cycle
+    else:
+        drivetrain, controller, x0 = configuration
+
+    result = simulate(
+        drivetrain,
+        x0,
+        _DutyCycleControl(controller, duty_cycle),
+        _DutyCycleGrade(duty_cycle),
+        config,
+    )
+    return result, _compute_metrics(result, metrics)
+
+
 def compare_drivetrains(
-    configurations: Dict[str, tuple],
+    configurations: Dict[str, Union[tuple, Scenario]],
     duty_cycle: Callable[[float], tuple],
     config: SimulationConfig = None,
     metrics: Optional[List[str]] = None,
+    n_workers: Optional[int] = 1,
+    chunksize: int = 1,
 ) -> ComparisonResult:
     """Compare multiple drivetrain configurations on the same duty cycle.
 
+    With n_workers other than 1 the configurations are simulated in a
+    process pool. Each must then be a Scenario, and the duty cycle must be
+    picklable (e.g. from create_haul_cycle). Results are returned in the
+    order of ``configurations`` regardless of which worker finishes first.
+
     Args:
         configurations: Dict mapping name to (drivetrain, controller, initial_state)
+            or to a Scenario
         duty_cycle: Function (t) -> (target_velocity, grade)
         config: Simulation configuration
         metrics: List of metrics to compute (default: all)
+        n_workers: Number of worker processes; 1 runs in this process,
+            None uses all cores
+        chunksize: Configurations sent to a worker at a time
 
     Returns:
         ComparisonResult with simulation results and metrics
+
+    Raises:
+        ValueError: If running in parallel and a configuration is not a Scenario
     """
     config = config or SimulationConfig()
-
-    if metrics is None:
-        metrics = [
-            "fuel_total",
-            "energy_consumed",
-            "final_velocity",
-            "max_velocity",
-            "final_soc",
-            "avg_power",
-        ]
+    metrics = list(DEFAULT_METRICS) if metrics is None else metrics
 
     names = list(configurations.keys())
-    results = {}
-    computed_metrics = {}
-
-    for name, (drivetrain, controller, x0) in configurations.items():
-        # Create grade and velocity profiles from duty cycle
-        def grade_profile(t):
-            _, grade = duty_cycle(t)
-            return grade
-
-        # Set controller target from duty cycle
-        def control_wrapper(t, state, grade):
-            target_v, _ = duty_cycle(t)
-            if hasattr(controller, "target_velocity"):
-                controller.target_velocity = target_v
-            return controller.compute(state, grade)
-
-        # Run simulation
-        result = simulate(
-            drivetrain,
-            x0,
-            control_wrapper,
-            grade_profile,
-            config,
-        )
-        results[name] = result
+    items = [configurations[name] for name in names]
+
+    if n_workers == 1 or len(items) <= 1:
+        outputs = [_run_configuration(item, duty_cycle, config, metrics) for item in items]
+    else:
+        for name, item in zip(names, items):
+            if not isinstance(item, Scenario):
+                raise ValueError(
+                    f"Configuration '{name}' must be a Scenario to run in parallel"
+                )
+        max_workers = min(n_workers or os.cpu_count() or 1, len(items))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            outputs = list(
+                executor.map(
+                    _run_configuration,
+                    items,
+                    repeat(duty_cycle),
+                    repeat(config),
+                    repeat(metrics),
+                    chunksize=chunksize,
+                )
+            )
+
+    results = {name: result for name, (result, _) in zip(names, outputs)}
+    computed_metrics = {name: values for name, (_, values) in zip(names, outputs)}
+    return ComparisonResult(names, results, computed_metrics)
 
-        # Compute metrics
-        computed_metrics[name] = _compute_metrics(result, metrics)
 
-    return ComparisonResult(names, results, computed_metrics)
+def sweep_parameter(
+    scenario: Scenario,
+    target: str,
+    parameter: str,
+    values: Sequence[Any],
+    duty_cycle: Optional[Callable[[float], tuple]] = None,
+    config: SimulationConfig = None,
+    metrics: Optional[List[str]] = None,
+    n_workers: Optional[int] = 1,
+    chunksize: int = 1,
+) -> ComparisonResult:
+    """Run a scenario over a range of values for one factory parameter.
+
+    Args:
+        scenario: Base scenario
+        target: Which factory the parameter belongs to: "drivetrain",
+            "controller" or "initial_state"
+        parameter: Keyword argument name, e.g. "payload_fraction"
+        values: Values to sweep
+        duty_cycle: Duty cycle, if the scenario doesn't define one
+        config: Simulation configuration
+        metrics: List of metrics to compute (default: all)
+        n_workers: Number of worker processes; 1 runs in this process,
+            None uses all cores
+        chunksize: Scenarios sent to a worker at a time
+
+    Returns:
+        ComparisonResult with one configuration per value, named
+        "<parameter>=<value>"
+
+    Raises:
+        ValueError: If target is unknown or no duty cycle is given
+    """
+    if target not in ("drivetrain", "controller", "initial_state"):
+        raise ValueError(f"Unknown sweep target '{target}'")
+    if duty_cycle is None and scenario.duty_cycle is None:
+        raise ValueError("No duty cycle given")
+
+    configurations = {
+        f"{parameter}={value}": scenario.with_params(**{target: {parameter: value}})
+        for value in values
+    }
+    return compare_drivetrains(
+        configurations,
+        duty_cycle,
+        config,
+        metrics,
+        n_workers=n_workers,
+        chunksize=chunksize,
+    )
 
 
 def _compute_metrics(result: SimulationResult, metric_names: List[str]) -> Dict[str, float]:
@@ -208,6 +394,50 @@ def _compute_metrics(result: SimulationResult, metric_names: List[str]) -> Dict[
     return metrics
 
 
+@dataclass(frozen=True)
+class HaulCycle:
+    """Loaded climb followed by unloaded return, repeating.
+
+    Callable as (t) -> (target_velocity, grade). See create_haul_cycle.
+    """
+
+    load_duration: float = 300.0
+    return_duration: float = 200.0
+    load_grade: float = 0.10
+    return_grade: float = -0.08
+    load_speed: float = 8.0
+    return_speed: float = 12.0
+
+    def __call__(self, t: float) -> tuple:
+        # Wrap time to cycle
+        t = t % (self.load_duration + self.return_duration)
+
+        if t < self.load_duration:
+            # Loaded climb
+            return (self.load_speed, self.load_grade)
+        else:
+            # Unloaded return
+            return (self.return_speed, self.return_grade)
+
+
+@dataclass(frozen=True)
+class GradeClimbProfile:
+    """Flat section followed by a constant grade.
+
+    Callable as (t) -> (target_velocity, grade). See create_grade_climb_profile.
+    """
+
+    target_velocity: float = 10.0
+    initial_flat: float = 10.0
+    grade: float = 0.10
+
+    def __call__(self, t: float) -> tuple:
+        if t < self.initial_flat:
+            return (self.target_velocity, 0.0)
+        else:
+            return (self.target_velocity, self.grade)
+
+
 def create_haul_cycle(
     load_duration: float = 300.0,
     return_duration: float = 200.0,
@@ -233,20 +463,9 @@ def create_haul_cycle(
     Returns:
         Function (t) -> (target_velocity, grade)
     """
-    total = load_duration + return_duration
-
-    def duty_cycle(t: float) -> tuple:
-        # Wrap time to cycle
-        t = t % total
-
-        if t < load_duration:
-            # Loaded climb
-            return (load_speed, load_grade)
-        else:
-            # Unloaded return
-            return (return_speed, return_grade)
-
-    return duty_cycle
+    return HaulCycle(
+        load_duration, return_duration, load_grade, return_grade, load_speed, return_speed
+    )
 
 
 def create_grade_climb_profile(
@@ -266,11 +485,4 @@ def create_grade_climb_profile(
     Returns:
         Function (t) -> (target_velocity, grade)
     """
-
-    def duty_cycle(t: float) -> tuple:
-        if t < initial_flat:
-            return (target_velocity, 0.0)
-        else:
-            return (target_velocity, grade)
-
-    return duty_cycle
+    return GradeClimbProfile(target_velocity, initial_flat, grade)
@@ -1,9 +1,11 @@
 """Battery component for hybrid and electric drivetrains."""
 
+import math
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
 from ..core.component import DrivetrainComponent
 from ..core.ports import Port, PortType, PortDirection
@@ -188,9 +190,30 @@ class BatteryComponent(DrivetrainComponent):
             return V_oc / (2 * R) if power > 0 else -V_oc / (2 * R)
 
         # Use solution that gives smaller magnitude current
-        I = (V_oc - np.sqrt(discriminant)) / (2 * R)
+        I = (V_oc - math.sqrt(discriminant)) / (2 * R)
         return I
 
+    def get_current_from_power_array(self, power: ArrayLike, soc: ArrayLike) -> NDArray:
+        """Array form of get_current_from_power.
+
+        Args:
+            power: Electrical power [W] (positive = discharge)
+            soc: States of charge, broadcastable with power
+
+        Returns:
+            Current [A] (positive = discharge)
+        """
+        power = np.asarray(power, dtype=float)
+        V_oc = self.params.V_oc
+        R = self.params.R_int
+
+        discriminant = V_oc**2 - 4 * R * power
+        I = (V_oc - np.sqrt(np.maximum(discriminant, 0.0))) / (2 * R)
+        # Power exceeds capability - return limiting current
+        I = np.where(discriminant < 0, np.where(power > 0, V_oc, -V_oc) / (2 * R), I)
+        I = np.where(np.abs(power) < 1e-6, 0.0, I)
+        return np.broadcast_to(I, np.broadcast(power, np.asarray(soc)).shape)
+
     def get_terminal_voltage(self, current: float, soc: float = None) -> float:
         """Get terminal voltage at given current.
 
@@ -207,6 +230,19 @@ class BatteryComponent(DrivetrainComponent):
         V_oc = self.get_open_circuit_voltage(soc)
         return V_oc - current * self.params.R_int
 
+    def get_terminal_voltage_array(self, current: ArrayLike, soc: ArrayLike) -> NDArray:
+        """Array form of get_terminal_voltage.
+
+        Args:
+            current: Current [A] (positive = discharge)
+            soc: States of charge, broadcastable with current
+
+        Returns:
+            Terminal voltage [V]
+        """
+        V = self.params.V_oc - np.multiply(current, self.params.R_int)
+        return np.broadcast_to(V, np.broadcast(V, np.asarray(soc)).shape)
+
     def get_power_limits(self, soc: float = None) -> tuple[float, float]:
         """Get power limits with SOC-based derating.
 
@@ -235,6 +271,23 @@ class BatteryComponent(DrivetrainComponent):
 
         return (-P_charge, P_discharge)
 
+    def get_power_limits_array(self, soc: ArrayLike) -> Tuple[NDArray, NDArray]:
+        """Array form of get_power_limits.
+
+        Args:
+            soc: States of charge
+
+        Returns:
+            Tuple of (P_min, P_max) arrays [W]
+        """
+        soc = np.asarray(soc, dtype=float)
+        discharge_factor = np.clip((soc - self.params.SOC_min) / 0.1, 0.0, 1.0)
+        charge_factor = np.clip((self.params.SOC_max - soc) / 0.1, 0.0, 1.0)
+        return (
+            -self.params.P_max_charge * charge_factor,
+            self.params.P_max_discharge * discharge_factor,
+        )
+
     def clip_power(self, power: float, soc: float = None) -> float:
         """Clip power to valid range.
 
@@ -268,6 +321,19 @@ class BatteryComponent(DrivetrainComponent):
         Q = self.params.Q_capacity / self.params.V_nom  # Convert to Coulombs
         return -current / Q
 
+    def get_soc_derivative_array(self, power: ArrayLike, soc: ArrayLike) -> NDArray:
+        """Array form of get_soc_derivative.
+
+        Args:
+            power: Electrical power [W] (positive = discharge)
+            soc: States of charge, broadcastable with power
+
+        Returns:
+            SOC rate [1/s]
+        """
+        Q = self.params.Q_capacity / self.params.V_nom
+        return self.get_current_from_power_array(power, soc) * (-1.0 / Q)
+
     def compute_torques(
         self,
         port_speeds: Dict[str, float],
@@ -277,6 +343,46 @@ class BatteryComponent(DrivetrainComponent):
         """Battery doesn't produce torque."""
         return {}
 
+    def compute_torques_array(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[float],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Battery doesn't produce torque."""
+        return None
+
+    def compute_torques_batch(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[NDArray],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Battery doesn't produce torque."""
+        return None
+
+    def torque_source(
+        self,
+        speeds: List[str],
+        command: str,
+        torques: List[str],
+    ) -> Optional[List[str]]:
+        """Battery doesn't produce torque."""
+        return []
+
+    def compute_state_derivatives_array(
+        self,
+        internal_states: NDArray,
+        port_speeds: NDArray,
+        port_torques: NDArray,
+    ) -> NDArray:
+        """Array form of compute_state_derivatives: [dSOC/dt].
+
+        No "electrical_power" is carried by the port arrays, matching the dict
+        form when that value is absent.
+        """
+        return np.array([self.get_soc_derivative(0.0, internal_states[0])])
+
     def compute_state_derivatives(
         self,
         internal_states: Dict[str, float],
@@ -298,6 +404,33 @@ class BatteryComponent(DrivetrainComponent):
         d_soc = self.get_soc_derivative(power, soc)
         return {"SOC": d_soc}
 
+    def compute_state_derivatives_batch(
+        self,
+        internal_states: NDArray,
+        port_speeds: NDArray,
+        port_torques: NDArray,
+    ) -> NDArray:
+        """Vectorized compute_state_derivatives_array: [dSOC/dt] per scenario.
+
+        With no electrical power on the port arrays the current is zero, so
+        the SOC is constant.
+        """
+        return np.zeros_like(internal_states)
+
+    def state_derivative_source(
+        self,
+        states: List[str],
+        speeds: List[str],
+        torques: List[str],
+        derivatives: List[str],
+    ) -> Optional[List[str]]:
+        """Inline form of compute_state_derivatives_array.
+
+        With no electrical power on the port arrays the current is zero, so
+        the SOC is constant.
+        """
+        return [f"{derivatives[0]} = 0.0"]
+
     def can_provide_power(self, power: float, soc: float = None) -> bool:
         """Check if battery can provide requested power.
 
@@ -1,15 +1,22 @@
 """Engine component wrapper for the composable drivetrain simulator."""
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
+from ..core.codegen import interp_source
 from ..core.component import DrivetrainComponent
+from ..core.lookup import UniformTable
 from ..core.ports import Port, PortType, PortDirection
 from ..core.constraints import KinematicConstraint
 
 
+# Torque tapers linearly to zero over this range above rpm_max
+OVERSPEED_MARGIN_RPM = 200.0
+
+
 @dataclass
 class EngineParams:
     """Engine parameters.
@@ -98,12 +105,23 @@ class EngineComponent(DrivetrainComponent):
         self.params = params or EngineParams()
         self._build_torque_curve()
 
+    def _params_changed(self) -> None:
+        self._build_torque_curve()
+
     def _build_torque_curve(self) -> None:
         """Build interpolation arrays from torque curve data."""
         curve = self.params.torque_curve
         self._rpm_points = np.array([p[0] for p in curve])
         self._torque_points = np.array([p[1] for p in curve])
 
+        # Whole envelope from rpm_min through the end of the overspeed taper
+        rpm_min, rpm_max = self.params.rpm_min, self.params.rpm_max
+        breakpoints = [rpm for rpm in self._rpm_points if rpm_min < rpm < rpm_max]
+        self._torque_table = UniformTable.from_function(
+            self.get_max_torque,
+            [rpm_min, *breakpoints, rpm_max, rpm_max + OVERSPEED_MARGIN_RPM],
+        )
+
     @property
     def ports(self) -> Dict[str, Port]:
         return {
@@ -147,10 +165,21 @@ class EngineComponent(DrivetrainComponent):
         # Above max RPM: linearly taper torque to zero over 200 RPM
         # This provides a smooth transition to prevent ODE solver issues
         T_at_max = float(np.interp(self.params.rpm_max, self._rpm_points, self._torque_points))
-        overspeed_margin = 200.0  # RPM
-        taper_factor = max(0.0, 1.0 - (rpm - self.params.rpm_max) / overspeed_margin)
+        taper_factor = max(0.0, 1.0 - (rpm - self.params.rpm_max) / OVERSPEED_MARGIN_RPM)
         return T_at_max * taper_factor
 
+    def get_max_torque_array(self, rpm: ArrayLike) -> NDArray:
+        """Array form of get_max_torque.
+
+        Args:
+            rpm: Engine speeds [rpm], any shape
+
+        Returns:
+            Maximum torque [N·m], same shape as rpm
+        """
+        rpm = np.asarray(rpm, dtype=float)
+        return np.where(rpm < self.params.rpm_min, 0.0, self._torque_table(rpm))
+
     def get_max_torque_rads(self, omega: float) -> float:
         """Get maximum torque at given angular velocity.
 
@@ -176,18 +205,33 @@ class EngineComponent(DrivetrainComponent):
         T_max = self.get_max_torque(rpm)
         return float(np.clip(torque_cmd, 0.0, T_max))
 
-    def get_fuel_rate(self, torque: float, omega: float) -> float:
+    def clip_torque_array(self, rpm: ArrayLike, torque_cmd: ArrayLike) -> NDArray:
+        """Array form of clip_torque.
+
+        Args:
+            rpm: Engine speeds [rpm]
+            torque_cmd: Commanded torques [N·m], broadcastable with rpm
+
+        Returns:
+            Clipped torques [N·m]
+        """
+        return np.clip(torque_cmd, 0.0, self.get_max_torque_array(rpm))
+
+    def get_fuel_rate(
+        self, torque: Union[float, NDArray], omega: Union[float, NDArray]
+    ) -> Union[float, NDArray]:
         """Get fuel consumption rate.
 
         Args:
-            torque: Engine torque [N·m]
-            omega: Engine angular velocity [rad/s]
+            torque: Engine torque [N·m], scalar or array
+            omega: Engine angular velocity [rad/s], scalar or array
 
         Returns:
-            Fuel rate [kg/s]
+            Fuel rate [kg/s], float for scalar inputs
         """
-        power = torque * omega
-        return power * self.params.bsfc if power > 0 else 0.0
+        power = np.multiply(torque, omega)
+        fuel_rate = np.where(power > 0, power * self.params.bsfc, 0.0)
+        return float(fuel_rate) if fuel_rate.ndim == 0 else fuel_rate
 
     def compute_torques(
         self,
@@ -214,6 +258,49 @@ class EngineComponent(DrivetrainComponent):
 
         return {"shaft": T_actual}
 
+    def compute_torques_array(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[float],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Array form of compute_torques: [T_actual] on the shaft port."""
+        rpm = port_speeds[0] * 30.0 / np.pi
+        return np.array([self.clip_torque(rpm, torque_command or 0.0)])
+
+    def compute_torques_batch(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[NDArray],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Vectorized compute_torques_array over N scenarios."""
+        rpm = port_speeds[:, 0] * 30.0 / np.pi
+        T_cmd = 0.0 if torque_command is None else torque_command
+        return self.clip_torque_array(rpm, T_cmd)[:, None]
+
+    def torque_source(
+        self,
+        speeds: List[str],
+        command: str,
+        torques: List[str],
+    ) -> Optional[List[str]]:
+        """Inline form of compute_torques for the generated RHS."""
+        rpm_min = float(self.params.rpm_min)
+        rpm_max = float(self.params.rpm_max)
+        T_at_max = self.get_max_torque(rpm_max)
+        curve = interp_source("_rpm", self._rpm_points, self._torque_points, "_T_max")
+        return [
+            f"_rpm = {speeds[0]} * 30.0 / {np.pi!r}",
+            f"if _rpm < {rpm_min!r}:",
+            "    _T_max = 0.0",
+            f"elif _rpm <= {rpm_max!r}:",
+            *["    " + line for line in curve],
+            "else:",
+            f"    _T_max = {T_at_max!r} * max(0.0, 1.0 - (_rpm - {rpm_max!r}) / {OVERSPEED_MARGIN_RPM!r})",
+            f"{torques[0]} = min(max({command}, 0.0), _T_max)",
+        ]
+
     def compute_state_derivatives(
         self,
         internal_states: Dict[str, float],
@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 import numpy as np
+from numpy.typing import NDArray
 
 from ..core.component import DrivetrainComponent
 from ..core.ports import Port, PortType, PortDirection
@@ -19,7 +20,7 @@ class GearboxParams:
         efficiencies: Efficiency for each gear (same length as ratios)
         J_input: Input shaft inertia [kg·m²]
         J_output: Output shaft inertia [kg·m²]
-        shift_time: Time to complete a gear shift [s] (for future use)
+        shift_time: Minimum time between shifts of this gearbox [s]
     """
 
     ratios: List[float] = field(default_factory=lambda: [3.5, 2.0, 1.0])
@@ -75,6 +76,8 @@ class NSpeedGearboxComponent(DrivetrainComponent):
         gear: Gear selection (0 to n_gears-1)
     """
 
+    kinematic_params = ("ratios",)
+
     def __init__(self, params: GearboxParams = None, name: str = "gearbox"):
         """Initialize the gearbox component.
 
@@ -265,6 +268,33 @@ class NSpeedGearboxComponent(DrivetrainComponent):
         # Gearbox itself doesn't produce torque, it transforms it
         return {}
 
+    def compute_torques_array(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[float],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Gearbox doesn't generate torque."""
+        return None
+
+    def compute_torques_batch(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[NDArray],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Gearbox doesn't generate torque."""
+        return None
+
+    def torque_source(
+        self,
+        speeds: List[str],
+        command: str,
+        torques: List[str],
+    ) -> Optional[List[str]]:
+        """Gearbox doesn't generate torque."""
+        return []
+
     def compute_state_derivatives(
         self,
         internal_states: Dict[str, float],
@@ -1,9 +1,10 @@
 """Electric motor/generator component for the composable drivetrain simulator."""
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
 from ..core.component import DrivetrainComponent
 from ..core.ports import Port, PortType, PortDirection
@@ -103,6 +104,9 @@ class MotorComponent(DrivetrainComponent):
         """
         super().__init__(name)
         self.params = params or MotorParams()
+        self._params_changed()
+
+    def _params_changed(self) -> None:
         self._omega_base = self.params.rpm_base * np.pi / 30.0
         self._omega_max = self.params.rpm_max * np.pi / 30.0
 
@@ -165,6 +169,25 @@ class MotorComponent(DrivetrainComponent):
                 return min(P_max / omega, self.params.T_max)
             return self.params.T_max
 
+    def get_max_torque_array(self, rpm: ArrayLike, use_boost: bool = False) -> NDArray:
+        """Array form of get_max_torque.
+
+        Args:
+            rpm: Motor speeds [rpm], any shape (absolute value used)
+            use_boost: If True, use boost power in constant power region
+
+        Returns:
+            Maximum torque [N·m], same shape as rpm
+        """
+        p = self.params
+        rpm = np.abs(np.asarray(rpm, dtype=float))
+        P_max = p.P_boost if (use_boost and p.P_boost) else p.P_max
+
+        # Constant torque up to base speed, then constant power T = P / ω
+        omega = np.maximum(rpm * (np.pi / 30.0), 1e-12)
+        T_max = np.where(rpm <= p.rpm_base, p.T_max, np.minimum(P_max / omega, p.T_max))
+        return np.where(rpm > p.rpm_max, 0.0, T_max)
+
     def get_max_torque_rads(self, omega: float, use_boost: bool = False) -> float:
         """Get maximum torque at given angular velocity.
 
@@ -205,7 +228,25 @@ class MotorComponent(DrivetrainComponent):
         T_min, T_max = self.get_torque_limits(rpm, use_boost)
         return float(np.clip(torque_cmd, T_min, T_max))
 
-    def get_electrical_power(self, torque: float, omega: float) -> float:
+    def clip_torque_array(
+        self, rpm: ArrayLike, torque_cmd: ArrayLike, use_boost: bool = False
+    ) -> NDArray:
+        """Array form of clip_torque.
+
+        Args:
+            rpm: Motor speeds [rpm]
+            torque_cmd: Commanded torques [N·m], broadcastable with rpm
+            use_boost: If True, use boost limits
+
+        Returns:
+            Clipped torques [N·m]
+        """
+        T_max = self.get_max_torque_array(rpm, use_boost)
+        return np.clip(torque_cmd, -T_max, T_max)
+
+    def get_electrical_power(
+        self, torque: Union[float, NDArray], omega: Union[float, NDArray]
+    ) -> Union[float, NDArray]:
         """Calculate electrical power consumed/generated.
 
         Sign convention:
@@ -213,20 +254,18 @@ class MotorComponent(DrivetrainComponent):
         - Negative power: supplying to battery (generating)
 
         Args:
-            torque: Motor torque [N·m]
-            omega: Motor angular velocity [rad/s]
+            torque: Motor torque [N·m], scalar or array
+            omega: Motor angular velocity [rad/s], scalar or array
 
         Returns:
-            Electrical power [W]
+            Electrical power [W], float for scalar inputs
         """
-        P_mech = torque * omega
+        P_mech = np.multiply(torque, omega)
 
-        if P_mech > 0:
-            # Motoring: electrical power = mechanical / efficiency
-            return P_mech / self.params.eta
-        else:
-            # Generating: electrical power = mechanical * efficiency
-            return P_mech * self.params.eta
+        # Motoring: electrical power = mechanical / efficiency
+        # Generating: electrical power = mechanical * efficiency
+        P_elec = np.where(P_mech > 0, P_mech / self.params.eta, P_mech * self.params.eta)
+        return float(P_elec) if P_elec.ndim == 0 else P_elec
 
     def compute_torques(
         self,
@@ -254,6 +293,48 @@ class MotorComponent(DrivetrainComponent):
 
         return {"shaft": T_actual}
 
+    def compute_torques_array(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[float],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Array form of compute_torques: [T_actual] on the shaft port."""
+        rpm = abs(port_speeds[0]) * 30.0 / np.pi
+        return np.array([self.clip_torque(rpm, torque_command or 0.0)])
+
+    def compute_torques_batch(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[NDArray],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Vectorized compute_torques_array over N scenarios (no boost)."""
+        rpm = np.abs(port_speeds[:, 0]) * 30.0 / np.pi
+        T_cmd = 0.0 if torque_command is None else torque_command
+        return self.clip_torque_array(rpm, T_cmd)[:, None]
+
+    def torque_source(
+        self,
+        speeds: List[str],
+        command: str,
+        torques: List[str],
+    ) -> Optional[List[str]]:
+        """Inline form of compute_torques for the generated RHS."""
+        p = self.params
+        T_max = float(p.T_max)
+        return [
+            f"_rpm = abs({speeds[0]}) * 30.0 / {np.pi!r}",
+            f"if _rpm > {float(p.rpm_max)!r}:",
+            "    _T_max = 0.0",
+            f"elif _rpm <= {float(p.rpm_base)!r}:",
+            f"    _T_max = {T_max!r}",
+            "else:",
+            f"    _omega = _rpm * {np.pi!r} / 30.0",
+            f"    _T_max = min({float(p.P_max)!r} / _omega, {T_max!r}) if _omega > 0 else {T_max!r}",
+            f"{torques[0]} = min(max({command}, -_T_max), _T_max)",
+        ]
+
     def compute_state_derivatives(
         self,
         internal_states: Dict[str, float],
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
+from numpy.typing import NDArray
 
 from ..core.component import DrivetrainComponent
 from ..core.ports import Port, PortType, PortDirection
@@ -64,6 +65,8 @@ class PlanetaryGearComponent(DrivetrainComponent):
         ring: Ring gear shaft (typically output)
     """
 
+    kinematic_params = ("Z_sun", "Z_ring")
+
     def __init__(self, params: PlanetaryGearParams = None, name: str = "planetary"):
         """Initialize planetary gear component.
 
@@ -229,6 +232,33 @@ class PlanetaryGearComponent(DrivetrainComponent):
         """
         return {}
 
+    def compute_torques_array(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[float],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Planetary gear doesn't generate torque."""
+        return None
+
+    def compute_torques_batch(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[NDArray],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Planetary gear doesn't generate torque."""
+        return None
+
+    def torque_source(
+        self,
+        speeds: List[str],
+        command: str,
+        torques: List[str],
+    ) -> Optional[List[str]]:
+        """Planetary gear doesn't generate torque."""
+        return []
+
     def compute_state_derivatives(
         self,
         internal_states: Dict[str, float],
@@ -1,9 +1,11 @@
 """Vehicle component with road load model."""
 
+import math
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
 from ..core.component import DrivetrainComponent
 from ..core.ports import Port, PortType, PortDirection
@@ -79,6 +81,10 @@ class VehicleComponent(DrivetrainComponent):
         None (passive component)
     """
 
+    # Wheel radius converts wheel speed to vehicle speed for controllers
+    # and results, which use the drivetrain's own vehicle
+    kinematic_params = ("r_wheel",)
+
     def __init__(
         self,
         params: VehicleParams = None,
@@ -97,9 +103,13 @@ class VehicleComponent(DrivetrainComponent):
         self._payload_fraction = payload_fraction
         self._update_mass()
 
+    def _params_changed(self) -> None:
+        self._update_mass()
+
     def _update_mass(self) -> None:
         """Update vehicle mass based on payload fraction."""
         self._mass = self.params.m_empty + self._payload_fraction * self.params.m_payload
+        self._k_aero = 0.5 * self.params.rho_air * self.params.C_d * self.params.A_frontal
 
     @property
     def mass(self) -> float:
@@ -113,9 +123,14 @@ class VehicleComponent(DrivetrainComponent):
 
     @payload_fraction.setter
     def payload_fraction(self, value: float) -> None:
-        """Set payload fraction."""
+        """Set payload fraction.
+
+        Drivetrains using this vehicle recompile their inertia and generated
+        dynamics, which depend on the mass.
+        """
         self._payload_fraction = float(np.clip(value, 0.0, 1.0))
         self._update_mass()
+        self._notify_changed()
 
     @property
     def r_wheel(self) -> float:
@@ -143,6 +158,21 @@ class VehicleComponent(DrivetrainComponent):
             return self.params.J_wheels + self._mass * self.params.r_wheel**2
         raise ValueError(f"Unknown port: {port_name}")
 
+    def get_inertia_array(self, port_name: str, payload_fraction: ArrayLike) -> NDArray:
+        """Array form of get_inertia over payload fractions.
+
+        Args:
+            port_name: Port name
+            payload_fraction: Payload fractions [0-1]
+
+        Returns:
+            Effective inertia at the port per payload [kg·m²]
+        """
+        if port_name == "wheels":
+            mass = self.params.m_empty + np.clip(payload_fraction, 0.0, 1.0) * self.params.m_payload
+            return self.params.J_wheels + mass * self.params.r_wheel**2
+        raise ValueError(f"Unknown port: {port_name}")
+
     def get_constraints(self) -> List[KinematicConstraint]:
         return []
 
@@ -168,6 +198,25 @@ class VehicleComponent(DrivetrainComponent):
         """
         return omega_wheel * self.params.r_wheel
 
+    def grade_terms(self, grade: Union[float, ArrayLike]) -> Tuple[Union[float, NDArray], ...]:
+        """Sine and cosine of the road angle for a grade.
+
+        Uses sin(atan g) = g / sqrt(1 + g²) and cos(atan g) = 1 / sqrt(1 + g²),
+        so no trig calls are needed.
+
+        Args:
+            grade: Road grade [fraction], scalar or array
+
+        Returns:
+            Tuple of (sin θ, cos θ) with θ = atan(grade)
+        """
+        if isinstance(grade, (float, int)):
+            cos_theta = 1.0 / math.sqrt(1.0 + grade * grade)
+            return grade * cos_theta, cos_theta
+        grade = np.asarray(grade, dtype=float)
+        cos_theta = 1.0 / np.sqrt(1.0 + grade * grade)
+        return grade * cos_theta, cos_theta
+
     def calc_grade_force(self, grade: float) -> float:
         """Calculate grade resistance force.
 
@@ -177,8 +226,8 @@ class VehicleComponent(DrivetrainComponent):
         Returns:
             Grade force [N]
         """
-        theta = np.arctan(grade)
-        return self._mass * self.params.g * np.sin(theta)
+        sin_theta, _ = self.grade_terms(grade)
+        return self._mass * self.params.g * sin_theta
 
     def calc_rolling_resistance(self, grade: float = 0.0) -> float:
         """Calculate rolling resistance force.
@@ -189,8 +238,8 @@ class VehicleComponent(DrivetrainComponent):
         Returns:
             Rolling resistance [N]
         """
-        theta = np.arctan(grade)
-        return self._mass * self.params.g * self.params.C_r * np.cos(theta)
+        _, cos_theta = self.grade_terms(grade)
+        return self._mass * self.params.g * self.params.C_r * cos_theta
 
     def calc_aero_drag(self, velocity: float) -> float:
         """Calculate aerodynamic drag force.
@@ -219,10 +268,40 @@ class VehicleComponent(DrivetrainComponent):
         Returns:
             Total road load [N]
         """
-        F_grade = self.calc_grade_force(grade)
-        F_roll = self.calc_rolling_resistance(grade)
-        F_aero = self.calc_aero_drag(abs(velocity)) * np.sign(velocity)
-        return F_grade + F_roll + F_aero
+        sin_theta, cos_theta = self.grade_terms(grade)
+        mg = self._mass * self.params.g
+        if isinstance(velocity, (float, int)):
+            F_aero = math.copysign(self._k_aero * velocity ** 2, velocity)
+        else:
+            F_aero = self._k_aero * np.square(velocity) * np.sign(velocity)
+        return mg * sin_theta + mg * self.params.C_r * cos_theta + F_aero
+
+    def calc_road_load_array(
+        self,
+        velocity: ArrayLike,
+        grade: ArrayLike = 0.0,
+        payload_fraction: Optional[ArrayLike] = None,
+    ) -> NDArray:
+        """Array form of calc_total_road_load.
+
+        Args:
+            velocity: Vehicle velocities [m/s]
+            grade: Road grades [fraction], broadcastable with velocity
+            payload_fraction: Payload fractions [0-1], broadcastable with
+                velocity. If None, uses the current payload.
+
+        Returns:
+            Total road load [N]
+        """
+        velocity = np.asarray(velocity, dtype=float)
+        sin_theta, cos_theta = self.grade_terms(np.asarray(grade, dtype=float))
+        if payload_fraction is None:
+            mass = self._mass
+        else:
+            mass = self.params.m_empty + np.clip(payload_fraction, 0.0, 1.0) * self.params.m_payload
+        mg = mass * self.params.g
+        F_aero = self._k_aero * np.square(velocity) * np.sign(velocity)
+        return mg * sin_theta + mg * self.params.C_r * cos_theta + F_aero
 
     def calc_wheel_torque_demand(self, velocity: float, grade: float = 0.0) -> float:
         """Calculate wheel torque to maintain velocity.
@@ -237,10 +316,30 @@ class VehicleComponent(DrivetrainComponent):
         F_total = self.calc_total_road_load(velocity, grade)
         return F_total * self.params.r_wheel
 
+    def calc_wheel_torque_demand_array(
+        self,
+        velocity: ArrayLike,
+        grade: ArrayLike = 0.0,
+        payload_fraction: Optional[ArrayLike] = None,
+    ) -> NDArray:
+        """Array form of calc_wheel_torque_demand, e.g. for rimpull curves.
+
+        Args:
+            velocity: Vehicle velocities [m/s]
+            grade: Road grades [fraction], broadcastable with velocity
+            payload_fraction: Payload fractions [0-1], broadcastable with
+                velocity. If None, uses the current payload.
+
+        Returns:
+            Wheel torque demand [N·m]
+        """
+        return self.calc_road_load_array(velocity, grade, payload_fraction) * self.params.r_wheel
+
     def compute_load_torque(self, omega_wheel: float, grade: float = 0.0) -> float:
         """Calculate load torque at wheel.
 
-        This is used by the drivetrain dynamics to add road load.
+        This is used by the drivetrain dynamics to add road load. Accepts
+        arrays for batched evaluation.
 
         Args:
             omega_wheel: Wheel angular velocity [rad/s]
@@ -252,6 +351,46 @@ class VehicleComponent(DrivetrainComponent):
         velocity = self.wheel_speed_to_velocity(omega_wheel)
         return self.calc_wheel_torque_demand(velocity, grade)
 
+    def compute_load_torque_array(
+        self,
+        omega_wheel: ArrayLike,
+        grade: ArrayLike = 0.0,
+        payload_fraction: Optional[ArrayLike] = None,
+    ) -> NDArray:
+        """Array form of compute_load_torque over speed, grade and payload.
+
+        Args:
+            omega_wheel: Wheel angular velocities [rad/s]
+            grade: Road grades [fraction], broadcastable with omega_wheel
+            payload_fraction: Payload fractions [0-1], broadcastable with
+                omega_wheel. If None, uses the current payload.
+
+        Returns:
+            Load torque [N·m]
+        """
+        velocity = np.multiply(omega_wheel, self.params.r_wheel)
+        return self.calc_wheel_torque_demand_array(velocity, grade, payload_fraction)
+
+    def load_torque_source(self, omega: str, grade: str, load: str) -> List[str]:
+        """Inline form of compute_load_torque for the generated RHS.
+
+        Args:
+            omega: Variable holding the wheel angular velocity [rad/s]
+            grade: Variable holding the road grade [fraction]
+            load: Variable to assign the load torque to [N·m]
+
+        Returns:
+            Source lines
+        """
+        p = self.params
+        mg = self._mass * p.g
+        return [
+            f"_v = {omega} * {float(p.r_wheel)!r}",
+            f"_theta = math.atan({grade})",
+            f"{load} = ({mg!r} * math.sin(_theta) + {mg * p.C_r!r} * math.cos(_theta)"
+            f" + {0.5 * p.rho_air * p.C_d * p.A_frontal!r} * abs(_v) * _v) * {float(p.r_wheel)!r}",
+        ]
+
     def calc_power_demand(self, velocity: float, grade: float = 0.0) -> float:
         """Calculate power needed to maintain velocity.
 
@@ -302,6 +441,33 @@ class VehicleComponent(DrivetrainComponent):
         """
         return {}
 
+    def compute_torques_array(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[float],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Load torque is applied separately via compute_load_torque()."""
+        return None
+
+    def compute_torques_batch(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[NDArray],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Load torque is applied separately via compute_load_torque()."""
+        return None
+
+    def torque_source(
+        self,
+        speeds: List[str],
+        command: str,
+        torques: List[str],
+    ) -> Optional[List[str]]:
+        """Load torque is applied separately via load_torque_source()."""
+        return []
+
     def compute_state_derivatives(
         self,
         internal_states: Dict[str, float],
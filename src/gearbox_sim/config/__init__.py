@@ -6,6 +6,8 @@ from .gearbox_loader import (
     create_gearbox_params,
     create_shift_schedule,
     create_shift_controller,
+    shift_schedule_to_config,
+    save_shift_schedule,
     create_drivetrain_gearboxes,
     list_available_gearboxes,
     list_available_schedules,
@@ -21,6 +23,8 @@ __all__ = [
     "create_gearbox_params",
     "create_shift_schedule",
     "create_shift_controller",
+    "shift_schedule_to_config",
+    "save_shift_schedule",
     "create_drivetrain_gearboxes",
     "list_available_gearboxes",
     "list_available_schedules",
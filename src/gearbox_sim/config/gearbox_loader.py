@@ -22,6 +22,7 @@ from ..control.shift_controller import (
     SpeedUnit,
     LoadBasedHold,
 )
+from ..control.shift_map import ShiftMap
 
 
 def get_default_config_path() -> Path:
@@ -143,9 +144,68 @@ def create_shift_schedule(
         max_gear=schedule_config.get("max_gear"),
         shift_delay=schedule_config.get("shift_delay", 0.5),
         load_based_hold=load_based_hold,
+        shift_map=(
+            ShiftMap.from_config(schedule_config["shift_map"])
+            if "shift_map" in schedule_config
+            else None
+        ),
     )
 
 
+def shift_schedule_to_config(schedule: GearShiftSchedule) -> Dict[str, Any]:
+    """Convert a GearShiftSchedule to its shared config representation.
+
+    Args:
+        schedule: Shift schedule to convert
+
+    Returns:
+        Schedule config dict, as found under "shift_schedules"
+    """
+    hold = schedule.load_based_hold
+    schedule_config = {
+        "gearbox_id": schedule.gearbox_id,
+        "speed_source": schedule.speed_source.value,
+        "speed_unit": schedule.speed_unit.value,
+        "upshift_speeds": list(schedule.upshift_speeds),
+        "downshift_speeds": list(schedule.downshift_speeds),
+        "min_gear": schedule.min_gear,
+        "max_gear": schedule.max_gear,
+        "shift_delay": schedule.shift_delay,
+        "load_based_hold": {
+            "enabled": hold.enabled,
+            "load_threshold": hold.load_threshold,
+            "speed_threshold": hold.speed_threshold,
+        },
+    }
+    if schedule.shift_map is not None:
+        schedule_config["shift_map"] = schedule.shift_map.to_config()
+    return schedule_config
+
+
+def save_shift_schedule(
+    schedule_id: str,
+    schedule: GearShiftSchedule,
+    config_path: Path,
+) -> None:
+    """Add or replace a shift schedule in a config file.
+
+    The file is created if it does not exist. There is deliberately no default
+    path, so the shared config is only rewritten when named explicitly.
+
+    Args:
+        schedule_id: ID to store the schedule under
+        schedule: Shift schedule to save
+        config_path: Path to config file
+    """
+    config_path = Path(config_path)
+    config = load_config(config_path) if config_path.exists() else {}
+    config.setdefault("shift_schedules", {})[schedule_id] = shift_schedule_to_config(schedule)
+
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=2)
+        f.write("\n")
+
+
 def create_shift_controller(
     schedule_id: str,
     config: Optional[Dict[str, Any]] = None,
@@ -296,4 +356,5 @@ def get_schedule_info(
         "downshift_speeds": sched["downshift_speeds"],
         "shift_delay": sched.get("shift_delay", 0.5),
         "load_based_hold": sched.get("load_based_hold", {"enabled": False}),
+        "has_shift_map": "shift_map" in sched,
     }
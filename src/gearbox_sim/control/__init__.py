@@ -11,6 +11,7 @@ from .shift_controller import (
     SpeedUnit,
     LoadBasedHold,
 )
+from .shift_map import ShiftMap, generate_shift_map
 
 __all__ = [
     "DrivetrainController",
@@ -22,4 +23,6 @@ __all__ = [
     "SpeedSource",
     "SpeedUnit",
     "LoadBasedHold",
+    "ShiftMap",
+    "generate_shift_map",
 ]
@@ -13,8 +13,15 @@ class DrivetrainController(ABC):
     on the current state and desired behavior (speed target, power demand, etc.).
 
     Subclasses must implement the compute() method.
+
+    Attributes:
+        sample_period: Controller sample period [s]. If set, the simulator
+            calls compute() once per period and holds its outputs in
+            between; if None, compute() runs at every dynamics evaluation.
     """
 
+    sample_period: Optional[float] = None
+
     def __init__(self, drivetrain: Drivetrain):
         """Initialize the controller.
 
@@ -10,6 +10,11 @@ from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional, Tuple
 from enum import Enum
 
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .shift_map import ShiftMap
+
 
 class SpeedSource(Enum):
     """Source of speed for shift decisions."""
@@ -49,6 +54,12 @@ class GearShiftSchedule:
         max_gear: Maximum allowed gear index
         shift_delay: Minimum time between shifts [s]
         load_based_hold: Configuration for load-based gear hold
+        shift_map: Optional generated gear map (see generate_shift_map). When
+            set, the target gear is looked up in it by speed, grade and load
+            instead of from the thresholds.
+
+    Thresholds are converted to m/s once, at construction; call
+    rebuild_tables() after editing thresholds, units or limits in place.
     """
     gearbox_id: str
     n_gears: int
@@ -60,6 +71,7 @@ class GearShiftSchedule:
     max_gear: Optional[int] = None
     shift_delay: float = 0.5
     load_based_hold: LoadBasedHold = field(default_factory=LoadBasedHold)
+    shift_map: Optional[ShiftMap] = None
 
     def __post_init__(self):
         if self.max_gear is None:
@@ -78,6 +90,54 @@ class GearShiftSchedule:
                 f"got {len(self.downshift_speeds)}"
             )
 
+        self.rebuild_tables()
+
+    @classmethod
+    def from_shift_map(
+        cls, gearbox_id: str, n_gears: int, shift_map: ShiftMap, **kwargs: Any
+    ) -> "GearShiftSchedule":
+        """Create a map-driven schedule, with thresholds taken from the map.
+
+        The thresholds (see ShiftMap.threshold_speeds) are only a summary of
+        the map on level road at zero load, in m/s; lookups use the map
+        itself.
+
+        Args:
+            gearbox_id: Reference to gearbox this schedule controls
+            n_gears: Number of gears in the gearbox
+            shift_map: Generated gear map
+            **kwargs: Other GearShiftSchedule fields
+
+        Returns:
+            GearShiftSchedule using shift_map
+        """
+        upshift, downshift = shift_map.threshold_speeds(n_gears)
+        return cls(gearbox_id, n_gears, upshift, downshift, shift_map=shift_map, **kwargs)
+
+    def rebuild_tables(self) -> None:
+        """Convert shift thresholds to m/s, indexed by current gear.
+
+        The upshift threshold out of the top gear is +inf and the downshift
+        threshold out of gear 0 is -inf, so every gear can be looked up.
+        """
+        upshift_m_s = [self.convert_speed_to_m_s(s) for s in self.upshift_speeds]
+        downshift_m_s = [self.convert_speed_to_m_s(s) for s in self.downshift_speeds]
+        self._upshift_by_gear = np.array(upshift_m_s + [np.inf], dtype=float)
+        self._downshift_by_gear = np.array([-np.inf] + downshift_m_s, dtype=float)
+        self._upshift_list = self._upshift_by_gear.tolist()
+        self._downshift_list = self._downshift_by_gear.tolist()
+        self._load_hold_speed_m_s = self.convert_speed_to_m_s(self.load_based_hold.speed_threshold)
+
+    @property
+    def upshift_speeds_m_s(self) -> NDArray:
+        """Upshift threshold out of each gear [m/s] (+inf for the top gear)."""
+        return self._upshift_by_gear
+
+    @property
+    def downshift_speeds_m_s(self) -> NDArray:
+        """Downshift threshold out of each gear [m/s] (-inf for gear 0)."""
+        return self._downshift_by_gear
+
     def convert_speed_to_m_s(self, speed: float) -> float:
         """Convert speed from schedule units to m/s."""
         if self.speed_unit == SpeedUnit.M_S:
@@ -95,6 +155,7 @@ class GearShiftSchedule:
         current_gear: int,
         speed_m_s: float,
         load_fraction: float = 0.0,
+        grade: float = 0.0,
     ) -> int:
         """Determine target gear based on current speed and load.
 
@@ -102,46 +163,82 @@ class GearShiftSchedule:
             current_gear: Current gear index (0-based)
             speed_m_s: Current speed in m/s
             load_fraction: Current load/throttle fraction [0-1]
+            grade: Current road grade [fraction], used by a shift map
 
         Returns:
             Target gear index
         """
-        target = current_gear
+        if self.shift_map is not None:
+            target = self.shift_map.lookup(speed_m_s, grade, load_fraction)
+            return max(self.min_gear, min(target, self.max_gear))
 
-        # Convert thresholds to m/s for comparison
-        upshift_m_s = [self.convert_speed_to_m_s(s) for s in self.upshift_speeds]
-        downshift_m_s = [self.convert_speed_to_m_s(s) for s in self.downshift_speeds]
+        target = current_gear
+        in_range = 0 <= current_gear < self.n_gears
 
         # Check for upshift
-        if current_gear < self.max_gear:
-            threshold_idx = current_gear  # Index into threshold arrays
-            if threshold_idx < len(upshift_m_s):
-                upshift_threshold = upshift_m_s[threshold_idx]
-
-                # Check load-based hold
-                should_hold = False
-                if self.load_based_hold.enabled:
-                    load_speed_threshold = self.convert_speed_to_m_s(
-                        self.load_based_hold.speed_threshold
-                    )
-                    if (load_fraction >= self.load_based_hold.load_threshold and
-                        speed_m_s < load_speed_threshold):
-                        should_hold = True
-
-                if speed_m_s > upshift_threshold and not should_hold:
-                    target = current_gear + 1
+        if in_range and current_gear < self.max_gear:
+            # Check load-based hold
+            should_hold = (
+                self.load_based_hold.enabled
+                and load_fraction >= self.load_based_hold.load_threshold
+                and speed_m_s < self._load_hold_speed_m_s
+            )
+            if speed_m_s > self._upshift_list[current_gear] and not should_hold:
+                target = current_gear + 1
 
         # Check for downshift (takes priority over upshift)
-        if current_gear > self.min_gear:
-            threshold_idx = current_gear - 1  # Index into threshold arrays
-            if threshold_idx >= 0 and threshold_idx < len(downshift_m_s):
-                downshift_threshold = downshift_m_s[threshold_idx]
-                if speed_m_s < downshift_threshold:
-                    target = current_gear - 1
+        if in_range and current_gear > self.min_gear:
+            if speed_m_s < self._downshift_list[current_gear]:
+                target = current_gear - 1
 
         # Clamp to allowed range
         return max(self.min_gear, min(target, self.max_gear))
 
+    def get_target_gear_batch(
+        self,
+        current_gears: ArrayLike,
+        speeds_m_s: ArrayLike,
+        load_fractions: ArrayLike = 0.0,
+        grades: ArrayLike = 0.0,
+    ) -> NDArray:
+        """Vectorized get_target_gear over scenarios or logged samples.
+
+        Args:
+            current_gears: Current gear indices (0-based), shape (N,)
+            speeds_m_s: Speeds in m/s, broadcastable with current_gears
+            load_fractions: Load/throttle fractions [0-1], broadcastable
+            grades: Road grades [fraction], broadcastable; used by a shift map
+
+        Returns:
+            Target gear indices, integer array of the broadcast shape
+        """
+        gears, speeds, loads, grades = np.broadcast_arrays(
+            np.asarray(current_gears, dtype=int),
+            np.asarray(speeds_m_s, dtype=float),
+            np.asarray(load_fractions, dtype=float),
+            np.asarray(grades, dtype=float),
+        )
+        if self.shift_map is not None:
+            target = self.shift_map.lookup_batch(speeds, grades, loads)
+            return np.clip(target, self.min_gear, self.max_gear)
+
+        in_range = (gears >= 0) & (gears < self.n_gears)
+        index = np.where(in_range, gears, 0)
+
+        upshift = in_range & (gears < self.max_gear) & (speeds > self._upshift_by_gear[index])
+        if self.load_based_hold.enabled:
+            hold = (loads >= self.load_based_hold.load_threshold) & (
+                speeds < self._load_hold_speed_m_s
+            )
+            upshift &= ~hold
+        downshift = (
+            in_range & (gears > self.min_gear) & (speeds < self._downshift_by_gear[index])
+        )
+
+        # Downshift takes priority over upshift
+        target = np.where(downshift, gears - 1, np.where(upshift, gears + 1, gears))
+        return np.clip(target, self.min_gear, self.max_gear)
+
 
 class GearShiftController:
     """Controls automatic gear selection for a single gearbox.
@@ -192,6 +289,7 @@ class GearShiftController:
         time: float,
         speed_m_s: float,
         load_fraction: float = 0.0,
+        grade: float = 0.0,
     ) -> Tuple[int, bool]:
         """Update gear selection based on current conditions.
 
@@ -199,6 +297,7 @@ class GearShiftController:
             time: Current simulation time [s]
             speed_m_s: Current speed in m/s
             load_fraction: Current load/throttle fraction [0-1]
+            grade: Current road grade [fraction], used by a shift map
 
         Returns:
             Tuple of (current_gear, shift_occurred)
@@ -210,7 +309,7 @@ class GearShiftController:
 
         # Get target gear from schedule
         target_gear = self.schedule.get_target_gear(
-            self._current_gear, speed_m_s, load_fraction
+            self._current_gear, speed_m_s, load_fraction, grade
         )
 
         # Check if shift needed
@@ -221,6 +320,87 @@ class GearShiftController:
 
         return self._current_gear, False
 
+    def replay(
+        self,
+        time: ArrayLike,
+        speed_m_s: ArrayLike,
+        load_fraction: ArrayLike = 0.0,
+        grade: ArrayLike = 0.0,
+    ) -> Tuple[NDArray, NDArray]:
+        """Run update() over a recorded trace in one call.
+
+        Equivalent to calling update() once per sample, including the shift
+        delay and load-based hold, and leaves the controller in the same
+        final state. Rather than stepping sample by sample, it jumps from one
+        shift to the next: for each gear reached, the samples at which the
+        schedule requests a shift are found once with
+        GearShiftSchedule.get_target_gear_batch, and the next shift is the
+        first of those after the lockout expires.
+
+        Args:
+            time: Sample times [s], shape (N,), non-decreasing
+            speed_m_s: Speeds in m/s, shape (N,) or scalar
+            load_fraction: Load/throttle fractions [0-1], shape (N,) or scalar
+            grade: Road grades [fraction], shape (N,) or scalar
+
+        Returns:
+            Tuple of (gears, shifted): the gear after each sample, and
+            whether a shift occurred at that sample
+
+        Raises:
+            ValueError: If time is not a non-decreasing 1-D array
+        """
+        time = np.asarray(time, dtype=float)
+        if time.ndim != 1:
+            raise ValueError("time must be a 1-D array")
+        n = len(time)
+        if n > 1 and np.any(time[1:] < time[:-1]):
+            raise ValueError("time must be non-decreasing")
+        speeds = np.broadcast_to(np.asarray(speed_m_s, dtype=float), time.shape)
+        loads = np.broadcast_to(np.asarray(load_fraction, dtype=float), time.shape)
+        grades = np.broadcast_to(np.asarray(grade, dtype=float), time.shape)
+
+        schedule = self.schedule
+        delay = schedule.shift_delay
+        gears = np.empty(n, dtype=int)
+        shifted = np.zeros(n, dtype=bool)
+
+        # Per gear: target gears and the samples at which they differ
+        requests: Dict[int, Tuple[NDArray, NDArray]] = {}
+
+        gear = self._current_gear
+        last_shift = self._last_shift_time
+        i = 0
+        while i < n:
+            # First sample at or after i with the shift lockout expired,
+            # using update()'s own comparison
+            start = max(i, int(np.searchsorted(time, last_shift + delay)))
+            while start > i and time[start - 1] - last_shift >= delay:
+                start -= 1
+            while start < n and time[start] - last_shift < delay:
+                start += 1
+
+            if gear not in requests:
+                targets = schedule.get_target_gear_batch(gear, speeds, loads, grades)
+                requests[gear] = (np.flatnonzero(targets != gear), targets)
+            candidates, targets = requests[gear]
+
+            k = np.searchsorted(candidates, start)
+            if k == len(candidates):
+                gears[i:] = gear
+                break
+            j = int(candidates[k])
+            gears[i:j] = gear
+            gear = int(targets[j])
+            last_shift = float(time[j])
+            gears[j] = gear
+            shifted[j] = True
+            i = j + 1
+
+        self._current_gear = gear
+        self._last_shift_time = last_shift
+        return gears, shifted
+
     def force_gear(self, gear: int, time: float) -> None:
         """Force a specific gear (manual override).
 
@@ -290,6 +470,7 @@ class MultiGearboxController:
         time: float,
         speed_m_s: float,
         load_fraction: float = 0.0,
+        grade: float = 0.0,
     ) -> Dict[str, Tuple[int, bool]]:
         """Update all gearbox controllers.
 
@@ -297,15 +478,40 @@ class MultiGearboxController:
             time: Current simulation time [s]
             speed_m_s: Current vehicle speed in m/s
             load_fraction: Current load/throttle fraction [0-1]
+            grade: Current road grade [fraction]
 
         Returns:
             Dict mapping gearbox_id to (gear, shift_occurred) tuples
         """
         results = {}
         for gearbox_id, ctrl in self.controllers.items():
-            results[gearbox_id] = ctrl.update(time, speed_m_s, load_fraction)
+            results[gearbox_id] = ctrl.update(time, speed_m_s, load_fraction, grade)
         return results
 
+    def replay_all(
+        self,
+        time: ArrayLike,
+        speed_m_s: ArrayLike,
+        load_fraction: ArrayLike = 0.0,
+        grade: ArrayLike = 0.0,
+    ) -> Dict[str, Tuple[NDArray, NDArray]]:
+        """Replay a recorded trace through all gearbox controllers.
+
+        Args:
+            time: Sample times [s], shape (N,), non-decreasing
+            speed_m_s: Vehicle speeds in m/s, shape (N,) or scalar
+            load_fraction: Load/throttle fractions [0-1], shape (N,) or scalar
+            grade: Road grades [fraction], shape (N,) or scalar
+
+        Returns:
+            Dict mapping gearbox_id to (gears, shifted) arrays, see
+            GearShiftController.replay
+        """
+        return {
+            gearbox_id: ctrl.replay(time, speed_m_s, load_fraction, grade)
+            for gearbox_id, ctrl in self.controllers.items()
+        }
+
     def wheel_speed_to_vehicle_speed(self, omega_wheel: float) -> float:
         """Convert wheel angular velocity to vehicle speed.
 
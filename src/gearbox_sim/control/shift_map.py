@@ -0,0 +1,308 @@
+"""Gear shift maps generated offline from the drivetrain model.
+
+A ShiftMap stores the preferred gear on a uniform (speed, grade, load) grid,
+so a runtime lookup is three index computations. generate_shift_map builds
+one by sweeping the grid through ``Drivetrain.dynamics_batch``: for each gear
+it finds the engine torque that delivers the demanded acceleration, checks it
+against the engine's speed range and torque curve, and keeps the feasible
+gear with the lowest fuel rate.
+
+Load fraction is the driver demand between holding speed (0) and the
+strongest acceleration any gear can deliver at that speed and grade (1).
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from ..core.drivetrain import Drivetrain
+
+
+# Fuel rates within this relative margin of the best count as equal, and the
+# highest such gear is chosen (lower engine speed for the same fuel)
+FUEL_TIE_TOLERANCE = 1e-6
+
+
+def _uniform_axis(values: ArrayLike, name: str) -> NDArray:
+    """Validate a grid axis: increasing and uniformly spaced (or one point)."""
+    axis = np.atleast_1d(np.asarray(values, dtype=float))
+    if axis.ndim != 1 or len(axis) == 0:
+        raise ValueError(f"{name} must be a non-empty 1-D sequence")
+    if len(axis) > 1:
+        steps = np.diff(axis)
+        if steps[0] <= 0 or not np.allclose(steps, steps[0], rtol=1e-9, atol=0.0):
+            raise ValueError(f"{name} must be increasing and uniformly spaced")
+    return axis
+
+
+class ShiftMap:
+    """Preferred gear on a uniform (speed, grade, load) grid.
+
+    Lookups round to the nearest grid point and hold the edge values
+    outside the grid. An axis with a single point ignores that input, so a
+    map over (speed, load) only is a map with one grade.
+    """
+
+    def __init__(
+        self,
+        speeds: ArrayLike,
+        grades: ArrayLike,
+        loads: ArrayLike,
+        gears: ArrayLike,
+    ):
+        """Initialize the map.
+
+        Args:
+            speeds: Vehicle speed grid [m/s], uniformly spaced
+            grades: Road grade grid [fraction], uniformly spaced
+            loads: Load fraction grid [0-1], uniformly spaced
+            gears: Gear index (0-based) per grid point, shape
+                (len(speeds), len(grades), len(loads))
+
+        Raises:
+            ValueError: If an axis is not uniform or gears has the wrong shape
+        """
+        self.speeds = _uniform_axis(speeds, "speeds")
+        self.grades = _uniform_axis(grades, "grades")
+        self.loads = _uniform_axis(loads, "loads")
+        self.gears = np.asarray(gears, dtype=int)
+        shape = (len(self.speeds), len(self.grades), len(self.loads))
+        if self.gears.shape != shape:
+            raise ValueError(f"gears must have shape {shape}, got {self.gears.shape}")
+
+        # Origin, inverse step and last index per axis for direct indexing
+        self._axes = [
+            (float(axis[0]), 1.0 / (axis[1] - axis[0]) if len(axis) > 1 else 0.0, len(axis) - 1)
+            for axis in (self.speeds, self.grades, self.loads)
+        ]
+        self._gear_list = self.gears.tolist()
+
+    @staticmethod
+    def _index(x: float, axis: tuple) -> int:
+        x0, inv_dx, last = axis
+        i = int((x - x0) * inv_dx + 0.5) if x > x0 else 0
+        return i if i < last else last
+
+    def lookup(self, speed_m_s: float, grade: float = 0.0, load_fraction: float = 0.0) -> int:
+        """Gear for one operating point.
+
+        Args:
+            speed_m_s: Vehicle speed [m/s]
+            grade: Road grade [fraction]
+            load_fraction: Load/throttle fraction [0-1]
+
+        Returns:
+            Gear index (0-based)
+        """
+        i = self._index(speed_m_s, self._axes[0])
+        j = self._index(grade, self._axes[1])
+        k = self._index(load_fraction, self._axes[2])
+        return self._gear_list[i][j][k]
+
+    def lookup_batch(
+        self, speeds_m_s: ArrayLike, grades: ArrayLike = 0.0, load_fractions: ArrayLike = 0.0
+    ) -> NDArray:
+        """Gears for many operating points.
+
+        Args:
+            speeds_m_s: Vehicle speeds [m/s]
+            grades: Road grades [fraction], broadcastable with speeds_m_s
+            load_fractions: Load/throttle fractions [0-1], broadcastable
+
+        Returns:
+            Gear indices of the broadcast shape
+        """
+        indices = []
+        for values, (x0, inv_dx, last) in zip((speeds_m_s, grades, load_fractions), self._axes):
+            index = np.floor((np.asarray(values, dtype=float) - x0) * inv_dx + 0.5)
+            indices.append(np.clip(index, 0, last).astype(int))
+        return self.gears[tuple(np.broadcast_arrays(*indices))]
+
+    def threshold_speeds(
+        self, n_gears: int, grade: float = 0.0, load_fraction: float = 0.0
+    ) -> Tuple[List[float], List[float]]:
+        """Summarize the map as per-gear speed thresholds.
+
+        Along the speed axis at the given grade and load, the upshift speed
+        out of gear i is the first grid speed mapped to a higher gear, and
+        the downshift speed one grid step below it.
+
+        Args:
+            n_gears: Number of gears in the gearbox
+            grade: Road grade [fraction] of the slice to summarize
+            load_fraction: Load fraction [0-1] of the slice to summarize
+
+        Returns:
+            Tuple of (upshift_speeds, downshift_speeds) [m/s], n_gears-1 each
+        """
+        j = self._index(grade, self._axes[1])
+        k = self._index(load_fraction, self._axes[2])
+        line = self.gears[:, j, k]
+        step = float(self.speeds[1] - self.speeds[0]) if len(self.speeds) > 1 else 0.0
+        upshift, downshift = [], []
+        for gear in range(n_gears - 1):
+            above = np.flatnonzero(line > gear)
+            speed = float(self.speeds[above[0]]) if len(above) else float(self.speeds[-1]) + step
+            upshift.append(speed)
+            downshift.append(speed - step)
+        return upshift, downshift
+
+    def to_config(self) -> Dict[str, Any]:
+        """Shared-config (JSON) form of the map."""
+        return {
+            "speeds": _axis_config(self.speeds),
+            "grades": _axis_config(self.grades),
+            "loads": _axis_config(self.loads),
+            "gears": self.gears.tolist(),
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ShiftMap":
+        """Build a map from its shared-config form (see to_config)."""
+        return cls(
+            _axis_from_config(config["speeds"]),
+            _axis_from_config(config["grades"]),
+            _axis_from_config(config["loads"]),
+            config["gears"],
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ShiftMap(speeds={len(self.speeds)}, grades={len(self.grades)}, "
+            f"loads={len(self.loads)}, gears={sorted(set(self.gears.ravel().tolist()))})"
+        )
+
+
+def _axis_config(axis: NDArray) -> Dict[str, float]:
+    """Uniform axis as {start, step, count}."""
+    step = float(axis[1] - axis[0]) if len(axis) > 1 else 0.0
+    return {"start": float(axis[0]), "step": step, "count": len(axis)}
+
+
+def _axis_from_config(config: Dict[str, float]) -> NDArray:
+    """Inverse of _axis_config."""
+    return config["start"] + config["step"] * np.arange(int(config["count"]))
+
+
+def generate_shift_map(
+    drivetrain: Drivetrain,
+    speeds: ArrayLike,
+    grades: ArrayLike = (0.0,),
+    loads: ArrayLike = (0.0,),
+    gearbox: str = "gearbox",
+    engine: str = "engine",
+    fuel_rate: Optional[Callable[[NDArray, NDArray], NDArray]] = None,
+) -> ShiftMap:
+    """Sweep the drivetrain model for the fuel-optimal gear at each grid point.
+
+    For each gear the drivetrain is evaluated twice per (speed, grade) with
+    ``dynamics_batch``: engine torque zero and at the torque curve. The
+    vehicle acceleration is linear in engine torque in between, which gives
+    the torque needed for the demanded acceleration. A gear is feasible if
+    the engine speed is within [rpm_min, rpm_max] and that torque is within
+    the curve. Among feasible gears the lowest fuel rate wins. Where no
+    gear is feasible, the gear with the most acceleration is used, or, if
+    the engine is out of its speed range in every gear, the gear closest to
+    that range.
+
+    Args:
+        drivetrain: Compiled drivetrain with one mechanical degree of freedom
+            (engine geared rigidly to the wheels)
+        speeds: Vehicle speed grid [m/s], uniformly spaced
+        grades: Road grade grid [fraction], uniformly spaced
+        loads: Load fraction grid [0-1], uniformly spaced
+        gearbox: Name of the gearbox to map; other gearboxes keep their gear
+        engine: Name of the engine component
+        fuel_rate: Fuel rate function (torque, omega) -> kg/s over arrays;
+            defaults to the engine's get_fuel_rate
+
+    Returns:
+        ShiftMap over (speeds, grades, loads)
+
+    Raises:
+        ValueError: If the drivetrain has more than one mechanical degree of
+            freedom, or the gearbox or engine is unknown
+    """
+    speeds = _uniform_axis(speeds, "speeds")
+    grades = _uniform_axis(grades, "grades")
+    loads = _uniform_axis(loads, "loads")
+
+    if drivetrain.n_mechanical_dofs != 1:
+        raise ValueError(
+            "Shift maps need a drivetrain with one mechanical degree of freedom, "
+            f"got {drivetrain.n_mechanical_dofs}"
+        )
+    gear_names = list(drivetrain.gears)
+    if gearbox not in gear_names:
+        raise ValueError(f"Unknown gearbox '{gearbox}', expected one of {gear_names}")
+    engine_component = drivetrain.get_component(engine)
+    torque_control = f"T_{engine}"
+    if torque_control not in drivetrain.control_names:
+        raise ValueError(f"Engine '{engine}' has no torque control '{torque_control}'")
+    fuel_rate = fuel_rate or engine_component.get_fuel_rate
+    params = engine_component.params
+
+    n_gears = drivetrain.get_component(gearbox).n_gears
+    n_speed, n_grade = len(speeds), len(grades)
+
+    # One row per (speed, grade), speed-major
+    V = np.repeat(speeds, n_grade)
+    G = np.tile(grades, n_speed)
+    n_rows = len(V)
+    torque_column = drivetrain.control_names.index(torque_control)
+    gear_column = drivetrain.control_names.index(f"gear_{gearbox}")
+    unit = np.ones((drivetrain.n_states, 1))
+
+    omega_e = np.empty((n_gears, n_rows))
+    T_max = np.empty((n_gears, n_rows))
+    accel_0 = np.empty((n_gears, n_rows))  # Vehicle acceleration, zero engine torque
+    accel_max = np.empty((n_gears, n_rows))  # ... and at the torque curve
+    for gear in range(n_gears):
+        combo = np.array([[drivetrain.gears[name] for name in gear_names]])
+        combo[0, gear_names.index(gearbox)] = gear
+
+        # Vehicle speed and engine speed per unit of the single DOF
+        v_per_dof = float(drivetrain.get_velocity_array(unit, combo)[0])
+        engine_per_dof = float(drivetrain.get_all_speeds_array(unit, combo)[f"{engine}.shaft"][0])
+
+        X = np.zeros((n_rows, drivetrain.n_states))
+        X[:, 0] = V / v_per_dof
+        omega_e[gear] = X[:, 0] * engine_per_dof
+        T_max[gear] = engine_component.get_max_torque_array(omega_e[gear] * 30.0 / np.pi)
+
+        U = np.zeros((n_rows, len(drivetrain.control_names)))
+        U[:, gear_column] = gear
+        gears = np.repeat(combo, n_rows, axis=0)
+        accel_0[gear] = drivetrain.dynamics_batch(0.0, X, U, G, gears)[:, 0] * v_per_dof
+        U[:, torque_column] = T_max[gear]
+        accel_max[gear] = drivetrain.dynamics_batch(0.0, X, U, G, gears)[:, 0] * v_per_dof
+
+    rpm_e = omega_e * 30.0 / np.pi
+    in_speed_range = (rpm_e >= params.rpm_min) & (rpm_e <= params.rpm_max)
+    has_torque = in_speed_range & (accel_max > accel_0)
+    gear_index = np.arange(n_gears)[:, None]
+
+    # Fallbacks: most acceleration, else nearest to the engine speed range
+    best_accel = np.where(has_torque, accel_max, -np.inf)
+    strongest = np.argmax(best_accel, axis=0)
+    rpm_excess = np.maximum(params.rpm_min - rpm_e, rpm_e - params.rpm_max)
+    closest = np.argmin(rpm_excess, axis=0)
+    fallback = np.where(has_torque.any(axis=0), strongest, closest)
+
+    # Demand scale: the strongest acceleration available at each point
+    accel_cap = np.maximum(best_accel.max(axis=0), 0.0)
+    slope = np.where(has_torque, T_max / np.where(has_torque, accel_max - accel_0, 1.0), 0.0)
+
+    result = np.empty((n_rows, len(loads)), dtype=int)
+    for k, load in enumerate(loads):
+        accel_demand = load * accel_cap
+        torque = np.maximum((accel_demand - accel_0) * slope, 0.0)
+        feasible = has_torque & (torque <= T_max * (1.0 + 1e-12))
+        fuel = np.where(feasible, fuel_rate(torque, omega_e), np.inf)
+        best = fuel.min(axis=0)
+        tied = feasible & (fuel <= best + FUEL_TIE_TOLERANCE * np.abs(best))
+        highest_tied = np.max(np.where(tied, gear_index, -1), axis=0)
+        result[:, k] = np.where(feasible.any(axis=0), highest_tied, fallback)
+
+    return ShiftMap(speeds, grades, loads, result.reshape(n_speed, n_grade, len(loads)))
@@ -22,7 +22,8 @@ class SpeedController(DrivetrainController):
     """Generic proportional-integral speed controller.
 
     Works with any drivetrain by discovering actuators (engines, motors)
-    and distributing torque demand among them.
+    and distributing torque demand among them. Runs in discrete time: the
+    integral term advances by one sample_period per call.
     """
 
     def __init__(
@@ -31,6 +32,8 @@ class SpeedController(DrivetrainController):
         Kp: float = 50000.0,
         Ki: float = 5000.0,
         allocation: Optional[TorqueAllocation] = None,
+        sample_period: float = 0.1,
+        shift_hysteresis: float = 0.5,
     ):
         """Initialize the speed controller.
 
@@ -39,12 +42,20 @@ class SpeedController(DrivetrainController):
             Kp: Proportional gain [N·m/(m/s)]
             Ki: Integral gain [N·m/(m·s)]
             allocation: Torque allocation strategy (auto-detected if None)
+            sample_period: Time between calls to compute() [s]
+            shift_hysteresis: How far past a gear's speed band, as a fraction
+                of the band width, the velocity must go before shifting. Also
+                the margin above rpm_min, as a fraction of it, that engines
+                need after an upshift.
         """
         super().__init__(drivetrain)
+        if sample_period <= 0:
+            raise ValueError("sample_period must be positive")
         self.Kp = Kp
         self.Ki = Ki
+        self.sample_period = sample_period
+        self.shift_hysteresis = shift_hysteresis
         self._integral = 0.0
-        self._last_time = 0.0
 
         # Discover actuators if not specified
         if allocation is None:
@@ -55,6 +66,7 @@ class SpeedController(DrivetrainController):
         # Find gearbox for gear control
         self._gearbox_name = self._find_gearbox()
         self._current_gear = 0
+        self._speed_band = 0  # Speed-band gear before grade adjustments
 
     def _discover_actuators(self) -> None:
         """Discover engines and motors in the drivetrain."""
@@ -114,7 +126,7 @@ class SpeedController(DrivetrainController):
 
         # Update integral (with anti-windup)
         if abs(self._integral) < 100.0:
-            self._integral += v_error * 0.1  # Assuming ~0.1s between calls
+            self._integral += v_error * self.sample_period
 
         # Allocate torque among actuators
         controls = self._allocate_torque(state, T_demand)
@@ -122,6 +134,7 @@ class SpeedController(DrivetrainController):
         # Add gear control if gearbox exists
         if self._gearbox_name:
             gear = self._select_gear(velocity, grade)
+            gear = self._protect_engine_speed(state, gear)
             controls[f"gear_{self._gearbox_name}"] = gear
             self._current_gear = gear
 
@@ -149,24 +162,28 @@ class SpeedController(DrivetrainController):
             # Clip to actuator limits
             component = self.drivetrain.get_component(actuator)
             if hasattr(component, "clip_torque"):
-                # Get actuator speed
-                speed_key = f"{actuator}.shaft"
-                omega = 0.0
-                for key, value in state.items():
-                    if actuator in key:
-                        omega = abs(value)
-                        break
-
-                rpm = omega * 30.0 / np.pi
+                rpm = self._actuator_speed(state, actuator) * 30.0 / np.pi
                 T_alloc = component.clip_torque(rpm, T_alloc)
 
             controls[f"T_{actuator}"] = T_alloc
 
         return controls
 
+    @staticmethod
+    def _actuator_speed(state: Dict[str, float], actuator: str) -> float:
+        """Absolute speed of an actuator's shaft from the state [rad/s]."""
+        for key, value in state.items():
+            if actuator in key:
+                return abs(value)
+        return 0.0
+
     def _select_gear(self, velocity: float, grade: float) -> int:
         """Simple gear selection based on velocity.
 
+        The current speed band is kept until the velocity leaves it by
+        shift_hysteresis band widths, so speeds near a band edge don't
+        make the gear chatter.
+
         Args:
             velocity: Current velocity [m/s]
             grade: Road grade
@@ -185,8 +202,12 @@ class SpeedController(DrivetrainController):
         v_max = 15.0  # Assumed max speed
         gear_width = v_max / n_gears
 
-        gear = int(velocity / gear_width)
-        gear = max(0, min(gear, n_gears - 1))
+        band = self._speed_band
+        margin = self.shift_hysteresis * gear_width
+        if velocity >= (band + 1) * gear_width + margin or velocity < band * gear_width - margin:
+            band = max(0, min(int(velocity / gear_width), n_gears - 1))
+        self._speed_band = band
+        gear = band
 
         # Stay in lower gear on steep grades
         if grade > 0.05:
@@ -196,7 +217,42 @@ class SpeedController(DrivetrainController):
 
         return gear
 
+    def _protect_engine_speed(self, state: Dict[str, float], gear: int) -> int:
+        """Keep engines above their minimum operating speed across shifts.
+
+        Only applies when the engines turn at a fixed multiple of the wheel
+        speed (a single mechanical DOF), so their speed scales with the gear
+        ratio. An upshift is held unless engines stay shift_hysteresis above
+        their rpm_min afterwards, and an engine already below rpm_min gets a
+        downshift.
+
+        Args:
+            state: Current state
+            gear: Gear chosen from the speed bands
+
+        Returns:
+            Gear index
+        """
+        if self.drivetrain.n_mechanical_dofs != 1:
+            return gear
+
+        gearbox = self.drivetrain.get_component(self._gearbox_name)
+        engaged = gearbox.gear
+        for actuator, is_engine in zip(self.allocation.actuators, self.allocation.is_engine):
+            params = getattr(self.drivetrain.get_component(actuator), "params", None)
+            rpm_min = getattr(params, "rpm_min", None)
+            if not is_engine or rpm_min is None:
+                continue
+            rpm = self._actuator_speed(state, actuator) * 30.0 / np.pi
+            rpm_after = rpm * gearbox.get_ratio(gear) / gearbox.get_ratio(engaged)
+            if gear > engaged and rpm_after < rpm_min * (1.0 + self.shift_hysteresis):
+                gear = engaged
+            if rpm < rpm_min and engaged > 0:
+                gear = min(gear, engaged - 1)
+        return gear
+
     def reset(self) -> None:
         """Reset controller state."""
         self._integral = 0.0
         self._current_gear = 0
+        self._speed_band = 0
@@ -7,6 +7,7 @@ from .constraints import (
     WillisConstraint,
     RigidConnectionConstraint,
 )
+from .params import FrozenParams, ParamBlock, freeze, stack_params
 from .component import DrivetrainComponent
 from .topology import DrivetrainTopology
 from .drivetrain import Drivetrain
@@ -19,6 +20,10 @@ __all__ = [
     "GearRatioConstraint",
     "WillisConstraint",
     "RigidConnectionConstraint",
+    "FrozenParams",
+    "ParamBlock",
+    "freeze",
+    "stack_params",
     "DrivetrainComponent",
     "DrivetrainTopology",
     "Drivetrain",
@@ -0,0 +1,343 @@
+"""Generated, topology-specialized dynamics functions.
+
+Once a topology is compiled, the structure of its dynamics is fixed: which
+ports move together, how torques map onto the independent DOFs, and which
+components apply torque. This module emits a Python function implementing
+``Drivetrain.dynamics_array`` for one topology and gear combination, with the
+projection and inverse inertia unrolled into scalar arithmetic and component
+torque laws inlined from their ``torque_source`` hooks.
+
+Generated code objects are cached in memory, keyed by a hash of the
+specialized source. Setting ``GEARBOX_SIM_CACHE_DIR`` also caches them on
+disk, so a topology is only compiled once per machine.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import math
+import os
+import sys
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .drivetrain import Drivetrain
+
+# Bump when the emitted code changes shape, to invalidate disk caches
+CODEGEN_VERSION = 2
+
+RHSFunction = Callable[[float, NDArray, NDArray, float], NDArray]
+
+_code_cache: Dict[str, object] = {}
+
+
+def interp_source(var: str, xp: Sequence[float], fp: Sequence[float], out: str) -> List[str]:
+    """Emit source for ``out = np.interp(var, xp, fp)`` as an if/elif chain.
+
+    Args:
+        var: Name of the variable to interpolate at
+        xp: Increasing breakpoints
+        fp: Values at the breakpoints
+        out: Name of the variable to assign
+
+    Returns:
+        Source lines, evaluated with the same arithmetic as np.interp
+    """
+    xp = [float(v) for v in xp]
+    fp = [float(v) for v in fp]
+    lines = [f"if {var} <= {xp[0]!r}:", f"    {out} = {fp[0]!r}"]
+    for j in range(len(xp) - 1):
+        slope = (fp[j + 1] - fp[j]) / (xp[j + 1] - xp[j])
+        lines += [
+            f"elif {var} < {xp[j + 1]!r}:",
+            f"    {out} = {slope!r} * ({var} - {xp[j]!r}) + {fp[j]!r}",
+        ]
+    lines += ["else:", f"    {out} = {fp[-1]!r}"]
+    return lines
+
+
+def get_cache_dir() -> Optional[Path]:
+    """Directory for cached generated code, or None if disk caching is off.
+
+    The disk cache is opt-in: set ``GEARBOX_SIM_CACHE_DIR`` to a directory
+    to enable it.
+    """
+    path = os.environ.get("GEARBOX_SIM_CACHE_DIR")
+    return Path(path) if path else None
+
+
+def _linear_combination(terms: Sequence[Tuple[float, str]]) -> str:
+    """Format sum(coeff * name) with unit coefficients folded."""
+    parts = []
+    for coeff, name in terms:
+        if coeff == 1.0:
+            parts.append(name)
+        elif coeff == -1.0:
+            parts.append(f"-{name}")
+        else:
+            parts.append(f"{coeff!r} * {name}")
+    if not parts:
+        return "0.0"
+    return " + ".join(parts).replace("+ -", "- ")
+
+
+def _tuple(names: Sequence[str]) -> str:
+    """Format names as a tuple body: "a, b" or "a," for a single name."""
+    return ", ".join(names) + ("," if len(names) == 1 else "")
+
+
+def _indent(lines: List[str], level: int = 1) -> List[str]:
+    return ["    " * level + line for line in lines]
+
+
+def generate_rhs_source(drivetrain: "Drivetrain") -> Tuple[str, Dict[str, object]]:
+    """Generate the specialized dynamics source for the current gears.
+
+    Args:
+        drivetrain: Compiled drivetrain
+
+    Returns:
+        Tuple of (source, namespace) where namespace holds the objects the
+        source refers to by name (fallback components)
+    """
+    P = drivetrain._projection
+    J_inv = drivetrain._inertia_inverse
+    n = drivetrain.n_mechanical_dofs
+    n_states = drivetrain.n_states
+    n_controls = len(drivetrain.control_names)
+    namespace: Dict[str, object] = {}
+
+    def port_speed(row: int) -> str:
+        return _linear_combination(
+            [(float(P[row, i]), f"x{i}") for i in range(n) if P[row, i] != 0.0]
+        )
+
+    # Ports whose speeds the body needs
+    needed_rows = set()
+    body: List[str] = []
+    torque_rows: List[int] = []
+
+    for k, slots in enumerate(drivetrain._component_slots):
+        rows = list(range(slots.ports.start, slots.ports.stop))
+        states = [f"x{i}" for i in range(slots.states.start, slots.states.stop)]
+        command = f"u{slots.control}" if slots.control >= 0 else "0.0"
+        lines = slots.component.torque_source(
+            [f"p{r}" for r in rows], command, [f"q{r}" for r in rows]
+        )
+        if lines == [] or not rows:
+            continue  # No torque to apply
+
+        needed_rows.update(rows)
+        torque_rows.extend(rows)
+        body.append(f"# {slots.name} ({type(slots.component).__name__})")
+        if lines is None:
+            name = f"component{k}"
+            namespace[name] = slots.component
+            body += [
+                f"_q = {name}.compute_torques_array(",
+                f"    np.array(({_tuple([f'p{r}' for r in rows])})),",
+                f"    {command if slots.control >= 0 else 'None'},",
+                f"    np.array(({_tuple(states)})),",
+                ")",
+                "if _q is None:",
+                *_indent([f"q{r} = 0.0" for r in rows]),
+                "else:",
+                *_indent([f"{_tuple([f'q{r}' for r in rows])} = _q.tolist()"]),
+            ]
+        else:
+            body += lines
+
+    # Road load on the output port
+    load = None
+    row = drivetrain._output_row
+    if row is not None:
+        needed_rows.add(row)
+        component = drivetrain._load_component
+        body.append(f"# load on {drivetrain.topology.output_component}")
+        if hasattr(component, "load_torque_source"):
+            body += component.load_torque_source(f"p{row}", "grade", "_load")
+        else:
+            namespace["load_component"] = component
+            body.append(f"_load = load_component.compute_load_torque(p{row}, grade)")
+        load = "_load"
+
+    # Generalized forces and accelerations
+    for i in range(n):
+        terms = [(float(P[r, i]), f"q{r}") for r in torque_rows if P[r, i] != 0.0]
+        if load is not None and P[row, i] != 0.0:
+            terms.append((-float(P[row, i]), load))
+        body.append(f"f{i} = {_linear_combination(terms)}")
+    for i in range(n):
+        body.append(
+            f"a{i} = {_linear_combination([(float(J_inv[i, j]), f'f{j}') for j in range(n)])}"
+        )
+
+    # Internal state derivatives
+    derivs = [f"a{i}" for i in range(n)] + ["0.0"] * (n_states - n)
+    for k, slots in enumerate(drivetrain._stateful_slots):
+        rows = list(range(slots.ports.start, slots.ports.stop))
+        needed_rows.update(rows)
+        states = [f"x{i}" for i in range(slots.states.start, slots.states.stop)]
+        torques = [f"q{r}" if r in torque_rows else "0.0" for r in rows]
+        names = [f"d{i}" for i in range(slots.states.start, slots.states.stop)]
+        lines = slots.component.state_derivative_source(
+            states, [f"p{r}" for r in rows], torques, names
+        )
+        body.append(f"# {slots.name} states")
+        if lines is None:
+            name = f"stateful{k}"
+            namespace[name] = slots.component
+            body.append(
+                f"{_tuple(names)} = {name}.compute_state_derivatives_array("
+                f"np.array(({_tuple(states)})), "
+                f"np.array(({_tuple([f'p{r}' for r in rows])})), "
+                f"np.array(({_tuple(torques)}))).tolist()"
+            )
+        else:
+            body += lines
+        for i, name in zip(range(slots.states.start, slots.states.stop), names):
+            derivs[i] = name
+
+    head = [f"{_tuple([f'x{i}' for i in range(n_states)])} = x.tolist()"]
+    if n_controls:
+        head.append(f"{_tuple([f'u{j}' for j in range(n_controls)])} = u.tolist()")
+    head += [f"p{r} = {port_speed(r)}" for r in sorted(needed_rows)]
+
+    source = "\n".join(
+        [
+            f"# Generated by gearbox_sim.core.codegen (version {CODEGEN_VERSION})",
+            f"# Gears: {drivetrain.gear_state.gears}",
+            "def rhs(t, x, u, grade):",
+            *_indent(head + body),
+            f"    return np.array(({_tuple(derivs)}))",
+            "",
+        ]
+    )
+    return source, namespace
+
+
+def _load_code(source: str, key: str, cache_dir: Optional[Path]):
+    """Compile source, reusing the in-memory or on-disk code object.
+
+    Files on disk start with the SHA-256 digest of the source they were
+    compiled from; a file whose digest doesn't match is ignored and
+    rewritten.
+    """
+    code = _code_cache.get(key)
+    if code is not None:
+        return code
+
+    digest = hashlib.sha256(source.encode()).digest()
+    tag = sys.implementation.cache_tag
+    if cache_dir is not None:
+        try:
+            data = (cache_dir / f"{key}.{tag}.bin").read_bytes()
+            if data[: len(digest)] == digest:
+                code = marshal.loads(data[len(digest) :])
+        except (OSError, ValueError, EOFError, TypeError):
+            code = None
+
+    if code is None:
+        filename = str(cache_dir / f"{key}.py") if cache_dir is not None else f"<rhs {key}>"
+        code = compile(source, filename, "exec")
+        if cache_dir is not None:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                (cache_dir / f"{key}.py").write_text(source)
+                tmp = cache_dir / f"{key}.{tag}.{os.getpid()}.tmp"
+                tmp.write_bytes(digest + marshal.dumps(code))
+                os.replace(tmp, cache_dir / f"{key}.{tag}.bin")
+            except OSError:
+                pass  # Cache is an optimization only
+
+    _code_cache[key] = code
+    return code
+
+
+def verify_rhs(
+    drivetrain: "Drivetrain",
+    rhs: RHSFunction,
+    n_samples: int = 8,
+    rtol: float = 1e-9,
+) -> float:
+    """Compare a generated RHS against the generic dynamics path.
+
+    Evaluates both at reproducible random states, controls and grades
+    spanning the operating range.
+
+    Args:
+        drivetrain: Compiled drivetrain, in the gears the RHS was generated for
+        rhs: Generated dynamics function
+        n_samples: Number of probe points
+        rtol: Relative tolerance, scaled by the largest derivative
+
+    Returns:
+        Largest absolute difference found
+
+    Raises:
+        ValueError: If the two paths disagree
+    """
+    rng = np.random.default_rng(0)
+    n = drivetrain.n_mechanical_dofs
+    worst = 0.0
+    for _ in range(n_samples):
+        x = np.concatenate(
+            [rng.uniform(-50.0, 250.0, n), rng.uniform(0.2, 0.9, drivetrain.n_internal_states)]
+        )
+        u = rng.uniform(-5000.0, 12000.0, len(drivetrain.control_names))
+        grade = float(rng.uniform(-0.1, 0.15))
+        expected = drivetrain.dynamics_array(0.0, x, u, grade)
+        actual = rhs(0.0, x, u, grade)
+        error = float(np.max(np.abs(actual - expected), initial=0.0))
+        scale = float(np.max(np.abs(expected), initial=0.0))
+        if error > rtol * max(scale, 1.0):
+            raise ValueError(
+                f"Generated RHS differs from generic dynamics by {error:.3e} at x={x}, u={u}"
+            )
+        worst = max(worst, error)
+    return worst
+
+
+def _fixed_gear_dynamics(drivetrain: "Drivetrain", gears: Tuple[int, ...]) -> RHSFunction:
+    """Generic dynamics for one gear combination, whatever gears are engaged."""
+    gear_row = np.array([gears], dtype=int) if gears else None
+
+    def rhs(t: float, x: NDArray, u: NDArray, grade: float = 0.0) -> NDArray:
+        return drivetrain.dynamics_batch(t, x[np.newaxis], u[np.newaxis], grade, gear_row)[0]
+
+    return rhs
+
+
+def compile_rhs(drivetrain: "Drivetrain", verify: bool = True) -> RHSFunction:
+    """Build the generated dynamics function for the current gears.
+
+    Args:
+        drivetrain: Compiled drivetrain
+        verify: Check the result against the generic path; on mismatch warn
+            and fall back to the generic dynamics, pinned to the same gears
+
+    Returns:
+        Function ``rhs(t, x, u, grade) -> dx`` equivalent to dynamics_array
+        in the current gears
+    """
+    source, namespace = generate_rhs_source(drivetrain)
+    key = hashlib.sha256(f"{CODEGEN_VERSION}\n{source}".encode()).hexdigest()[:32]
+    code = _load_code(source, key, get_cache_dir())
+
+    namespace.update(np=np, math=math)
+    exec(code, namespace)
+    rhs = namespace["rhs"]
+
+    if verify:
+        try:
+            verify_rhs(drivetrain, rhs)
+        except ValueError as exc:
+            warnings.warn(f"{exc}; using generic dynamics instead", RuntimeWarning)
+            return _fixed_gear_dynamics(drivetrain, drivetrain.gear_state.gears)
+    return rhs
@@ -1,9 +1,15 @@
 """Abstract base class for drivetrain components."""
 
+import copy
+import weakref
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field, is_dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+from numpy.typing import NDArray
+
+from .params import freeze
 from .ports import Port
 from .constraints import KinematicConstraint
 
@@ -42,6 +48,10 @@ class DrivetrainComponent(ABC):
         - compute_state_derivatives: Calculate derivatives of internal states
     """
 
+    # Parameters that set the kinematics (ratios), so they can't vary between
+    # the rows of a batch that share one compiled drivetrain
+    kinematic_params: Tuple[str, ...] = ()
+
     def __init__(self, name: str = ""):
         """Initialize the component.
 
@@ -60,6 +70,52 @@ class DrivetrainComponent(ABC):
         """Set the component name."""
         self._name = value
 
+    def _add_listener(self, drivetrain: Any) -> None:
+        """Register a drivetrain whose compiled state depends on this component."""
+        if "_listeners" not in self.__dict__:
+            self._listeners = weakref.WeakSet()
+        self._listeners.add(drivetrain)
+
+    def _notify_changed(self) -> None:
+        """Invalidate the compiled state of drivetrains using this component.
+
+        Call this from setters of state that the inertia or the generated
+        dynamics depend on, e.g. the vehicle payload.
+        """
+        for drivetrain in list(self.__dict__.get("_listeners", ())):
+            drivetrain._invalidate()
+
+    def freeze_params(self) -> None:
+        """Replace a dataclass ``params`` with its immutable FrozenParams form.
+
+        Called when a drivetrain is compiled; the attribute names are
+        unchanged, so component code reads them the same way.
+        """
+        params = getattr(self, "params", None)
+        if params is not None and is_dataclass(params):
+            self.params = freeze(params)
+
+    def with_params(self, params: Any) -> "DrivetrainComponent":
+        """Copy of this component that uses another parameter set.
+
+        Used to evaluate batch rows that carry their own parameters (see
+        ``Drivetrain.dynamics_batch``). The copy belongs to no drivetrain.
+
+        Args:
+            params: Parameter dataclass or frozen record of this component's type
+
+        Returns:
+            The copy, with values derived from params recomputed
+        """
+        component = copy.copy(self)
+        component.__dict__.pop("_listeners", None)
+        component.params = freeze(params)
+        component._params_changed()
+        return component
+
+    def _params_changed(self) -> None:
+        """Recompute values cached from ``params``; called by with_params."""
+
     @property
     @abstractmethod
     def ports(self) -> Dict[str, Port]:
@@ -146,6 +202,169 @@ class DrivetrainComponent(ABC):
         """
         pass
 
+    def compute_torques_array(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[float],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Array form of compute_torques used by the compiled dynamics.
+
+        The default implementation wraps compute_torques; components on the
+        RHS hot path override it to avoid building dicts.
+
+        Args:
+            port_speeds: Mechanical port speeds, ordered as get_mechanical_ports() [rad/s]
+            torque_command: Torque command [N·m], or None if the component has none
+            internal_states: Internal state values, ordered as state_names
+
+        Returns:
+            Torque at each mechanical port [N·m], or None if the component
+            applies no torque
+        """
+        port_names = list(self.get_mechanical_ports())
+        control_inputs = {} if torque_command is None else {"torque": torque_command}
+        torques = self.compute_torques(
+            dict(zip(port_names, port_speeds)),
+            control_inputs,
+            dict(zip(self.state_names, internal_states)),
+        )
+        if not torques:
+            return None
+        return np.array([torques.get(name, 0.0) for name in port_names])
+
+    def compute_state_derivatives_array(
+        self,
+        internal_states: NDArray,
+        port_speeds: NDArray,
+        port_torques: NDArray,
+    ) -> NDArray:
+        """Array form of compute_state_derivatives used by the compiled dynamics.
+
+        Args:
+            internal_states: Internal state values, ordered as state_names
+            port_speeds: Mechanical port speeds, ordered as get_mechanical_ports() [rad/s]
+            port_torques: Mechanical port torques, same order [N·m]
+
+        Returns:
+            Time derivative of each internal state, ordered as state_names
+        """
+        mechanical = list(self.get_mechanical_ports())
+        port_values: Dict[str, Any] = {}
+        for port_name in self.ports:
+            if port_name in mechanical:
+                k = mechanical.index(port_name)
+                port_values[f"{port_name}_speed"] = port_speeds[k]
+                port_values[f"{port_name}_torque"] = port_torques[k]
+            else:
+                port_values[f"{port_name}_speed"] = 0.0
+                port_values[f"{port_name}_torque"] = 0.0
+
+        derivs = self.compute_state_derivatives(
+            dict(zip(self.state_names, internal_states)), port_values
+        )
+        return np.array([derivs.get(name, 0.0) for name in self.state_names])
+
+    def compute_torques_batch(
+        self,
+        port_speeds: NDArray,
+        torque_command: Optional[NDArray],
+        internal_states: NDArray,
+    ) -> Optional[NDArray]:
+        """Batched compute_torques_array over N independent scenarios.
+
+        The default implementation loops over rows; components override it
+        with vectorized NumPy.
+
+        Args:
+            port_speeds: Mechanical port speeds, shape (N, n_ports) [rad/s]
+            torque_command: Torque commands, shape (N,), or None [N·m]
+            internal_states: Internal states, shape (N, n_states)
+
+        Returns:
+            Port torques, shape (N, n_ports), or None if the component
+            applies no torque
+        """
+        rows = [
+            self.compute_torques_array(
+                port_speeds[i],
+                None if torque_command is None else torque_command[i],
+                internal_states[i],
+            )
+            for i in range(port_speeds.shape[0])
+        ]
+        if all(row is None for row in rows):
+            return None
+        zeros = np.zeros(port_speeds.shape[1])
+        return np.array([zeros if row is None else row for row in rows])
+
+    def compute_state_derivatives_batch(
+        self,
+        internal_states: NDArray,
+        port_speeds: NDArray,
+        port_torques: NDArray,
+    ) -> NDArray:
+        """Batched compute_state_derivatives_array over N independent scenarios.
+
+        Args:
+            internal_states: Internal states, shape (N, n_states)
+            port_speeds: Mechanical port speeds, shape (N, n_ports) [rad/s]
+            port_torques: Mechanical port torques, shape (N, n_ports) [N·m]
+
+        Returns:
+            State derivatives, shape (N, n_states)
+        """
+        return np.array(
+            [
+                self.compute_state_derivatives_array(
+                    internal_states[i], port_speeds[i], port_torques[i]
+                )
+                for i in range(internal_states.shape[0])
+            ]
+        ).reshape(internal_states.shape)
+
+    def torque_source(
+        self,
+        speeds: List[str],
+        command: str,
+        torques: List[str],
+    ) -> Optional[List[str]]:
+        """Source for the torque law, inlined into the generated RHS.
+
+        See gearbox_sim.core.codegen. Temporary names should start with an
+        underscore to avoid clashing with the generated variables.
+
+        Args:
+            speeds: Variables holding the mechanical port speeds [rad/s]
+            command: Variable (or literal) holding the torque command [N·m]
+            torques: Variables the lines must assign the port torques to
+
+        Returns:
+            Source lines, an empty list if the component applies no torque, or
+            None to call compute_torques_array from the generated code instead
+        """
+        return None
+
+    def state_derivative_source(
+        self,
+        states: List[str],
+        speeds: List[str],
+        torques: List[str],
+        derivatives: List[str],
+    ) -> Optional[List[str]]:
+        """Source for the internal state derivatives, inlined into the generated RHS.
+
+        Args:
+            states: Variables holding the internal states
+            speeds: Variables holding the mechanical port speeds [rad/s]
+            torques: Variables (or literals) holding the mechanical port torques [N·m]
+            derivatives: Variables the lines must assign the derivatives to
+
+        Returns:
+            Source lines, or None to call compute_state_derivatives_array
+        """
+        return None
+
     def get_port(self, name: str) -> Port:
         """Get a port by name.
 
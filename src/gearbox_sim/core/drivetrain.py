@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 from numpy.typing import NDArray
 
 from .topology import DrivetrainTopology
 from .component import DrivetrainComponent
+from .params import FrozenParams, ParamBlock
+from .codegen import compile_rhs
 from .constraints import (
     KinematicConstraint,
     GearRatioConstraint,
@@ -39,6 +41,40 @@ class ConstraintInfo:
     expression: Dict[str, float]  # How to compute eliminated DOF from independent DOFs
 
 
+@dataclass
+class ComponentSlots:
+    """Where one component's values live in the flat dynamics arrays.
+
+    Each component's mechanical ports occupy a contiguous range of port rows
+    (the rows of the projection matrix), and its internal states a contiguous
+    range of the state vector, so both are stored as slices.
+    """
+
+    name: str
+    component: DrivetrainComponent
+    ports: slice  # Rows in the port speed/torque vectors
+    states: slice  # Positions in the state vector
+    control: int  # Position of "T_<name>" in the control vector, -1 if none
+
+
+@dataclass
+class CompiledGearState:
+    """Kinematics and inertia compiled for one gear combination.
+
+    Compiling is only needed once per combination of gearbox gears; after
+    that, shifting just swaps which compiled state the drivetrain uses.
+    """
+
+    gears: Tuple[int, ...]  # One gear per gearbox, in control order
+    independent_dofs: List[DOFInfo]
+    eliminated_dofs: Dict[str, ConstraintInfo]
+    projection: NDArray  # All port speeds = projection @ omega
+    inertia_matrix: NDArray
+    inertia_cholesky: NDArray  # Lower-triangular L with J = L @ L.T
+    inertia_inverse: NDArray  # J^-1, formed from the Cholesky factor
+    rhs: Optional[Callable[[float, NDArray, NDArray, float], NDArray]] = None  # Generated dynamics
+
+
 class Drivetrain:
     """A compiled drivetrain ready for simulation.
 
@@ -61,6 +97,11 @@ class Drivetrain:
     def __init__(self, topology: DrivetrainTopology):
         """Initialize and compile the drivetrain.
 
+        Component parameters are frozen here, so editing ``component.params``
+        afterwards raises AttributeError. To vary a parameter, thaw() it,
+        edit the copy, and build a new component and drivetrain, or stack
+        the variants for ``dynamics_batch`` / ``simulate_batch``.
+
         Args:
             topology: The validated topology to compile
         """
@@ -73,19 +114,87 @@ class Drivetrain:
         self._internal_states: List[Tuple[str, str]] = []  # (component, state_name)
         self._control_inputs: List[str] = []
         self._inertia_matrix: Optional[NDArray] = None
+        self._projection: Optional[NDArray] = None  # All port speeds = P @ omega
+        self._inertia_inverse: Optional[NDArray] = None
         self._gear_state: Dict[str, int] = {}  # Component -> current gear
+        self._gear_cache: Dict[Tuple[int, ...], CompiledGearState] = {}
+        # Component copies for per-row batch parameters, by name and params
+        self._variants: Dict[Tuple[str, FrozenParams], DrivetrainComponent] = {}
+
+        # Parameters are fixed from here on; other state the compiled
+        # matrices depend on (e.g. payload) invalidates them when set
+        for component in self._components.values():
+            component.freeze_params()
+            component._add_listener(self)
 
         # Compile the topology
         self._compile()
+        self._initial_gears = dict(self._gear_state)
 
     def _compile(self) -> None:
         """Compile the topology into simulation-ready form."""
         self._identify_dofs()
-        self._apply_constraints()
         self._collect_internal_states()
         self._identify_control_inputs()
+        self._use_gear_state(tuple(self._gear_state.values()))
+        self._build_slot_tables()
+
+    def _compile_gear_state(self, gears: Tuple[int, ...]) -> CompiledGearState:
+        """Reduce the DOFs and build the inertia matrix for one gear combination.
+
+        Args:
+            gears: Gear of each gearbox, in the order of ``self._gear_state``
+
+        Returns:
+            The compiled kinematics for that combination
+        """
+        for comp_name, gear in zip(self._gear_state, gears):
+            self._components[comp_name].gear = gear
+
+        self._apply_constraints()
         self._build_inertia_matrix()
 
+        J = self._inertia_matrix
+        L = np.linalg.cholesky(J)
+        L_inv = np.linalg.inv(L)
+
+        return CompiledGearState(
+            gears=gears,
+            independent_dofs=self._independent_dofs,
+            eliminated_dofs=self._eliminated_dofs,
+            projection=self._projection,
+            inertia_matrix=J,
+            inertia_cholesky=L,
+            inertia_inverse=L_inv.T @ L_inv,
+        )
+
+    def _use_gear_state(self, gears: Tuple[int, ...]) -> None:
+        """Switch to a gear combination, compiling it on first use."""
+        compiled = self._gear_cache.get(gears)
+        if compiled is None:
+            compiled = self._compile_gear_state(gears)
+            self._gear_cache[gears] = compiled
+
+        for comp_name, gear in zip(self._gear_state, gears):
+            self._gear_state[comp_name] = gear
+            self._components[comp_name].gear = gear
+
+        self._independent_dofs = compiled.independent_dofs
+        self._eliminated_dofs = compiled.eliminated_dofs
+        self._projection = compiled.projection
+        self._inertia_matrix = compiled.inertia_matrix
+        self._inertia_inverse = compiled.inertia_inverse
+
+    def _invalidate(self) -> None:
+        """Drop every compiled gear combination and recompile the current one.
+
+        Called by a component whose inertia or load changed, so cached
+        inertia matrices and generated dynamics are rebuilt on next use.
+        """
+        self._gear_cache.clear()
+        self._variants.clear()
+        self._use_gear_state(tuple(self._gear_state.values()))
+
     def _identify_dofs(self) -> None:
         """Identify all mechanical degrees of freedom before constraint reduction."""
         # Each mechanical port is potentially an independent DOF
@@ -99,6 +208,7 @@ class Drivetrain:
                 idx += 1
 
         self._all_dofs = all_dofs
+        self._port_index = {dof.name: dof.index for dof in all_dofs}
 
     def _apply_constraints(self) -> None:
         """Apply kinematic constraints to reduce DOFs."""
@@ -192,6 +302,26 @@ class Drivetrain:
             )
 
         self._eliminated_dofs = eliminated
+        self._build_projection()
+
+    def _build_projection(self) -> None:
+        """Build the projection matrix from independent DOFs to all ports.
+
+        Row k holds the coefficients of ``self._all_dofs[k]`` in terms of the
+        independent DOFs, so that all port speeds are ``P @ omega`` and, by
+        virtual work, the generalized forces are ``P.T @ port_torques``.
+        Resolving the constraint chains here means the dynamics never has to
+        walk them again.
+        """
+        independent = {dof.name: dof for dof in self._independent_dofs}
+        P = np.zeros((len(self._all_dofs), len(self._independent_dofs)))
+
+        for dof in self._all_dofs:
+            resolved = self._resolve_dof(dof.name, independent, self._eliminated_dofs)
+            for ind_name, coeff in resolved.items():
+                P[dof.index, independent[ind_name].index] = coeff
+
+        self._projection = P
 
     def _resolve_dof(
         self,
@@ -244,78 +374,63 @@ class Drivetrain:
             comp_type = type(component).__name__
             if "Gearbox" in comp_type:
                 self._control_inputs.append(f"gear_{comp_name}")
-                self._gear_state[comp_name] = 0
+                self._gear_state[comp_name] = component.gear
 
-    def _build_inertia_matrix(self) -> None:
-        """Build the inertia matrix for the reduced system."""
-        n_dof = len(self._independent_dofs)
-        J = np.zeros((n_dof, n_dof))
-
-        # For each independent DOF, sum up inertia contributions
-        for i, dof_i in enumerate(self._independent_dofs):
-            for j, dof_j in enumerate(self._independent_dofs):
-                J[i, j] = self._compute_coupled_inertia(dof_i, dof_j)
-
-        self._inertia_matrix = J
+    def _build_slot_tables(self) -> None:
+        """Build integer slot tables for the array-based dynamics.
 
-    def _compute_coupled_inertia(self, dof_i: DOFInfo, dof_j: DOFInfo) -> float:
-        """Compute the inertia coupling between two DOFs.
-
-        This accounts for inertias from all mechanical ports, reflected
-        through gear ratios and kinematic constraints.
+        Ports and internal states are collected component by component, so
+        each component maps to one contiguous range of each vector.
         """
-        total = 0.0
-
-        # Get all DOFs that contribute to each independent DOF
-        contributions_i = self._get_inertia_contributions(dof_i.name)
-        contributions_j = self._get_inertia_contributions(dof_j.name)
-
-        # Sum up J * coeff_i * coeff_j for each source inertia
-        for (comp, port), coeff_i in contributions_i.items():
-            coeff_j = contributions_j.get((comp, port), 0.0)
-            if abs(coeff_j) > 1e-12:
-                J_port = self._components[comp].get_inertia(port)
-                total += J_port * coeff_i * coeff_j
+        port_start = 0
+        state_start = self.n_mechanical_dofs
+        self._component_slots: List[ComponentSlots] = []
 
-        return total
-
-    def _get_inertia_contributions(self, dof_name: str) -> Dict[Tuple[str, str], float]:
-        """Get all port inertias that contribute to this DOF with their coefficients.
-
-        For an eliminated DOF like vehicle.wheels = {planetary.ring: 0.0125},
-        the vehicle's inertia contributes to planetary.ring with coefficient 0.0125.
-
-        We need to fully resolve each eliminated DOF's expression to independent DOFs
-        to find the correct coefficients.
-        """
-        contributions: Dict[Tuple[str, str], float] = {}
-
-        # The DOF's own port
-        for dof in self._independent_dofs:
-            if dof.name == dof_name:
-                contributions[(dof.component, dof.port)] = 1.0
-
-        # Build resolved expressions for all eliminated DOFs
-        # (expressions in terms of independent DOFs only)
-        resolved_expressions: Dict[str, Dict[str, float]] = {}
-        for elim_name, info in self._eliminated_dofs.items():
-            resolved = self._resolve_dof(
-                elim_name,
-                {dof.name: dof for dof in self._independent_dofs},
-                self._eliminated_dofs,
+        for comp_name, component in self._components.items():
+            n_ports = len(component.get_mechanical_ports())
+            n_internal = len(component.state_names)
+            torque_key = f"T_{comp_name}"
+            self._component_slots.append(
+                ComponentSlots(
+                    name=comp_name,
+                    component=component,
+                    ports=slice(port_start, port_start + n_ports),
+                    states=slice(state_start, state_start + n_internal),
+                    control=(
+                        self._control_inputs.index(torque_key)
+                        if torque_key in self._control_inputs
+                        else -1
+                    ),
+                )
             )
-            resolved_expressions[elim_name] = resolved
+            port_start += n_ports
+            state_start += n_internal
+
+        self._stateful_slots = [
+            slots for slots in self._component_slots if slots.states.stop > slots.states.start
+        ]
+
+        # Output port the vehicle load torque acts on
+        self._output_row: Optional[int] = None
+        self._load_component: Optional[DrivetrainComponent] = None
+        if self.topology.output_component is not None:
+            output_dof = f"{self.topology.output_component}.{self.topology.output_port}"
+            component = self._components[self.topology.output_component]
+            if output_dof in self._port_index and hasattr(component, "compute_load_torque"):
+                self._output_row = self._port_index[output_dof]
+                self._load_component = component
 
-        # Add contributions from eliminated DOFs that depend on dof_name
-        for elim_name, resolved in resolved_expressions.items():
-            coeff = resolved.get(dof_name, 0.0)
-            if abs(coeff) > 1e-12:
-                # Parse component.port from elim_name
-                parts = elim_name.split(".")
-                comp, port = parts[0], parts[1]
-                contributions[(comp, port)] = coeff
+    def _build_inertia_matrix(self) -> None:
+        """Build the inertia matrix for the reduced system.
 
-        return contributions
+        Each port inertia is reflected to the independent DOFs through the
+        projection matrix: J = P.T @ diag(J_ports) @ P.
+        """
+        J_ports = np.array(
+            [self._components[dof.component].get_inertia(dof.port) for dof in self._all_dofs]
+        )
+        P = self._projection
+        self._inertia_matrix = P.T @ (J_ports[:, None] * P)
 
     @property
     def state_names(self) -> List[str]:
@@ -355,13 +470,148 @@ class Drivetrain:
         """Get a component by name."""
         return self._components[name]
 
+    def _lookup_gear_state(self, gears: Tuple[int, ...]) -> CompiledGearState:
+        """Get the compiled state for a gear combination without switching to it."""
+        if gears not in self._gear_cache:
+            current = tuple(self._gear_state.values())
+            self._use_gear_state(gears)
+            self._use_gear_state(current)
+        return self._gear_cache[gears]
+
+    @property
+    def gear_state(self) -> CompiledGearState:
+        """The compiled kinematics for the current gear combination."""
+        return self._gear_cache[tuple(self._gear_state.values())]
+
+    def get_compiled_dynamics(self) -> Callable[[float, NDArray, NDArray, float], NDArray]:
+        """Get the generated dynamics function for the current gears.
+
+        The function has the signature and results of ``dynamics_array`` but
+        is specialized to this topology and gear combination (see
+        gearbox_sim.core.codegen). It is generated on first use per gear
+        combination and verified against the generic path, and regenerated
+        after a change such as the vehicle payload invalidates the compiled
+        state. The simulator integrates with it, fetching it again after
+        each shift.
+        """
+        compiled = self.gear_state
+        if compiled.rhs is None:
+            compiled.rhs = compile_rhs(self)
+        return compiled.rhs
+
     def set_gear(self, component: str, gear: int) -> None:
-        """Set the current gear for a gearbox component."""
+        """Set the current gear for a gearbox component.
+
+        Each gear combination is compiled once and memoized, so shifting
+        back to a previously used combination only swaps cached matrices.
+        """
         if component in self._gear_state:
-            self._gear_state[component] = gear
-            # Rebuild inertia matrix since ratios changed
-            self._apply_constraints()
-            self._build_inertia_matrix()
+            self._use_gear_state(self._gear_tuple({component: gear}))
+
+    def set_gears(self, gears: Dict[str, float]) -> None:
+        """Engage several gears at once, without remapping any state.
+
+        Args:
+            gears: Gear per gearbox; gearboxes not listed keep their gear
+
+        Raises:
+            ValueError: If a name is not a gearbox of this drivetrain
+        """
+        unknown = [name for name in gears if name not in self._gear_state]
+        if unknown:
+            raise ValueError(f"Not gearboxes of this drivetrain: {', '.join(unknown)}")
+        self._use_gear_state(self._gear_tuple(gears))
+
+    @property
+    def gears(self) -> Dict[str, int]:
+        """Current gear of each gearbox."""
+        return dict(self._gear_state)
+
+    @property
+    def initial_gears(self) -> Dict[str, int]:
+        """Gear of each gearbox when the drivetrain was built.
+
+        Simulations start from these gears unless told otherwise, so an
+        initial state means the same thing on every run.
+        """
+        return dict(self._initial_gears)
+
+    def _gear_tuple(self, gears: Dict[str, float]) -> Tuple[int, ...]:
+        """Current gears with some overridden, clamped, in ``_gear_state`` order."""
+        combo = dict(self._gear_state)
+        for comp_name, gear in gears.items():
+            if comp_name in combo:
+                n_gears = self._components[comp_name].n_gears
+                combo[comp_name] = max(0, min(int(gear), n_gears - 1))
+        return tuple(combo.values())
+
+    def requested_gears(self, control: Dict[str, float]) -> Dict[str, int]:
+        """Gear selections from a control dict.
+
+        Args:
+            control: Control inputs, possibly with ``gear_<gearbox>`` entries
+
+        Returns:
+            Gear of each gearbox, clamped to its range. Gearboxes without an
+            entry keep their current gear.
+        """
+        requested = {
+            comp_name: control[f"gear_{comp_name}"]
+            for comp_name in self._gear_state
+            if f"gear_{comp_name}" in control
+        }
+        return dict(zip(self._gear_state, self._gear_tuple(requested)))
+
+    def remap_state(
+        self, x: NDArray, from_gears: Tuple[int, ...], to_gears: Tuple[int, ...]
+    ) -> NDArray:
+        """Carry a state vector across a gear change.
+
+        The independent speeds are adjusted so the output port keeps its
+        speed, with the smallest change in kinetic energy as measured by the
+        new inertia matrix. Internal states are unchanged.
+
+        Args:
+            x: State vector in from_gears
+            from_gears: Gear combination x was computed in
+            to_gears: Gear combination to carry x into
+
+        Returns:
+            State vector for to_gears
+        """
+        x = np.array(x, dtype=float)
+        row = self._output_row
+        if row is None or tuple(from_gears) == tuple(to_gears):
+            return x
+
+        old = self._lookup_gear_state(tuple(from_gears))
+        new = self._lookup_gear_state(tuple(to_gears))
+        n = self.n_mechanical_dofs
+        omega = x[:n]
+
+        # min (w' - w)^T J (w' - w) subject to p . w' = output speed
+        p = new.projection[row]
+        J_inv_p = new.inertia_inverse @ p
+        denom = float(p @ J_inv_p)
+        if denom > 0.0:
+            x[:n] = omega + J_inv_p * (float(old.projection[row] @ omega) - float(p @ omega)) / denom
+        return x
+
+    def shift(self, x: NDArray, gears: Dict[str, float]) -> NDArray:
+        """Change gears between integration steps.
+
+        Args:
+            x: State vector in the current gears
+            gears: New gear per gearbox; gearboxes not listed keep their gear
+
+        Returns:
+            State vector remapped for the new gears (see remap_state)
+        """
+        current = tuple(self._gear_state.values())
+        target = self._gear_tuple(gears)
+        x = self.remap_state(x, current, target)
+        self._use_gear_state(target)
+        return x
 
     def state_to_array(self, state: Dict[str, float]) -> NDArray:
         """Convert state dict to array."""
@@ -379,32 +629,34 @@ class Drivetrain:
 
         Returns speeds for both independent and constrained DOFs.
         """
-        state = self.array_to_state(x)
-        speeds = {}
-
-        # Independent DOFs have speeds directly in state
-        for dof in self._independent_dofs:
-            speeds[dof.name] = state.get(dof.name, 0.0)
+        speeds = self._projection @ x[: self.n_mechanical_dofs]
+        return {dof.name: float(speeds[dof.index]) for dof in self._all_dofs}
 
-        # Constrained DOFs computed from constraints (with recursive resolution)
-        def resolve_speed(dof_name: str) -> float:
-            if dof_name in speeds:
-                return speeds[dof_name]
+    def get_all_speeds_array(
+        self, y: NDArray, gears: Optional[NDArray] = None
+    ) -> Dict[str, NDArray]:
+        """Compute all port speeds along a trajectory.
 
-            if dof_name in self._eliminated_dofs:
-                info = self._eliminated_dofs[dof_name]
-                omega = 0.0
-                for dep_name, coeff in info.expression.items():
-                    omega += coeff * resolve_speed(dep_name)
-                speeds[dof_name] = omega
-                return omega
-
-            return 0.0  # Unknown DOF
-
-        for elim_name in self._eliminated_dofs:
-            resolve_speed(elim_name)
+        Args:
+            y: States, shape (n_states, N) as returned by the ODE solver
+            gears: Gear of each gearbox per sample, shape (N, n_gearboxes);
+                None uses the current gears
 
-        return speeds
+        Returns:
+            Dict mapping port name to speeds, shape (N,)
+        """
+        omega = np.asarray(y, dtype=float)[: self.n_mechanical_dofs]
+        if gears is None or not self._gear_state:
+            speeds = self._projection @ omega
+        else:
+            speeds = np.empty((len(self._all_dofs), omega.shape[1]))
+            for cols, compiled in self._gear_groups(gears, omega.shape[1]):
+                speeds[:, cols] = compiled.projection @ omega[:, cols]
+        return {dof.name: speeds[dof.index] for dof in self._all_dofs}
+
+    def control_to_array(self, control: Dict[str, float]) -> NDArray:
+        """Convert control dict to array ordered as control_names."""
+        return np.array([float(control.get(name, 0.0)) for name in self._control_inputs])
 
     def dynamics(
         self,
@@ -423,148 +675,311 @@ class Drivetrain:
 
         Returns:
             State derivative vector dx/dt
+
+        Note:
+            Gear selections are not applied here. A shift changes the
+            kinematics relating the state speeds, so it has to happen between
+            integration steps via ``shift`` rather than inside the RHS.
         """
-        dx = np.zeros_like(x)
+        u = self.control_to_array(control)
+        return self.dynamics_array(t, x, u, disturbance.get("grade", 0.0))
+
+    def dynamics_array(self, t: float, x: NDArray, u: NDArray, grade: float = 0.0) -> NDArray:
+        """Compute state derivatives from flat arrays.
 
-        # Get all port speeds
-        all_speeds = self.get_all_speeds(x)
+        Fast path of ``dynamics``: components are reached through the slot
+        tables built at compile time, so no per-call dicts are built.
 
-        # Update gear states from control
-        for comp_name in self._gear_state:
-            gear_key = f"gear_{comp_name}"
-            if gear_key in control:
-                new_gear = int(control[gear_key])
-                if new_gear != self._gear_state[comp_name]:
-                    self.set_gear(comp_name, new_gear)
+        Args:
+            t: Current time [s]
+            x: State vector, ordered as state_names
+            u: Control vector, ordered as control_names
+            grade: Road grade (fraction)
+
+        Returns:
+            State derivative vector dx/dt
+        """
+        n = self.n_mechanical_dofs
+        P = self._projection
+        speeds = P @ x[:n]
+        port_torques = np.zeros(len(self._all_dofs))
 
         # Compute torques from all components
-        all_torques: Dict[str, float] = {}
+        for slots in self._component_slots:
+            torques = slots.component.compute_torques_array(
+                speeds[slots.ports],
+                u[slots.control] if slots.control >= 0 else None,
+                x[slots.states],
+            )
+            if torques is not None:
+                port_torques[slots.ports] = torques
 
-        for comp_name, component in self._components.items():
-            # Build port speeds dict for this component
-            port_speeds = {}
-            for port_name in component.get_mechanical_ports():
-                dof_name = f"{comp_name}.{port_name}"
-                port_speeds[port_name] = all_speeds.get(dof_name, 0.0)
+        # Build generalized force vector (virtual work through the projection)
+        tau = P.T @ port_torques
 
-            # Build control inputs for this component
-            comp_control = {}
-            torque_key = f"T_{comp_name}"
-            if torque_key in control:
-                comp_control["torque"] = control[torque_key]
+        # Add load torque (from vehicle component) with grade
+        tau = self._add_load_torque(tau, speeds, grade)
 
-            # Get internal states for this component
-            internal = {}
-            for state_name in component.state_names:
-                full_name = f"{comp_name}.{state_name}"
-                idx = self.state_names.index(full_name)
-                internal[state_name] = x[idx]
+        # Solve for accelerations: J * omega_dot = tau (J^-1 is cached per gear)
+        dx = np.zeros_like(x)
+        if n > 0:
+            dx[:n] = self._inertia_inverse @ tau
 
-            # Compute torques
-            torques = component.compute_torques(port_speeds, comp_control, internal)
-            for port_name, torque in torques.items():
-                dof_name = f"{comp_name}.{port_name}"
-                all_torques[dof_name] = torque
-
-        # Build generalized force vector
-        tau = np.zeros(self.n_mechanical_dofs)
-
-        # First, resolve all eliminated DOFs to independent DOFs
-        # This handles constraint chains like MG1.shaft → sun → {carrier, ring}
-        independent_dict = {dof.name: dof for dof in self._independent_dofs}
-        resolved_coeffs: Dict[str, Dict[str, float]] = {}
-        for elim_name in self._eliminated_dofs:
-            resolved_coeffs[elim_name] = self._resolve_dof(
-                elim_name, independent_dict, self._eliminated_dofs
+        # Compute internal state derivatives
+        for slots in self._stateful_slots:
+            dx[slots.states] = slots.component.compute_state_derivatives_array(
+                x[slots.states], speeds[slots.ports], port_torques[slots.ports]
             )
 
-        for i, dof in enumerate(self._independent_dofs):
-            # Direct torque on this DOF
-            tau[i] += all_torques.get(dof.name, 0.0)
+        return dx
 
-            # Add torques from constrained DOFs, using resolved coefficients
-            for elim_name, resolved in resolved_coeffs.items():
-                coeff = resolved.get(dof.name, 0.0)
-                if abs(coeff) > 1e-12:
-                    # Torque gets multiplied by the constraint coefficient
-                    tau[i] += coeff * all_torques.get(elim_name, 0.0)
+    def dynamics_batch(
+        self,
+        t: float,
+        X: NDArray,
+        U: NDArray,
+        grade: Union[float, NDArray] = 0.0,
+        gears: Optional[NDArray] = None,
+        params: Optional[Dict[str, ParamBlock]] = None,
+        payload_fraction: Optional[NDArray] = None,
+    ) -> NDArray:
+        """Compute state derivatives for N independent scenarios at once.
 
-        # Add load torque (from vehicle component) with grade
-        grade = disturbance.get("grade", 0.0)
-        tau = self._add_load_torque(tau, all_speeds, grade)
+        Each row is evaluated exactly as ``dynamics_array`` would, but all
+        rows go through the components' vectorized ``*_batch`` methods in one
+        NumPy pass.
 
-        # Solve for accelerations: J * omega_dot = tau
-        J = self.inertia_matrix
-        if self.n_mechanical_dofs > 0:
-            omega_dot = np.linalg.solve(J, tau)
-            dx[: self.n_mechanical_dofs] = omega_dot
+        Rows may carry their own parameters, e.g. a fleet of trucks with
+        different engines and payloads. Rows sharing a parameter set are
+        evaluated together with a copy of the component built from it (see
+        ``DrivetrainComponent.with_params``). Payloads are applied per row,
+        with the inertia matrix solved row by row.
 
-        # Compute internal state derivatives
-        for i, (comp_name, state_name) in enumerate(self._internal_states):
-            component = self._components[comp_name]
+        Args:
+            t: Current time [s]
+            X: State vectors, shape (N, n_states)
+            U: Control vectors, shape (N, n_controls), ordered as control_names
+            grade: Road grade, scalar or shape (N,)
+            gears: Gear of each gearbox per row, shape (N, n_gearboxes) in
+                the order of the ``gear_*`` controls; None uses the current gears
+            params: Parameters per row as one ParamBlock of N rows per
+                component name; components not listed use their own
+            payload_fraction: Payload fraction [0-1] of the vehicle per row,
+                scalar or shape (N,); None uses the vehicle's payload
 
-            # Get port values
-            port_values = {}
-            for port_name in component.ports:
-                dof_name = f"{comp_name}.{port_name}"
-                port_values[f"{port_name}_speed"] = all_speeds.get(dof_name, 0.0)
-                port_values[f"{port_name}_torque"] = all_torques.get(dof_name, 0.0)
+        Returns:
+            State derivatives, shape (N, n_states)
 
-            # Get current internal states
-            internal = {}
-            for sn in component.state_names:
-                full_name = f"{comp_name}.{sn}"
-                idx = self.state_names.index(full_name)
-                internal[sn] = x[idx]
+        Raises:
+            ValueError: If a parameter block doesn't fit its component, or
+                varies a parameter listed in its ``kinematic_params``
+        """
+        X = np.atleast_2d(X)
+        U = np.atleast_2d(U)
+        n_rows = X.shape[0]
+        grade = np.broadcast_to(np.asarray(grade, dtype=float), (n_rows,))
+        if payload_fraction is not None:
+            payload_fraction = np.broadcast_to(np.asarray(payload_fraction, dtype=float), (n_rows,))
+            if not hasattr(self._load_component, "get_inertia_array"):
+                raise ValueError("payload_fraction needs a vehicle as the output component")
+
+        if gears is None or not self._gear_state:
+            groups = [(slice(None), self.gear_state)]
+        else:
+            groups = self._gear_groups(gears, n_rows)
+
+        dX = np.empty_like(X, dtype=float)
+        for rows, compiled in groups:
+            for sub, components in self._param_groups(params, rows, n_rows):
+                dX[sub] = self._dynamics_batch(
+                    compiled,
+                    X[sub],
+                    U[sub],
+                    grade[sub],
+                    components,
+                    None if payload_fraction is None else payload_fraction[sub],
+                )
+        return dX
 
-            # Compute derivatives
-            derivs = component.compute_state_derivatives(internal, port_values)
+    def _param_groups(
+        self, params: Optional[Dict[str, ParamBlock]], rows: Union[slice, NDArray], n_rows: int
+    ):
+        """Split rows by the parameter sets they carry.
 
-            # Store in dx
-            state_idx = self.n_mechanical_dofs + i
-            dx[state_idx] = derivs.get(state_name, 0.0)
+        Args:
+            params: ParamBlock per component name, or None
+            rows: Rows to split, a slice or boolean mask
+            n_rows: Number of rows in the batch
 
-        return dx
+        Yields:
+            Tuples of (row indices or mask, component copies by name)
+        """
+        if not params:
+            yield rows, {}
+            return
+
+        names = list(params)
+        codes = np.column_stack([self._param_codes(name, params[name], n_rows) for name in names])
+        selected = np.arange(n_rows)[rows]
+        combos, group = np.unique(codes[selected], axis=0, return_inverse=True)
+        group = group.ravel()
+        for k, combo in enumerate(combos):
+            components = {
+                name: self._variant(name, params[name], code) for name, code in zip(names, combo)
+            }
+            yield selected[group == k], components
+
+    def _param_codes(self, name: str, block: ParamBlock, n_rows: int) -> NDArray:
+        """Index of each row's parameter set in a block, after checking it."""
+        component = self._components.get(name)
+        if component is None:
+            raise ValueError(f"No component named '{name}' for the parameter block")
+        if len(block) != n_rows:
+            raise ValueError(f"Parameter block for '{name}' has {len(block)} rows, need {n_rows}")
+        if type(component.params)._source is not block.params_type:
+            raise ValueError(
+                f"Parameter block for '{name}' holds {block.params_type.__name__}, "
+                f"not {type(component.params)._source.__name__}"
+            )
+        for field_name in component.kinematic_params:
+            if np.any(block[field_name] != np.asarray(getattr(component.params, field_name))):
+                raise ValueError(
+                    f"Parameter '{field_name}' of '{name}' sets the kinematics and "
+                    f"can't vary between rows"
+                )
+        return block.groups()[1]
 
-    def _add_load_torque(
-        self, tau: NDArray, speeds: Dict[str, float], grade: float
-    ) -> NDArray:
-        """Add vehicle load torque to the generalized forces."""
-        # Find the vehicle component (connects to output)
-        if self.topology.output_component is None:
-            return tau
+    def _variant(self, name: str, block: ParamBlock, code: int) -> DrivetrainComponent:
+        """Copy of a component using parameter set ``code`` of a block, cached."""
+        params = block.row(int(block.groups()[0][code]))
+        component = self._variants.get((name, params))
+        if component is None:
+            component = self._components[name].with_params(params)
+            self._variants[(name, params)] = component
+        return component
 
-        output_comp = self.topology.output_component
-        output_port = self.topology.output_port
-        output_dof = f"{output_comp}.{output_port}"
+    def _gear_groups(self, gears: NDArray, n_rows: int):
+        """Split rows by gear combination.
 
-        # Get vehicle velocity from wheel speed
-        component = self._components[output_comp]
-        omega = speeds.get(output_dof, 0.0)
+        Gears are clamped like set_gear.
+
+        Args:
+            gears: Gear of each gearbox per row, shape (n_rows, n_gearboxes)
+            n_rows: Number of rows
+
+        Yields:
+            Tuples of (row mask, CompiledGearState)
+        """
+        gears = np.asarray(gears, dtype=int).reshape(n_rows, len(self._gear_state))
+        n_gears = [self._components[name].n_gears for name in self._gear_state]
+        gears = np.clip(gears, 0, np.array(n_gears) - 1)
 
-        # If this is a vehicle component, get load torque
-        if hasattr(component, "compute_load_torque"):
-            T_load = component.compute_load_torque(omega, grade)
+        combos, group = np.unique(gears, axis=0, return_inverse=True)
+        group = group.ravel()
+        for k, combo in enumerate(combos):
+            yield group == k, self._lookup_gear_state(tuple(int(g) for g in combo))
 
-            # Find which independent DOF is affected
-            for i, dof in enumerate(self._independent_dofs):
-                if dof.name == output_dof:
-                    tau[i] -= T_load
-                    break
+    def _dynamics_batch(
+        self,
+        compiled: CompiledGearState,
+        X: NDArray,
+        U: NDArray,
+        grade: NDArray,
+        components: Optional[Dict[str, DrivetrainComponent]] = None,
+        payload_fraction: Optional[NDArray] = None,
+    ) -> NDArray:
+        """Batched dynamics for rows that share one gear combination.
+
+        ``components`` replaces components by name (rows sharing a parameter
+        set), and ``payload_fraction`` sets the vehicle payload per row.
+        """
+        components = components or {}
+        n = self.n_mechanical_dofs
+        P = compiled.projection
+        speeds = X[:, :n] @ P.T
+        port_torques = np.zeros_like(speeds)
+
+        # Compute torques from all components
+        for slots in self._component_slots:
+            component = components.get(slots.name, slots.component)
+            torques = component.compute_torques_batch(
+                speeds[:, slots.ports],
+                U[:, slots.control] if slots.control >= 0 else None,
+                X[:, slots.states],
+            )
+            if torques is not None:
+                port_torques[:, slots.ports] = torques
+
+        # Generalized forces, including the road load on the output port
+        tau = port_torques @ P
+        row = self._output_row
+        if row is not None:
+            load = components.get(self.topology.output_component, self._load_component)
+            if payload_fraction is None:
+                T_load = load.compute_load_torque(speeds[:, row], grade)
             else:
-                # Output is a constrained DOF - resolve to independent DOFs
-                # Need to fully resolve the expression chain
-                resolved = self._resolve_dof(
-                    output_dof,
-                    {dof.name: dof for dof in self._independent_dofs},
-                    self._eliminated_dofs,
-                )
-                for ind_dof, coeff in resolved.items():
-                    for i, dof in enumerate(self._independent_dofs):
-                        if dof.name == ind_dof:
-                            tau[i] -= coeff * T_load
-                            break
+                T_load = load.compute_load_torque_array(speeds[:, row], grade, payload_fraction)
+            tau -= np.outer(T_load, P[row])
+
+        dX = np.zeros_like(X, dtype=float)
+        if n > 0:
+            if not components and payload_fraction is None:
+                dX[:, :n] = tau @ compiled.inertia_inverse.T
+            else:
+                J = self._batch_inertia(P, components, payload_fraction)
+                if J.ndim == 2:
+                    dX[:, :n] = np.linalg.solve(J, tau.T).T
+                else:
+                    dX[:, :n] = np.linalg.solve(J, tau[..., None])[..., 0]
+
+        # Compute internal state derivatives
+        for slots in self._stateful_slots:
+            component = components.get(slots.name, slots.component)
+            dX[:, slots.states] = component.compute_state_derivatives_batch(
+                X[:, slots.states], speeds[:, slots.ports], port_torques[:, slots.ports]
+            )
+
+        return dX
+
+    def _batch_inertia(
+        self,
+        P: NDArray,
+        components: Dict[str, DrivetrainComponent],
+        payload_fraction: Optional[NDArray],
+    ) -> NDArray:
+        """Inertia matrix with replaced components, per row if payloads are given.
 
+        Returns:
+            J of shape (n, n), or (N, n, n) with payload_fraction
+        """
+        J_ports = np.array(
+            [
+                components.get(dof.component, self._components[dof.component]).get_inertia(dof.port)
+                for dof in self._all_dofs
+            ]
+        )
+        if payload_fraction is not None:
+            row = self._output_row
+            load = components.get(self.topology.output_component, self._load_component)
+            J_ports = np.tile(J_ports, (len(payload_fraction), 1))
+            J_ports[:, row] = load.get_inertia_array(self._all_dofs[row].port, payload_fraction)
+        return np.einsum("pi,...p,pj->...ij", P, J_ports, P)
+
+    def _add_load_torque(self, tau: NDArray, speeds: NDArray, grade: float) -> NDArray:
+        """Add vehicle load torque to the generalized forces.
+
+        Args:
+            tau: Generalized force vector on the independent DOFs
+            speeds: All port speeds, ordered as the projection rows
+            grade: Road grade (fraction)
+        """
+        row = self._output_row
+        if row is None:
+            return tau
+
+        T_load = self._load_component.compute_load_torque(speeds[row], grade)
+        # The projection row maps the output port onto the independent DOFs
+        tau -= self._projection[row] * T_load
         return tau
 
     def get_velocity(self, x: NDArray) -> float:
@@ -586,6 +1001,30 @@ class Drivetrain:
 
         return omega  # Fallback: return angular velocity
 
+    def get_velocity_array(self, y: NDArray, gears: Optional[NDArray] = None) -> NDArray:
+        """Get vehicle velocity along a trajectory.
+
+        Args:
+            y: States, shape (n_states, N)
+            gears: Gear of each gearbox per sample (see get_all_speeds_array)
+
+        Returns:
+            Velocity [m/s], shape (N,)
+        """
+        n_points = np.shape(y)[1]
+        if self.topology.output_component is None:
+            return np.zeros(n_points)
+
+        output_comp = self.topology.output_component
+        output_dof = f"{output_comp}.{self.topology.output_port}"
+        omega = self.get_all_speeds_array(y, gears).get(output_dof, np.zeros(n_points))
+
+        component = self._components[output_comp]
+        if hasattr(component, "wheel_speed_to_velocity"):
+            return component.wheel_speed_to_velocity(omega)
+
+        return omega
+
     def __repr__(self) -> str:
         return (
             f"Drivetrain(dofs={self.n_mechanical_dofs}, "
@@ -0,0 +1,83 @@
+"""Uniform-grid lookup tables for piecewise-linear curves."""
+
+from functools import reduce
+from math import gcd
+from typing import Callable, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+class UniformTable:
+    """Piecewise-linear function sampled on a uniform grid.
+
+    Lookups compute the grid cell directly from x instead of searching the
+    breakpoints, so evaluating many points is a handful of array operations.
+    Outside the grid the end values are held.
+    """
+
+    def __init__(self, x0: float, dx: float, values: ArrayLike):
+        """Initialize the table.
+
+        Args:
+            x0: First grid point
+            dx: Grid spacing
+            values: Function values at x0, x0 + dx, ... (at least 2)
+        """
+        self.x0 = float(x0)
+        self.dx = float(dx)
+        self.values = np.asarray(values, dtype=float)
+        if len(self.values) < 2:
+            raise ValueError("A lookup table needs at least 2 values")
+        self._inv_dx = 1.0 / self.dx
+        self._n_cells = len(self.values) - 1
+        self._slopes = np.diff(self.values)
+
+    @classmethod
+    def from_function(
+        cls,
+        fn: Callable[[float], float],
+        breakpoints: Sequence[float],
+        max_size: int = 100_000,
+    ) -> "UniformTable":
+        """Sample a piecewise-linear function over its breakpoints.
+
+        When the breakpoints are whole numbers, the grid spacing is their
+        greatest common divisor, so every breakpoint is a grid point and the
+        table reproduces the function exactly.
+
+        Args:
+            fn: Scalar function to sample
+            breakpoints: x values where fn changes slope; the first and last
+                bound the table
+            max_size: Maximum number of grid points
+
+        Returns:
+            UniformTable over [min(breakpoints), max(breakpoints)]
+        """
+        points = sorted(set(float(b) for b in breakpoints))
+        x0, x1 = points[0], points[-1]
+        offsets = [b - x0 for b in points[1:]]
+
+        n_cells = max_size - 1
+        if offsets and all(abs(o - round(o)) < 1e-9 for o in offsets):
+            step = reduce(gcd, (int(round(o)) for o in offsets))
+            n_cells = min(n_cells, int(round((x1 - x0) / step)))
+        n_cells = max(n_cells, 1)
+
+        dx = (x1 - x0) / n_cells if x1 > x0 else 1.0
+        values = [fn(x0 + i * dx) for i in range(n_cells + 1)]
+        return cls(x0, dx, values)
+
+    def __call__(self, x: ArrayLike) -> NDArray:
+        """Evaluate the table.
+
+        Args:
+            x: Points to evaluate at, any shape
+
+        Returns:
+            Interpolated values, same shape as x
+        """
+        position = np.clip((np.asarray(x, dtype=float) - self.x0) * self._inv_dx, 0.0, self._n_cells)
+        cell = np.minimum(position.astype(np.intp), self._n_cells - 1)
+        return self.values[cell] + (position - cell) * self._slopes[cell]
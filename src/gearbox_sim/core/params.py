@@ -0,0 +1,243 @@
+"""Immutable and stacked forms of component parameter dataclasses.
+
+Components are configured with plain dataclasses, which are convenient to
+build and edit. Once a drivetrain is compiled the parameters no longer
+change, so each component swaps its dataclass for a FrozenParams record:
+the same attribute names on a ``__slots__`` object that rejects writes,
+with any derived properties evaluated once.
+
+To change a parameter after building a drivetrain, thaw() the record, edit
+the copy, and build a new component and drivetrain from it.
+
+For batched studies, ParamBlock stacks N parameter sets of one type into a
+NumPy structured array, so a fleet of trucks is one array per parameter
+rather than N object graphs. ``Drivetrain.dynamics_batch`` and
+``DrivetrainSimulator.simulate_batch`` take one block per component.
+"""
+
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class FrozenParams:
+    """Immutable snapshot of a parameter dataclass.
+
+    Subclasses are generated per dataclass type by freeze(); they carry one
+    slot per dataclass field and per property of the dataclass. Sequence
+    fields are stored as tuples.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _init_fields: Tuple[str, ...] = ()
+    _source: type = type(None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is frozen; use thaw() to edit a copy")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._init_fields)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, name) for name in self._fields))
+
+    def __reduce__(self):
+        # Generated classes can't be found by name, so pickle via the dataclass
+        return freeze, (self.thaw(),)
+
+    def thaw(self) -> Any:
+        """Rebuild an editable dataclass instance with the same values."""
+        return self._source(**{name: _thaw_value(getattr(self, name)) for name in self._init_fields})
+
+
+# Generated FrozenParams subclasses by dataclass type
+_frozen_types: Dict[type, type] = {}
+
+
+def _freeze_value(value: Any) -> Any:
+    """Convert lists (and nested lists) to tuples."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return _freeze_value(value.tolist())
+    return value
+
+
+def _thaw_value(value: Any) -> Any:
+    """Convert a sequence field back to a list, as the dataclasses declare them.
+
+    Entries stay tuples, matching e.g. a torque curve of (rpm, torque) pairs.
+    """
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def _frozen_type(cls: type) -> type:
+    """The FrozenParams subclass for a dataclass type, generated on first use."""
+    frozen = _frozen_types.get(cls)
+    if frozen is None:
+        init_fields = tuple(f.name for f in fields(cls) if f.init)
+        properties = tuple(
+            name
+            for name in dir(cls)
+            if isinstance(getattr(cls, name, None), property) and name not in init_fields
+        )
+        names = tuple(f.name for f in fields(cls)) + properties
+        frozen = type(
+            f"Frozen{cls.__name__}",
+            (FrozenParams,),
+            {
+                "__slots__": names,
+                "__module__": __name__,
+                "__doc__": f"Immutable form of {cls.__qualname__}.",
+                "_fields": names,
+                "_init_fields": init_fields,
+                "_source": cls,
+            },
+        )
+        _frozen_types[cls] = frozen
+    return frozen
+
+
+def freeze(params: Any) -> FrozenParams:
+    """Make an immutable, slotted copy of a parameter dataclass.
+
+    Args:
+        params: Dataclass instance, or an already frozen record
+
+    Returns:
+        FrozenParams with the same attributes
+
+    Raises:
+        ValueError: If params is not a dataclass instance
+    """
+    if isinstance(params, FrozenParams):
+        return params
+    if not is_dataclass(params) or isinstance(params, type):
+        raise ValueError(f"Can only freeze dataclass instances, got {type(params).__name__}")
+
+    frozen_cls = _frozen_type(type(params))
+    frozen = object.__new__(frozen_cls)
+    for name in frozen_cls._fields:
+        object.__setattr__(frozen, name, _freeze_value(getattr(params, name)))
+    return frozen
+
+
+class ParamBlock:
+    """N parameter sets of one dataclass type stacked into a structured array.
+
+    Numeric fields become columns of shape (N,); fixed-shape sequence fields,
+    such as torque curves with the same number of points, become columns of
+    shape (N, ...). Optional fields that are None are stored as NaN.
+    Derived properties (e.g. ``Q_capacity``) are stacked too. The data is
+    treated as read-only once the block is built.
+    """
+
+    def __init__(self, params_type: type, data: NDArray, optional: Sequence[str] = ()):
+        """Initialize the block.
+
+        Args:
+            params_type: Parameter dataclass type
+            data: Structured array with one record per parameter set
+            optional: Fields whose NaN entries stand for None
+        """
+        self.params_type = params_type
+        self.data = data
+        self._optional = frozenset(optional)
+        self._groups: Optional[Tuple[NDArray, NDArray]] = None
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Stacked field names."""
+        return self.data.dtype.names
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, name: str) -> NDArray:
+        """Column for one parameter, shape (N,) or (N, ...)."""
+        return self.data[name]
+
+    def row(self, i: int) -> FrozenParams:
+        """Parameter set i as a frozen record."""
+        init_fields = _frozen_type(self.params_type)._init_fields
+        record = self.data[i]
+        values = {}
+        for name in init_fields:
+            value = record[name]
+            if name in self._optional and np.ndim(value) == 0 and np.isnan(value):
+                values[name] = None
+            else:
+                values[name] = value.tolist() if isinstance(value, np.ndarray) else value.item()
+        return freeze(self.params_type(**values))
+
+    def groups(self) -> Tuple[NDArray, NDArray]:
+        """Distinct parameter sets in the block, found once and cached.
+
+        Returns:
+            Tuple of (first row of each distinct set, set index of each row)
+        """
+        if self._groups is None:
+            keys: Dict[bytes, int] = {}
+            inverse = np.array(
+                [keys.setdefault(record.tobytes(), len(keys)) for record in self.data], dtype=int
+            )
+            first = np.unique(inverse, return_index=True)[1]
+            self._groups = (first, inverse)
+        return self._groups
+
+
+def stack_params(params: Sequence[Any]) -> ParamBlock:
+    """Stack parameter sets of one dataclass type into a ParamBlock.
+
+    Args:
+        params: Dataclass instances or frozen records, all of the same type
+
+    Returns:
+        ParamBlock with one record per parameter set
+
+    Raises:
+        ValueError: If params is empty, mixes types, or has a field that
+            is not numeric or differs in shape between sets
+    """
+    frozen: List[FrozenParams] = [freeze(p) for p in params]
+    if not frozen:
+        raise ValueError("Need at least one parameter set to stack")
+    frozen_cls = type(frozen[0])
+    if any(type(p) is not frozen_cls for p in frozen):
+        raise ValueError("All stacked parameter sets must have the same type")
+
+    dtype = []
+    columns = []
+    optional = []
+    for name in frozen_cls._fields:
+        values = [getattr(p, name) for p in frozen]
+        if any(v is None for v in values):
+            optional.append(name)
+            values = [np.nan if v is None else v for v in values]
+        try:
+            column = np.asarray(values)
+        except ValueError as e:
+            raise ValueError(f"Parameter '{name}' differs in shape between sets") from e
+        if column.dtype.kind not in "biuf":
+            raise ValueError(f"Parameter '{name}' is not numeric and can't be stacked")
+        dtype.append((name, column.dtype, column.shape[1:]))
+        columns.append(column)
+
+    data = np.empty(len(frozen), dtype=dtype)
+    for (name, _, _), column in zip(dtype, columns):
+        data[name] = column
+    return ParamBlock(frozen_cls._source, data, optional)
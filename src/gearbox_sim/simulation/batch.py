@@ -0,0 +1,199 @@
+"""Lockstep integrators for batches of independent scenarios.
+
+All scenarios advance together with one step size, so every RHS evaluation
+is a single vectorized call over the whole batch (see
+``Drivetrain.dynamics_batch``). Steps always land exactly on the output
+times, so the RHS is evaluated at each output time with the accepted state.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+# Batched RHS: (t, Y) -> dY/dt with Y of shape (N, n_states)
+BatchFunction = Callable[[float, NDArray], NDArray]
+# Called after each accepted step: (t, Y) -> replacement Y, or None to keep Y
+StepCallback = Callable[[float, NDArray], Optional[NDArray]]
+
+
+@dataclass
+class BatchSolution:
+    """Output of a lockstep batch integration.
+
+    Attributes:
+        t: Output times, shape (n_out,)
+        y: States at the output times, shape (n_out, N, n_states)
+        nfev: Number of batched RHS evaluations
+        n_steps: Number of accepted steps
+        n_rejected: Number of rejected steps (adaptive method only)
+    """
+
+    t: NDArray
+    y: NDArray
+    nfev: int
+    n_steps: int
+    n_rejected: int = 0
+
+
+# Dormand-Prince 5(4) coefficients, as used by scipy's RK45
+_DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+_DP_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+_DP_E = np.array([-71 / 57600, 0.0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+
+
+def integrate_fixed(
+    fun: BatchFunction,
+    t_eval: NDArray,
+    y0: NDArray,
+    max_step: float,
+    on_step: Optional[StepCallback] = None,
+) -> BatchSolution:
+    """Integrate with classic fixed-step RK4.
+
+    Each output interval is split into equal steps no longer than max_step.
+
+    Args:
+        fun: Batched RHS
+        t_eval: Output times (first entry is the start time)
+        y0: Initial states, shape (N, n_states)
+        max_step: Maximum step size [s]
+        on_step: Called after each accepted step; may return a replacement
+            state, e.g. remapped across a gear shift
+
+    Returns:
+        BatchSolution at t_eval
+    """
+    y = np.array(y0, dtype=float)
+    y_out = np.empty((len(t_eval),) + y.shape)
+    y_out[0] = y
+    nfev = 0
+    n_steps = 0
+
+    for k in range(1, len(t_eval)):
+        t0 = t_eval[k - 1]
+        n_sub = max(1, int(np.ceil((t_eval[k] - t0) / max_step - 1e-9)))
+        h = (t_eval[k] - t0) / n_sub
+        for j in range(n_sub):
+            t = t0 + j * h
+            k1 = fun(t, y)
+            k2 = fun(t + 0.5 * h, y + 0.5 * h * k1)
+            k3 = fun(t + 0.5 * h, y + 0.5 * h * k2)
+            t_next = t_eval[k] if j == n_sub - 1 else t + h
+            k4 = fun(t_next, y + h * k3)
+            y = y + (h / 6.0) * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+            nfev += 4
+            n_steps += 1
+            if on_step is not None:
+                replaced = on_step(t_next, y)
+                if replaced is not None:
+                    y = replaced
+        y_out[k] = y
+
+    # Evaluate once more at the final accepted state, as the steps above do at
+    # every earlier output time
+    fun(t_eval[-1], y)
+    nfev += 1
+
+    return BatchSolution(t=np.asarray(t_eval), y=y_out, nfev=nfev, n_steps=n_steps)
+
+
+def integrate_adaptive(
+    fun: BatchFunction,
+    t_eval: NDArray,
+    y0: NDArray,
+    rtol: float = 1e-6,
+    atol: float = 1e-8,
+    max_step: float = np.inf,
+    on_step: Optional[StepCallback] = None,
+) -> BatchSolution:
+    """Integrate with Dormand-Prince RK45 and a shared worst-case step.
+
+    The error norm of each scenario is computed as in scipy's RK45; a step
+    is accepted only if every scenario passes, and the next step size is
+    set by the worst one.
+
+    Args:
+        fun: Batched RHS
+        t_eval: Output times (first entry is the start time)
+        y0: Initial states, shape (N, n_states)
+        rtol: Relative tolerance
+        atol: Absolute tolerance
+        max_step: Maximum step size [s]
+        on_step: Called after each accepted step; may return a replacement
+            state, e.g. remapped across a gear shift
+
+    Returns:
+        BatchSolution at t_eval
+
+    Raises:
+        RuntimeError: If the step size underflows
+    """
+    y = np.array(y0, dtype=float)
+    y_out = np.empty((len(t_eval),) + y.shape)
+    y_out[0] = y
+    K = np.empty((7,) + y.shape)
+
+    t = float(t_eval[0])
+    f = fun(t, y)
+    nfev = 1
+    n_steps = 0
+    n_rejected = 0
+    h = min(max_step, float(t_eval[1] - t_eval[0]) if len(t_eval) > 1 else max_step)
+
+    for k in range(1, len(t_eval)):
+        t_target = float(t_eval[k])
+        while t < t_target:
+            h = min(h, max_step)
+            landing = t + h >= t_target
+            h_step = t_target - t if landing else h
+
+            K[0] = f
+            for s in range(1, 6):
+                dy = np.tensordot(_DP_A[s], K[:s], axes=1) * h_step
+                K[s] = fun(t + _DP_C[s] * h_step, y + dy)
+            y_new = y + h_step * np.tensordot(_DP_B, K[:6], axes=1)
+            t_new = t_target if landing else t + h_step
+            K[6] = fun(t_new, y_new)
+            nfev += 6
+
+            scale = atol + np.maximum(np.abs(y), np.abs(y_new)) * rtol
+            error = h_step * np.tensordot(_DP_E, K, axes=1) / scale
+            error_norm = float(np.max(np.sqrt(np.mean(error**2, axis=1))))
+
+            if error_norm <= 1.0:
+                t, y, f = t_new, y_new, K[6].copy()
+                n_steps += 1
+                if on_step is not None:
+                    replaced = on_step(t, y)
+                    if replaced is not None:
+                        # The state jumped, so the last stage no longer applies
+                        y = replaced
+                        f = fun(t, y)
+                        nfev += 1
+                factor = 10.0 if error_norm == 0.0 else min(10.0, 0.9 * error_norm**-0.2)
+                # A step shortened to land on an output time says little
+                # about the step size the solution needs, so don't shrink h
+                h = max(h, h_step * factor) if landing else h_step * factor
+            else:
+                n_rejected += 1
+                shrink = max(0.2, 0.9 * error_norm**-0.2) if np.isfinite(error_norm) else 0.2
+                h = h_step * shrink
+                if h < 1e-12 * max(1.0, abs(t)):
+                    raise RuntimeError(f"Batch integration step size underflow at t={t}")
+
+        y_out[k] = y
+
+    return BatchSolution(
+        t=np.asarray(t_eval), y=y_out, nfev=nfev, n_steps=n_steps, n_rejected=n_rejected
+    )
@@ -0,0 +1,89 @@
+"""Bounded recording of control inputs during integration."""
+
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class ControlRecorder:
+    """Records control inputs and grade on the output time grid.
+
+    The simulator records the controls at accepted points of the solution
+    (the start and end of each accepted step), never at intermediate or
+    rejected stages. Each record is assigned to the nearest output time,
+    and only the record closest to that time is kept; output times between
+    records are interpolated. Memory is bounded by the output grid; columns
+    are added as new control names appear.
+    """
+
+    def __init__(self, times: NDArray, names: Sequence[str] = ()):
+        """Initialize the recorder.
+
+        Args:
+            times: Output times (increasing)
+            names: Control names expected, in column order
+        """
+        self.times = np.asarray(times, dtype=float)
+        self._times = self.times.tolist()
+        self._columns: Dict[str, int] = {}
+        self._values = np.zeros((len(self._times), max(len(names), 1)))
+        self._grades = np.zeros(len(self._times))
+        self._distance = np.full(len(self._times), np.inf)
+        for name in names:
+            self._column(name)
+
+    def _column(self, name: str) -> int:
+        """Column index for a control name, growing the buffer if needed."""
+        j = self._columns.get(name)
+        if j is None:
+            j = len(self._columns)
+            if j == self._values.shape[1]:
+                grown = np.zeros((self._values.shape[0], 2 * j))
+                grown[:, :j] = self._values
+                self._values = grown
+            self._columns[name] = j
+        return j
+
+    def record(self, t: float, control: Dict[str, float], grade: float) -> None:
+        """Record the controls at one accepted point.
+
+        Args:
+            t: Time of the point
+            control: Control inputs used there
+            grade: Road grade used there
+        """
+        times = self._times
+        k = bisect_left(times, t)
+        if k == len(times) or (k > 0 and t - times[k - 1] <= times[k] - t):
+            k -= 1
+        distance = abs(t - times[k])
+        if distance > self._distance[k]:
+            return
+
+        self._distance[k] = distance
+        columns = [self._column(name) for name in control]
+        row = self._values[k]
+        row[:] = 0.0
+        row[columns] = list(control.values())
+        self._grades[k] = grade
+
+    def _fill(self, values: NDArray) -> NDArray:
+        """Interpolate output times that received no record."""
+        hit = np.isfinite(self._distance)
+        if hit.all() or not hit.any():
+            return values
+        return np.interp(self.times, self.times[hit], values[hit])
+
+    def controls(self) -> Dict[str, NDArray]:
+        """Recorded control inputs at the output times."""
+        if not np.isfinite(self._distance).any():
+            return {}
+        return {name: self._fill(self._values[:, j]) for name, j in self._columns.items()}
+
+    def grades(self) -> Optional[NDArray]:
+        """Recorded road grade at the output times, or None if nothing was recorded."""
+        if not np.isfinite(self._distance).any():
+            return None
+        return self._fill(self._grades)
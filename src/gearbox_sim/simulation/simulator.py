@@ -1,19 +1,24 @@
 """Drivetrain simulator with ODE integration."""
 
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
-from numpy.typing import NDArray
-from scipy.integrate import solve_ivp
+from numpy.typing import ArrayLike, NDArray
+from scipy import integrate
 
 from ..core.drivetrain import Drivetrain
+from ..core.params import ParamBlock
+from .batch import integrate_adaptive, integrate_fixed
 from .config import SimulationConfig
+from .recorder import ControlRecorder
 from .result import SimulationResult
 
 
 # Type aliases
 ControlFunction = Callable[[float, Dict[str, float], float], Dict[str, float]]
 GradeFunction = Callable[[float], float]
+# (t, X, grades) -> U, with X (N, n_states), grades (N,), U (N, n_controls)
+BatchControlFunction = Callable[[float, NDArray, NDArray], NDArray]
 
 
 class DrivetrainSimulator:
@@ -29,8 +34,7 @@ class DrivetrainSimulator:
             drivetrain: Compiled drivetrain to simulate
         """
         self.drivetrain = drivetrain
-        self._control_log: List[tuple] = []
-        self._grade_log: List[tuple] = []
+        self._recorder: Optional[ControlRecorder] = None
 
     def simulate(
         self,
@@ -38,9 +42,29 @@ class DrivetrainSimulator:
         controller: Union[ControlFunction, "DrivetrainController"],
         grade_profile: Union[float, GradeFunction] = 0.0,
         config: SimulationConfig = None,
+        shift_controller: Optional[
+            Union["GearShiftController", "MultiGearboxController"]
+        ] = None,
+        initial_gears: Optional[Dict[str, int]] = None,
     ) -> SimulationResult:
         """Run a time-domain simulation.
 
+        The speeds in x0 are taken in the drivetrain's initial gears (see
+        ``Drivetrain.initial_gears``), overridden by initial_gears. The gears
+        engaged before the call are restored afterwards.
+
+        Gear changes are discrete events. After each accepted solver step the
+        requested gears are checked; on a change the state is remapped to the
+        new gears (see ``Drivetrain.shift``) and integration restarts from
+        there, so each segment between shifts is smooth. A gearbox that has
+        just shifted ignores further requests for its ``shift_time``.
+
+        A controller with a ``sample_period`` attribute [s] runs in discrete
+        time: it is called once at each sample instant and its outputs are
+        held until the next, with integration restarted at every sample.
+        Otherwise the controller is called at every dynamics evaluation, and
+        gear requests are read from the most recent one.
+
         Args:
             x0: Initial state {state_name: value}
             controller: Control function or controller object
@@ -48,16 +72,44 @@ class DrivetrainSimulator:
             grade_profile: Road grade as constant or function of time
                 Function signature: (t) -> grade
             config: Simulation configuration
+            shift_controller: Selects gears from vehicle speed, with its
+                schedule's hysteresis and shift delay. If None, the
+                controller's ``gear_*`` outputs are used.
+            initial_gears: Gear per gearbox that x0 is given in
 
         Returns:
             SimulationResult with all time series data
+
+        Raises:
+            ValueError: If initial_gears or the shift controller name a
+                gearbox the drivetrain doesn't have
         """
+        previous_gears = self.drivetrain.gears
+        self._engage_initial_gears(initial_gears)
+        try:
+            return self._simulate(x0, controller, grade_profile, config, shift_controller)
+        finally:
+            self.drivetrain.set_gears(previous_gears)
+
+    def _engage_initial_gears(self, initial_gears: Optional[Dict[str, int]]) -> None:
+        """Engage the gears a run starts from."""
+        self.drivetrain.set_gears({**self.drivetrain.initial_gears, **(initial_gears or {})})
+
+    def _simulate(
+        self,
+        x0: Dict[str, float],
+        controller: Union[ControlFunction, "DrivetrainController"],
+        grade_profile: Union[float, GradeFunction],
+        config: Optional[SimulationConfig],
+        shift_controller: Optional[Union["GearShiftController", "MultiGearboxController"]],
+    ) -> SimulationResult:
+        """Body of simulate, run with the initial gears engaged."""
         config = config or SimulationConfig()
-        self._control_log = []
-        self._grade_log = []
+        drivetrain = self.drivetrain
 
-        # Convert initial state to array
-        x0_arr = self.drivetrain.state_to_array(x0)
+        # Set up output time points and the control record on them
+        t_eval = config.get_output_times()
+        self._recorder = recorder = ControlRecorder(t_eval)
 
         # Wrap grade profile as function
         if callable(grade_profile):
@@ -66,72 +118,562 @@ class DrivetrainSimulator:
             grade_fn = lambda t: float(grade_profile)
 
         # Wrap controller
-        if hasattr(controller, "compute"):
-            control_fn = lambda t, state, grade: controller.compute(state, grade)
-        else:
-            control_fn = controller
+        wrapped = self._wrap_controller(controller)
+        n_controller_calls = 0
+
+        def control_fn(t: float, state: Dict[str, float], grade: float) -> Dict[str, float]:
+            nonlocal n_controller_calls
+            n_controller_calls += 1
+            return wrapped(t, state, grade)
+
+        # Sample-and-hold: controller outputs from the last sample instant
+        sample_period = getattr(controller, "sample_period", None)
+        if sample_period is not None and sample_period <= 0:
+            raise ValueError("Controller sample_period must be positive")
+        held: Dict[str, float] = {}
+
+        def sample(t: float, x: NDArray) -> None:
+            held.clear()
+            held.update(control_fn(t, drivetrain.array_to_state(x), grade_fn(t)))
 
         # Define dynamics wrapper for ODE solver
-        def dynamics_wrapper(t: float, x: NDArray) -> NDArray:
-            # Get current state as dict
-            state = self.drivetrain.array_to_state(x)
+        last_eval: Tuple[float, Dict[str, float], float] = (config.t_start, {}, 0.0)
+        nfev = 0  # Counted here, as solver.nfev misses initial step selection
+        record_next = True  # A solver's first evaluation is at its start point
 
+        def dynamics_wrapper(t: float, x: NDArray) -> NDArray:
+            nonlocal last_eval, nfev, record_next
+            nfev += 1
             # Get grade
             grade = grade_fn(t)
 
             # Get control inputs
-            control = control_fn(t, state, grade)
+            if sample_period is None:
+                control = control_fn(t, drivetrain.array_to_state(x), grade)
+            else:
+                control = held
+            last_eval = (t, control, grade)
 
-            # Log for post-processing
-            self._control_log.append((t, control.copy()))
-            self._grade_log.append((t, grade))
+            # Record for post-processing, only at accepted points
+            if record_next:
+                recorder.record(t, control, grade)
+                record_next = False
 
             # Compute dynamics
-            return self.drivetrain.dynamics(t, x, control, {"grade": grade})
+            return rhs(t, x, drivetrain.control_to_array(control), grade)
 
-        # Set up output time points
-        t_eval = config.get_output_times()
+        # Gear requests come from the controls already computed, so checking
+        # them doesn't advance a stateful controller
+        targets = self._shift_controller_targets(shift_controller)
+
+        def requested_gears(t: float, x: NDArray) -> Dict[str, int]:
+            if shift_controller is not None:
+                return self._shift_controller_gears(shift_controller, targets, t, x, grade_fn(t))
+            return drivetrain.requested_gears(held if sample_period is not None else last_eval[1])
 
-        # Run ODE integration
-        sol = solve_ivp(
-            dynamics_wrapper,
-            (config.t_start, config.t_end),
-            x0_arr,
-            method=config.method,
-            t_eval=t_eval,
-            rtol=config.rtol,
-            atol=config.atol,
-            max_step=config.max_step if config.max_step else np.inf,
+        # Earliest time each gearbox may shift again
+        dwell = {
+            name: getattr(drivetrain.get_component(name).params, "shift_time", 0.0)
+            for name in drivetrain.gears
+        }
+        next_shift = dict.fromkeys(drivetrain.gears, -np.inf)
+
+        def apply_gears(t: float, x: NDArray, request: Dict[str, int]) -> Optional[NDArray]:
+            """Shift to the requested gears that are past their dwell."""
+            current = drivetrain.gears
+            changes = {
+                name: gear
+                for name, gear in request.items()
+                if gear != current[name] and t >= next_shift[name]
+            }
+            if not changes:
+                return None
+            for name in changes:
+                next_shift[name] = t + dwell[name]
+            return drivetrain.shift(x, changes)
+
+        solver_class = getattr(integrate, config.method, None)
+        if not (isinstance(solver_class, type) and issubclass(solver_class, integrate.OdeSolver)):
+            raise ValueError(f"Unknown ODE solver method '{config.method}'")
+
+        y = np.empty((drivetrain.n_states, len(t_eval)))
+        gears = np.empty((len(t_eval), len(drivetrain.gears)), dtype=int)
+        k = 0  # Next output point
+        n_shifts = 0
+
+        t = config.t_start
+        x = drivetrain.state_to_array(x0)
+        n_samples = 0
+        if sample_period is not None:
+            sample(t, x)
+            n_samples = 1
+        if sample_period is not None or shift_controller is not None:
+            shifted_x = apply_gears(t, x, requested_gears(t, x))
+            if shifted_x is not None:
+                x = shifted_x
+
+        first_step = None
+        while True:
+            # Integrate up to the next sample instant (or the end)
+            t_bound = config.t_end
+            if sample_period is not None:
+                t_bound = min(config.t_start + n_samples * sample_period, config.t_end)
+            record_next = True
+            rhs = drivetrain.get_compiled_dynamics()  # Generated for the engaged gears
+            solver = solver_class(
+                dynamics_wrapper,
+                t,
+                x,
+                t_bound,
+                rtol=config.rtol,
+                atol=config.atol,
+                max_step=config.max_step if config.max_step else np.inf,
+                first_step=min(first_step, t_bound - t) if first_step else None,
+            )
+            shifted = False
+            while solver.status == "running":
+                message = solver.step()
+                if solver.status == "failed":
+                    raise RuntimeError(f"ODE integration failed: {message}")
+
+                # The last evaluation of a step is at its end point for the
+                # Runge-Kutta methods (and at its end time for BDF and Radau)
+                recorder.record(*last_eval)
+
+                # Outputs covered by this step, in the gears it was taken in
+                if k < len(t_eval) and t_eval[k] <= solver.t:
+                    dense = solver.dense_output()
+                    current = list(drivetrain.gears.values())
+                    while k < len(t_eval) and t_eval[k] <= solver.t:
+                        y[:, k] = dense(t_eval[k])
+                        gears[k] = current
+                        k += 1
+
+                if solver.status == "running":
+                    shifted_x = apply_gears(solver.t, solver.y, requested_gears(solver.t, solver.y))
+                    if shifted_x is not None:
+                        t, x = solver.t, shifted_x
+                        n_shifts += 1
+                        shifted = True
+                        break
+
+            if shifted:
+                continue
+            if t_bound >= config.t_end:
+                break
+
+            # Resume from the last step size rather than probing for one
+            first_step = solver.step_size
+
+            # Sample instant: run the controller, then apply its gear request
+            t, x = solver.t, solver.y
+            sample(t, x)
+            n_samples += 1
+            shifted_x = apply_gears(t, x, requested_gears(t, x))
+            if shifted_x is not None:
+                x = shifted_x
+                n_shifts += 1
+
+        # Report the gears actually engaged rather than those requested
+        controls = recorder.controls()
+        for j, comp_name in enumerate(drivetrain.gears):
+            controls[f"gear_{comp_name}"] = gears[:, j].astype(float)
+
+        return self._build_result(
+            t_eval,
+            y,
+            controls,
+            recorder.grades(),
+            config,
+            gears=gears,
+            n_function_evals=nfev,
+            n_shifts=n_shifts,
+            n_controller_calls=n_controller_calls,
+            controller_sample_period=sample_period,
+        )
+
+    def _shift_controller_targets(
+        self,
+        shift_controller: Optional[Union["GearShiftController", "MultiGearboxController"]],
+    ) -> Dict[str, str]:
+        """Map each gearbox id of a shift controller to a gearbox component.
+
+        Ids that name a gearbox component map to it. A schedule id (such as
+        "diesel_7speed") maps to the drivetrain's gearbox if it has just one.
+
+        Raises:
+            ValueError: If an id can't be matched to a gearbox
+        """
+        if shift_controller is None:
+            return {}
+        if hasattr(shift_controller, "update_all"):
+            ids = list(shift_controller.controllers)
+        else:
+            ids = [shift_controller.gearbox_id]
+
+        gearboxes = list(self.drivetrain.gears)
+        targets = {}
+        for gearbox_id in ids:
+            if gearbox_id in gearboxes:
+                targets[gearbox_id] = gearbox_id
+            elif len(ids) == 1 and len(gearboxes) == 1:
+                targets[gearbox_id] = gearboxes[0]
+            else:
+                raise ValueError(
+                    f"Shift controller gearbox '{gearbox_id}' is not a gearbox of this "
+                    f"drivetrain (gearboxes: {', '.join(gearboxes) or 'none'})"
+                )
+        return targets
+
+    def _shift_controller_gears(
+        self,
+        shift_controller: Union["GearShiftController", "MultiGearboxController"],
+        targets: Dict[str, str],
+        t: float,
+        x: NDArray,
+        grade: float = 0.0,
+    ) -> Dict[str, int]:
+        """Update a shift controller at an accepted step and return its gears.
+
+        Args:
+            shift_controller: Shift controller to update
+            targets: Gearbox component per gearbox id, from _shift_controller_targets
+            t: Time [s]
+            x: State vector
+            grade: Road grade
+        """
+        velocity = self.drivetrain.get_velocity(x)
+        if hasattr(shift_controller, "update_all"):
+            shift_controller.update_all(t, velocity, grade=grade)
+            requested = shift_controller.get_all_gears()
+        else:
+            gear, _ = shift_controller.update(t, velocity, grade=grade)
+            requested = {shift_controller.gearbox_id: gear}
+        return self.drivetrain.requested_gears(
+            {f"gear_{targets[gearbox_id]}": gear for gearbox_id, gear in requested.items()}
         )
 
-        if not sol.success:
-            raise RuntimeError(f"ODE integration failed: {sol.message}")
+    def simulate_batch(
+        self,
+        x0: Union[Sequence[Dict[str, float]], NDArray],
+        controller: Union[
+            BatchControlFunction, Sequence[Union[ControlFunction, "DrivetrainController"]]
+        ],
+        grade_profile: Union[float, GradeFunction, Sequence[Union[float, GradeFunction]]] = 0.0,
+        config: SimulationConfig = None,
+        method: str = "RK45",
+        initial_gears: Optional[Dict[str, int]] = None,
+        params: Optional[Dict[str, ParamBlock]] = None,
+        payload_fraction: Optional[ArrayLike] = None,
+    ) -> List[SimulationResult]:
+        """Run many scenarios of this drivetrain in lockstep.
+
+        All scenarios are integrated together with one step size, using
+        ``Drivetrain.dynamics_batch`` for a single vectorized RHS evaluation
+        per stage. Controls are recorded at the accepted state at each
+        output time. Gear requests are read from the latest controls after
+        each accepted step, and scenarios that shift are remapped as in
+        ``simulate``, with the same per-gearbox ``shift_time`` dwell.
+
+        Controllers with a ``sample_period`` are sampled and held as in
+        ``simulate``: the steps land on every sample instant, where those
+        scenarios' controllers are called once with the accepted state and
+        their outputs held until the next instant.
+
+        Args:
+            x0: Initial states, one dict per scenario or an (N, n_states) array
+            controller: One controller object or control function per
+                scenario, or a single batch control function
+                (t, X, grades) -> U with U ordered as drivetrain.control_names
+            grade_profile: Road grade as constant or function of time, shared
+                by all scenarios or one per scenario
+            config: Simulation configuration. ``config.method`` is not used;
+                rtol, atol and max_step are.
+            method: "RK45" for adaptive Dormand-Prince with a shared
+                worst-case step, or "RK4" for fixed steps of config.max_step
+            initial_gears: Gear per gearbox that x0 is given in, as in simulate
+            params: Parameters per scenario, one ParamBlock (see
+                stack_params) per component name, e.g. a different engine
+                for each truck. Controllers and result outputs still use
+                the drivetrain's own components.
+            payload_fraction: Vehicle payload fraction [0-1] per scenario,
+                scalar or one per scenario; None uses the vehicle's payload
+
+        Returns:
+            One SimulationResult per scenario
+        """
+        previous_gears = self.drivetrain.gears
+        self._engage_initial_gears(initial_gears)
+        try:
+            return self._simulate_batch(
+                x0, controller, grade_profile, config, method, params, payload_fraction
+            )
+        finally:
+            self.drivetrain.set_gears(previous_gears)
+
+    def _simulate_batch(
+        self,
+        x0: Union[Sequence[Dict[str, float]], NDArray],
+        controller: Union[
+            BatchControlFunction, Sequence[Union[ControlFunction, "DrivetrainController"]]
+        ],
+        grade_profile: Union[float, GradeFunction, Sequence[Union[float, GradeFunction]]],
+        config: Optional[SimulationConfig],
+        method: str,
+        params: Optional[Dict[str, ParamBlock]],
+        payload_fraction: Optional[ArrayLike],
+    ) -> List[SimulationResult]:
+        """Body of simulate_batch, run with the initial gears engaged."""
+        config = config or SimulationConfig()
+        drivetrain = self.drivetrain
+
+        if isinstance(x0, np.ndarray):
+            X0 = np.atleast_2d(np.asarray(x0, dtype=float))
+        else:
+            X0 = np.array([drivetrain.state_to_array(x) for x in x0])
+        n_scenarios = X0.shape[0]
+        control_names = drivetrain.control_names
+
+        # Grades for all scenarios at time t
+        if isinstance(grade_profile, (list, tuple)):
+            if len(grade_profile) != n_scenarios:
+                raise ValueError("Need one grade profile per scenario")
+            grade_fns = [g if callable(g) else (lambda t, g=float(g): g) for g in grade_profile]
+            grade_batch = lambda t: np.array([fn(t) for fn in grade_fns], dtype=float)
+        elif callable(grade_profile):
+            grade_batch = lambda t: np.full(n_scenarios, float(grade_profile(t)))
+        else:
+            grade_batch = lambda t: np.full(n_scenarios, float(grade_profile))
+
+        # Gears engaged per scenario, changed only between steps
+        gearboxes = list(drivetrain.gears)
+        gear_columns = [control_names.index(f"gear_{name}") for name in gearboxes]
+        n_gears = np.array([drivetrain.get_component(name).n_gears for name in gearboxes])
+        gears = np.tile(np.array(list(drivetrain.gears.values()), dtype=int), (n_scenarios, 1))
+        dwell = np.array(
+            [
+                getattr(drivetrain.get_component(name).params, "shift_time", 0.0)
+                for name in gearboxes
+            ]
+        )
+        next_shift = np.full(gears.shape, -np.inf)  # Earliest time each gearbox may shift again
+
+        # Controls for all scenarios at time t
+        if isinstance(controller, (list, tuple)):
+            if len(controller) != n_scenarios:
+                raise ValueError("Need one controller per scenario")
+            control_fns = [self._wrap_controller(c) for c in controller]
+            sample_periods = [getattr(c, "sample_period", None) for c in controller]
+            initial_gears = tuple(drivetrain.gears.values())
+
+            def engage(combo: tuple) -> None:
+                for name, gear in zip(gearboxes, combo):
+                    drivetrain.set_gear(name, gear)
+
+            def control_batch(t: float, X: NDArray, grades: NDArray, rows: NDArray) -> NDArray:
+                U = np.empty((len(rows), len(control_names)))
+                engaged = initial_gears
+                for j, i in enumerate(rows):
+                    # Controllers read kinematics from the drivetrain, so show
+                    # each one its own scenario's gears
+                    combo = tuple(gears[i].tolist())
+                    if combo != engaged:
+                        engage(combo)
+                        engaged = combo
+                    state = drivetrain.array_to_state(X[i])
+                    U[j] = drivetrain.control_to_array(control_fns[i](t, state, grades[i]))
+                if engaged != initial_gears:
+                    engage(initial_gears)
+                return U
+
+        elif hasattr(controller, "compute"):
+            raise ValueError("Pass one controller object per scenario")
+        else:
+            # A batch function covers every scenario, sampled or not
+            sample_periods = [getattr(controller, "sample_period", None)] * n_scenarios
+            control_batch = lambda t, X, grades, rows: controller(t, X, grades)
+
+        # Sample-and-hold: outputs of sampled controllers from their last
+        # sample instant
+        periods = np.array([np.nan if p is None else float(p) for p in sample_periods])
+        if np.any(periods <= 0):
+            raise ValueError("Controller sample_period must be positive")
+        sampled = np.flatnonzero(~np.isnan(periods))
+        continuous = np.flatnonzero(np.isnan(periods))
+        held = np.zeros((n_scenarios, len(control_names)))
+        n_samples = np.zeros(n_scenarios, dtype=int)
+
+        def sample(t: float, X: NDArray, rows: NDArray) -> None:
+            held[rows] = control_batch(t, X, grade_batch(t), rows)
+            n_samples[rows] += 1
 
-        # Build result
-        return self._build_result(sol, config)
+        t_eval = config.get_output_times()
+        output_index = {float(t): k for k, t in enumerate(t_eval)}
+
+        # Steps land on the output times and on every sample instant; an
+        # instant within rounding of an output time uses that time
+        t_grid = t_eval
+        for period in np.unique(periods[sampled]):
+            n = np.arange(1, int(np.ceil((config.t_end - config.t_start) / period)))
+            instants = config.t_start + n * period
+            nearest = t_eval[np.clip(np.searchsorted(t_eval, instants), 0, len(t_eval) - 1)]
+            instants = np.where(np.isclose(instants, nearest, rtol=0.0, atol=1e-9), nearest, instants)
+            t_grid = np.union1d(t_grid, instants[instants < config.t_end])
+        U_out = np.zeros((len(t_eval), n_scenarios, len(control_names)))
+        grade_out = np.zeros((len(t_eval), n_scenarios))
+
+        gear_out = np.empty((len(t_eval), n_scenarios, len(gearboxes)), dtype=int)
+        n_shifts = np.zeros(n_scenarios, dtype=int)
+
+        last_U: Optional[NDArray] = None
+
+        def rhs(t: float, X: NDArray) -> NDArray:
+            nonlocal last_U
+            grades = grade_batch(t)
+            U = last_U = held.copy()
+            if len(continuous):
+                U[continuous] = control_batch(t, X, grades, continuous)
+            k = output_index.get(float(t))
+            if k is not None:
+                U_out[k] = U
+                grade_out[k] = grades
+            return drivetrain.dynamics_batch(
+                t, X, U, grades, gears if gearboxes else None, params, payload_fraction
+            )
+
+        def shift(t: float, X: NDArray, rows: Optional[NDArray] = None) -> Optional[NDArray]:
+            # Gear requests from the latest controls, held for gearboxes in their dwell
+            requested = np.clip(last_U[:, gear_columns].astype(int), 0, n_gears - 1)
+            requested = np.where(t >= next_shift, requested, gears)
+            if rows is not None:
+                # Only these scenarios have current controls
+                others = np.ones(n_scenarios, dtype=bool)
+                others[rows] = False
+                requested[others] = gears[others]
+            changed = requested != gears
+            rows = np.nonzero(changed.any(axis=1))[0]
+            if len(rows):
+                X = X.copy()
+                for i in rows:
+                    X[i] = drivetrain.remap_state(X[i], tuple(gears[i]), tuple(requested[i]))
+                gears[rows] = requested[rows]
+                next_shift[changed] = t + np.broadcast_to(dwell, gears.shape)[changed]
+                n_shifts[rows] += 1
+            k = output_index.get(float(t))
+            if k is not None:
+                gear_out[k] = gears
+            return X if len(rows) else None
+
+        def step(t: float, X: NDArray) -> Optional[NDArray]:
+            replaced = None
+            if len(sampled) and t < config.t_end:
+                next_sample = config.t_start + n_samples[sampled] * periods[sampled]
+                due = sampled[next_sample <= t + 1e-9]
+                if len(due):
+                    sample(t, X, due)
+                    last_U[due] = held[due]
+                    # The controls changed, so the last stage no longer applies
+                    replaced = X
+            if gearboxes:
+                shifted = shift(t, X)
+                if shifted is not None:
+                    replaced = shifted
+            return replaced
+
+        if method not in ("RK45", "RK4"):
+            raise ValueError(f"Unknown batch method '{method}', expected 'RK45' or 'RK4'")
+
+        # Sampled controllers start from their output at the initial state,
+        # and may shift straight away, as in simulate
+        if len(sampled):
+            sample(config.t_start, X0, sampled)
+            last_U = held.copy()
+            if gearboxes:
+                shifted = shift(config.t_start, X0, sampled)
+                if shifted is not None:
+                    X0 = shifted
+
+        on_step = step if gearboxes or len(sampled) else None
+        gear_out[:] = gears
+
+        max_step = config.max_step if config.max_step else config.dt_output
+        if method == "RK45":
+            sol = integrate_adaptive(
+                rhs, t_grid, X0, config.rtol, config.atol, max_step, on_step=on_step
+            )
+        else:
+            sol = integrate_fixed(rhs, t_grid, X0, max_step, on_step=on_step)
+        y_out = sol.y[np.searchsorted(t_grid, t_eval)]
+
+        results = []
+        for i in range(n_scenarios):
+            controls = {name: U_out[:, i, j] for j, name in enumerate(control_names)}
+            # Report the gears actually engaged rather than those requested
+            for j, name in enumerate(gearboxes):
+                controls[f"gear_{name}"] = gear_out[:, i, j].astype(float)
+            results.append(
+                self._build_result(
+                    t_eval,
+                    y_out[:, i, :].T,
+                    controls,
+                    grade_out[:, i],
+                    config,
+                    gears=gear_out[:, i, :],
+                    solver_method=f"{method} (batch)",
+                    n_function_evals=sol.nfev,
+                    n_steps=sol.n_steps,
+                    n_rejected_steps=sol.n_rejected,
+                    n_shifts=int(n_shifts[i]),
+                    batch_size=n_scenarios,
+                )
+            )
+        return results
+
+    @staticmethod
+    def _wrap_controller(
+        controller: Union[ControlFunction, "DrivetrainController"],
+    ) -> ControlFunction:
+        """Wrap a controller object as a control function."""
+        if hasattr(controller, "compute"):
+            return lambda t, state, grade: controller.compute(state, grade)
+        return controller
 
-    def _build_result(self, sol, config: SimulationConfig) -> SimulationResult:
-        """Build SimulationResult from ODE solution."""
-        time = sol.t
-        n_points = len(time)
+    def _build_result(
+        self,
+        time: NDArray,
+        y: NDArray,
+        controls: Dict[str, NDArray],
+        grades: Optional[NDArray],
+        config: SimulationConfig,
+        gears: Optional[NDArray] = None,
+        **metadata,
+    ) -> SimulationResult:
+        """Build SimulationResult from states and controls at the output times.
 
+        Args:
+            time: Output times
+            y: States, shape (n_states, n_points)
+            controls: Control inputs at the output times
+            grades: Road grade at the output times, if known
+            config: Simulation configuration
+            gears: Gears engaged at the output times, shape
+                (n_points, n_gearboxes); None means the current gears
+            **metadata: Extra metadata entries (override the defaults)
+        """
         # Extract states
         states = {}
         for i, name in enumerate(self.drivetrain.state_names):
-            states[name] = sol.y[i, :]
-
-        # Interpolate control log to output times
-        controls = self._interpolate_controls(time)
+            states[name] = y[i, :]
 
         # Compute derived outputs
-        outputs = self._compute_outputs(time, sol.y, controls)
+        outputs = self._compute_outputs(time, y, controls, grades, gears)
 
         # Metadata
         metadata = {
             "solver_method": config.method,
-            "n_function_evals": sol.nfev,
             "drivetrain_type": type(self.drivetrain).__name__,
             "components": list(self.drivetrain.topology.components.keys()),
+            **metadata,
         }
 
         return SimulationResult(
@@ -142,56 +684,53 @@ class DrivetrainSimulator:
             metadata=metadata,
         )
 
-    def _interpolate_controls(self, time: NDArray) -> Dict[str, NDArray]:
-        """Interpolate logged control inputs to output times."""
-        if not self._control_log:
-            return {}
-
-        # Get all control keys
-        all_keys = set()
-        for _, ctrl in self._control_log:
-            all_keys.update(ctrl.keys())
-
-        # Build time series for each control
-        log_times = np.array([t for t, _ in self._control_log])
-        controls = {}
-
-        for key in all_keys:
-            values = np.array([ctrl.get(key, 0.0) for _, ctrl in self._control_log])
-            controls[key] = np.interp(time, log_times, values)
-
-        return controls
-
     def _compute_outputs(
-        self, time: NDArray, y: NDArray, controls: Dict[str, NDArray]
+        self,
+        time: NDArray,
+        y: NDArray,
+        controls: Dict[str, NDArray],
+        grades: Optional[NDArray] = None,
+        gears: Optional[NDArray] = None,
     ) -> Dict[str, NDArray]:
         """Compute derived output quantities."""
         outputs = {}
-        n_points = len(time)
+
+        # All port speeds along the trajectory, one projection per gear combination
+        speeds = self.drivetrain.get_all_speeds_array(y, gears)
 
         # Velocity
-        velocities = np.zeros(n_points)
-        for i in range(n_points):
-            velocities[i] = self.drivetrain.get_velocity(y[:, i])
-        outputs["velocity"] = velocities
+        output_comp = self.drivetrain.topology.output_component
+        omega = None
+        if output_comp is not None:
+            omega = speeds.get(f"{output_comp}.{self.drivetrain.topology.output_port}")
+        if omega is None:
+            outputs["velocity"] = np.zeros(len(time))
+        else:
+            component = self.drivetrain.get_component(output_comp)
+            if hasattr(component, "wheel_speed_to_velocity"):
+                outputs["velocity"] = component.wheel_speed_to_velocity(omega)
+            else:
+                outputs["velocity"] = omega
 
-        # Grade (from log)
-        if self._grade_log:
-            log_times = np.array([t for t, _ in self._grade_log])
-            grades = np.array([g for _, g in self._grade_log])
-            outputs["grade"] = np.interp(time, log_times, grades)
+        # Grade
+        if grades is not None:
+            outputs["grade"] = grades
 
         # Power calculations
-        outputs.update(self._compute_power_outputs(time, y, controls))
+        outputs.update(self._compute_power_outputs(speeds, controls))
 
         return outputs
 
     def _compute_power_outputs(
-        self, time: NDArray, y: NDArray, controls: Dict[str, NDArray]
+        self, speeds: Dict[str, NDArray], controls: Dict[str, NDArray]
     ) -> Dict[str, NDArray]:
-        """Compute power-related outputs."""
+        """Compute power-related outputs.
+
+        Args:
+            speeds: Port speeds along the trajectory
+            controls: Control inputs along the trajectory
+        """
         outputs = {}
-        n_points = len(time)
         components = self.drivetrain.topology.components
 
         # Engine power
@@ -199,48 +738,28 @@ class DrivetrainSimulator:
             if "Engine" in type(component).__name__:
                 T_key = f"T_{comp_name}"
                 if T_key in controls:
-                    # Find engine speed in states
-                    speed_key = f"{comp_name}.shaft"
-                    omega = np.zeros(n_points)
-                    speeds = self.drivetrain.get_all_speeds(y[:, 0])
-
-                    for i in range(n_points):
-                        all_speeds = self.drivetrain.get_all_speeds(y[:, i])
-                        omega[i] = all_speeds.get(speed_key, 0.0)
-
                     torque = controls[T_key]
-                    power = torque * omega
-                    outputs[f"P_{comp_name}"] = power
+                    omega = speeds.get(f"{comp_name}.shaft", np.zeros_like(torque))
+                    outputs[f"P_{comp_name}"] = torque * omega
 
                     # Fuel rate
                     if hasattr(component, "get_fuel_rate"):
-                        fuel_rate = np.zeros(n_points)
-                        for i in range(n_points):
-                            fuel_rate[i] = component.get_fuel_rate(torque[i], omega[i])
-                        outputs["fuel_rate"] = fuel_rate
+                        outputs["fuel_rate"] = component.get_fuel_rate(torque, omega)
 
         # Motor power
         for comp_name, component in components.items():
             if "Motor" in type(component).__name__:
                 T_key = f"T_{comp_name}"
                 if T_key in controls:
-                    speed_key = f"{comp_name}.shaft"
-
-                    omega = np.zeros(n_points)
-                    for i in range(n_points):
-                        all_speeds = self.drivetrain.get_all_speeds(y[:, i])
-                        omega[i] = all_speeds.get(speed_key, 0.0)
-
                     torque = controls[T_key]
-                    P_mech = torque * omega
-                    outputs[f"P_{comp_name}_mech"] = P_mech
+                    omega = speeds.get(f"{comp_name}.shaft", np.zeros_like(torque))
+                    outputs[f"P_{comp_name}_mech"] = torque * omega
 
                     # Electrical power
                     if hasattr(component, "get_electrical_power"):
-                        P_elec = np.zeros(n_points)
-                        for i in range(n_points):
-                            P_elec[i] = component.get_electrical_power(torque[i], omega[i])
-                        outputs[f"P_{comp_name}_elec"] = P_elec
+                        outputs[f"P_{comp_name}_elec"] = component.get_electrical_power(
+                            torque, omega
+                        )
 
         return outputs
 
@@ -251,6 +770,8 @@ def simulate(
     controller: Union[ControlFunction, "DrivetrainController"],
     grade_profile: Union[float, GradeFunction] = 0.0,
     config: SimulationConfig = None,
+    shift_controller: Optional[Union["GearShiftController", "MultiGearboxController"]] = None,
+    initial_gears: Optional[Dict[str, int]] = None,
 ) -> SimulationResult:
     """Convenience function to run a simulation.
 
@@ -260,9 +781,15 @@ def simulate(
         controller: Control function or controller object
         grade_profile: Road grade (constant or function)
         config: Simulation configuration
+        shift_controller: Optional gear shift controller (see
+            DrivetrainSimulator.simulate)
+        initial_gears: Gear per gearbox that x0 is given in (defaults to
+            drivetrain.initial_gears)
 
     Returns:
         SimulationResult
     """
     simulator = DrivetrainSimulator(drivetrain)
-    return simulator.simulate(x0, controller, grade_profile, config)
+    return simulator.simulate(
+        x0, controller, grade_profile, config, shift_controller, initial_gears
+    )
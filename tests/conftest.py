@@ -0,0 +1,6 @@
+"""Shared pytest setup: import the packages from src/, as the examples do."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
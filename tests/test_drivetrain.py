@@ -0,0 +1,94 @@
+"""Batched drivetrain dynamics against row-by-row evaluation."""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import gearbox_sim.configs.conventional_diesel as conventional_diesel
+from gearbox_sim.configs import create_conventional_diesel_793d, create_ecvt_789d
+from gearbox_sim.core import stack_params
+
+CONFIGS = [create_conventional_diesel_793d, create_ecvt_789d]
+
+
+def random_batch(drivetrain, n_rows=24, seed=0):
+    """States, controls, grades and per-row gears for a batch."""
+    rng = np.random.default_rng(seed)
+    n = drivetrain.n_mechanical_dofs
+    X = np.column_stack(
+        [
+            rng.uniform(-20.0, 220.0, (n_rows, n)),
+            rng.uniform(0.2, 0.9, (n_rows, drivetrain.n_internal_states)),
+        ]
+    )
+    U = rng.uniform(-3000.0, 12000.0, (n_rows, len(drivetrain.control_names)))
+    grades = rng.uniform(-0.08, 0.12, n_rows)
+    n_gears = [drivetrain.get_component(name).n_gears for name in drivetrain.gears]
+    gears = rng.integers(0, n_gears, (n_rows, len(n_gears)))
+    return X, U, grades, gears
+
+
+@pytest.mark.parametrize("make", CONFIGS)
+def test_dynamics_batch_matches_rows(make):
+    drivetrain = make()
+    X, U, grades, gears = random_batch(drivetrain)
+
+    dX = drivetrain.dynamics_batch(0.0, X, U, grades, gears)
+
+    names = list(drivetrain.gears)
+    for x, u, grade, row_gears, dx in zip(X, U, grades, gears, dX):
+        drivetrain.set_gears(dict(zip(names, row_gears.tolist())))
+        np.testing.assert_allclose(
+            dx, drivetrain.dynamics_array(0.0, x, u, grade), rtol=1e-10, atol=1e-9
+        )
+
+
+@pytest.mark.parametrize("make", CONFIGS)
+def test_dynamics_batch_in_current_gears_matches_rows(make):
+    drivetrain = make()
+    X, U, grades, _ = random_batch(drivetrain)
+
+    dX = drivetrain.dynamics_batch(0.0, X, U, grades)
+
+    for x, u, grade, dx in zip(X, U, grades, dX):
+        np.testing.assert_allclose(
+            dx, drivetrain.dynamics_array(0.0, x, u, grade), rtol=1e-10, atol=1e-9
+        )
+
+
+def test_dynamics_batch_with_row_parameters_matches_separate_drivetrains(monkeypatch):
+    engine = conventional_diesel.CAT_3516E_PARAMS
+    engines = [
+        replace(
+            engine,
+            J_engine=engine.J_engine * (1.0 + 0.5 * (i % 3)),
+            torque_curve=[(rpm, T * (0.6 + 0.2 * (i % 2))) for rpm, T in engine.torque_curve],
+        )
+        for i in range(6)
+    ]
+    payloads = np.linspace(0.0, 1.0, 6)
+    drivetrain = create_conventional_diesel_793d()
+    X, U, grades, gears = random_batch(drivetrain, n_rows=6)
+
+    block = stack_params(engines)
+
+    dX = drivetrain.dynamics_batch(
+        0.0, X, U, grades, gears, params={"engine": block}, payload_fraction=payloads
+    )
+
+    for i, (params, payload) in enumerate(zip(engines, payloads)):
+        monkeypatch.setattr(conventional_diesel, "CAT_3516E_PARAMS", params)
+        row = conventional_diesel.create_conventional_diesel_793d(payload_fraction=payload)
+        expected = row.dynamics_batch(0.0, X[i : i + 1], U[i : i + 1], grades[i], gears[i : i + 1])
+        np.testing.assert_allclose(dX[i], expected[0], rtol=1e-10, atol=1e-9)
+
+
+def test_dynamics_batch_rejects_row_parameters_that_change_kinematics():
+    drivetrain = create_conventional_diesel_793d()
+    X, U, grades, gears = random_batch(drivetrain, n_rows=2)
+    gearbox = drivetrain.get_component("gearbox").params.thaw()
+    block = stack_params([gearbox, replace(gearbox, ratios=[r * 1.1 for r in gearbox.ratios])])
+
+    with pytest.raises(ValueError, match="ratios"):
+        drivetrain.dynamics_batch(0.0, X, U, grades, gears, params={"gearbox": block})
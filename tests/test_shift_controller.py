@@ -0,0 +1,120 @@
+"""Vectorized shift schedule and trace replay against the scalar paths."""
+
+import numpy as np
+import pytest
+
+from gearbox_sim.configs import create_conventional_diesel_793d
+from gearbox_sim.control import (
+    GearShiftController,
+    GearShiftSchedule,
+    LoadBasedHold,
+    SpeedUnit,
+    generate_shift_map,
+)
+
+
+def make_schedule(**kwargs):
+    """Five-speed schedule in km/h with hysteresis and load-based hold."""
+    return GearShiftSchedule(
+        gearbox_id="gearbox",
+        n_gears=5,
+        upshift_speeds=[8.0, 15.0, 24.0, 34.0],
+        downshift_speeds=[6.0, 12.0, 20.0, 29.0],
+        speed_unit=SpeedUnit.KM_H,
+        load_based_hold=LoadBasedHold(enabled=True, load_threshold=0.7, speed_threshold=18.0),
+        **kwargs,
+    )
+
+
+def drive_trace(n_samples=4000, seed=0):
+    """Irregularly sampled speed, load and grade, accelerating and braking."""
+    rng = np.random.default_rng(seed)
+    dt = rng.choice([0.0, 0.02, 0.05, 0.1, 0.3], n_samples)
+    time = np.cumsum(dt)
+    speed = np.abs(np.cumsum(rng.normal(0.0, 0.25, n_samples)) + 5.0)
+    load = rng.uniform(0.0, 1.0, n_samples)
+    grade = rng.uniform(-0.05, 0.1, n_samples)
+    return time, speed, load, grade
+
+
+SCHEDULES = [
+    make_schedule(),
+    make_schedule(shift_delay=1.5),
+    make_schedule(shift_delay=0.0, min_gear=1, max_gear=3),
+]
+
+
+@pytest.mark.parametrize("schedule", SCHEDULES)
+def test_get_target_gear_batch_matches_scalar(schedule):
+    rng = np.random.default_rng(1)
+    gears = rng.integers(-1, schedule.n_gears + 1, 2000)
+    speeds = rng.uniform(0.0, 12.0, 2000)
+    loads = rng.uniform(0.0, 1.0, 2000)
+
+    targets = schedule.get_target_gear_batch(gears, speeds, loads)
+
+    expected = [
+        schedule.get_target_gear(int(g), float(v), float(load))
+        for g, v, load in zip(gears, speeds, loads)
+    ]
+    np.testing.assert_array_equal(targets, expected)
+
+
+def test_get_target_gear_batch_matches_scalar_with_shift_map():
+    drivetrain = create_conventional_diesel_793d()
+    shift_map = generate_shift_map(
+        drivetrain, np.linspace(0.5, 15.0, 30), np.linspace(0.0, 0.1, 3), np.linspace(0.0, 1.0, 3)
+    )
+    schedule = GearShiftSchedule.from_shift_map("gearbox", 7, shift_map, max_gear=5)
+    rng = np.random.default_rng(2)
+    speeds = rng.uniform(0.0, 16.0, 500)
+    grades = rng.uniform(-0.02, 0.12, 500)
+    loads = rng.uniform(0.0, 1.0, 500)
+
+    targets = schedule.get_target_gear_batch(0, speeds, loads, grades)
+
+    expected = [
+        schedule.get_target_gear(0, float(v), float(load), float(grade))
+        for v, load, grade in zip(speeds, loads, grades)
+    ]
+    np.testing.assert_array_equal(targets, expected)
+
+
+@pytest.mark.parametrize("schedule", SCHEDULES)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_replay_matches_update_loop(schedule, seed):
+    time, speed, load, grade = drive_trace(seed=seed)
+    sequential = GearShiftController(schedule, initial_gear=1)
+    batched = GearShiftController(schedule, initial_gear=1)
+    # Start inside a shift lockout
+    sequential.force_gear(1, time[0] - 0.2)
+    batched.force_gear(1, time[0] - 0.2)
+
+    steps = [sequential.update(t, v, f, g) for t, v, f, g in zip(time, speed, load, grade)]
+    gears, shifted = batched.replay(time, speed, load, grade)
+
+    np.testing.assert_array_equal(gears, [gear for gear, _ in steps])
+    np.testing.assert_array_equal(shifted, [did_shift for _, did_shift in steps])
+    assert shifted.sum() >= 5
+    assert batched.current_gear == sequential.current_gear
+    assert batched._last_shift_time == sequential._last_shift_time
+
+
+def test_replay_continues_from_previous_replay():
+    time, speed, load, grade = drive_trace(seed=3)
+    schedule = make_schedule(shift_delay=1.0)
+    sequential = GearShiftController(schedule)
+    batched = GearShiftController(schedule)
+
+    expected = [sequential.update(t, v, f, g)[0] for t, v, f, g in zip(time, speed, load, grade)]
+    half = len(time) // 2
+    first, _ = batched.replay(time[:half], speed[:half], load[:half], grade[:half])
+    second, _ = batched.replay(time[half:], speed[half:], load[half:], grade[half:])
+
+    np.testing.assert_array_equal(np.concatenate([first, second]), expected)
+
+
+def test_replay_rejects_decreasing_time():
+    controller = GearShiftController(make_schedule())
+    with pytest.raises(ValueError):
+        controller.replay([0.0, 1.0, 0.5], 5.0)
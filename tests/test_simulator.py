@@ -0,0 +1,47 @@
+"""Batch simulation against the sequential simulator."""
+
+import numpy as np
+import pytest
+
+from gearbox_sim.configs import create_conventional_diesel_793d
+from gearbox_sim.configs.conventional_diesel import get_initial_state
+from gearbox_sim.control import SpeedController
+from gearbox_sim.simulation import DrivetrainSimulator, SimulationConfig, simulate
+
+
+class CountingController:
+    """Forwards to a controller and counts compute() calls."""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.sample_period = controller.sample_period
+        self.n_calls = 0
+
+    def compute(self, state, grade):
+        self.n_calls += 1
+        return self.controller.compute(state, grade)
+
+
+@pytest.mark.parametrize("method", ["RK45", "RK4"])
+def test_simulate_batch_samples_and_holds_like_simulate(method):
+    drivetrain = create_conventional_diesel_793d()
+    config = SimulationConfig(t_end=20.0, rtol=1e-8)
+
+    def make_controller():
+        controller = SpeedController(drivetrain, sample_period=0.1)
+        controller.target_velocity = 8.0
+        return CountingController(controller)
+
+    single = make_controller()
+    expected = simulate(drivetrain, get_initial_state(), single, 0.05, config)
+    batch = [make_controller(), make_controller()]
+    results = DrivetrainSimulator(drivetrain).simulate_batch(
+        [get_initial_state()] * 2, batch, 0.05, config, method=method
+    )
+
+    for controller, result in zip(batch, results):
+        assert controller.n_calls == single.n_calls == 200
+        assert result.metadata["n_shifts"] == expected.metadata["n_shifts"]
+        np.testing.assert_allclose(
+            result.outputs["velocity"], expected.outputs["velocity"], rtol=1e-4, atol=1e-4
+        )